@@ -103,7 +103,7 @@ class Advertiser:
 
     def __verifyAndShowEvent(self, expectedEvent):
         event = get_event(self.transport, self.idx, 200);
-        self.trace.trace(7, str(event));
+        self.trace.trace(7, "%s", event);
         return event.event == expectedEvent;
 
     def __getCommandCompleteEvent(self):
@@ -173,7 +173,7 @@ class Advertiser:
         self.status = 0;
         if has_event(self.transport, self.idx, timeout)[0]:
             event = get_event(self.transport, self.idx, 200);
-            self.trace.trace(7, str(event));
+            self.trace.trace(7, "%s", event);
             if (event.subEvent == MetaEvents.BT_HCI_EVT_LE_CONN_COMPLETE) or (event.subEvent == MetaEvents.BT_HCI_EVT_LE_ENH_CONN_COMPLETE):
                 self.status = event.decode()[0];
         return self.status == 0x3C;
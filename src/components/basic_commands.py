@@ -2,8 +2,11 @@
 # Copyright 2019 Oticon A/S
 # SPDX-License-Identifier: Apache-2.0
 
+import functools;
+import re;
 import struct;
 from enum import IntEnum;
+from collections import deque;
 from itertools import chain;
 from components.address import *;
 from components.events import *;
@@ -481,6 +484,12 @@ class FeatureSupport(IntEnum):
     ISOCHRONOUS_CHANNELS = 32
 
 
+@functools.lru_cache(maxsize=None)
+def _edtt_struct(fmt):
+    # Compiled once per format, the formats of the commands sent with edtt_send_cmd are few
+    return struct.Struct(fmt)
+
+
 def edtt_send_cmd(transport, idx, opcode, payload_fmt, payload_tuple):
     """Send EDTT command
     EDTT command PDU format
@@ -494,7 +503,8 @@ def edtt_send_cmd(transport, idx, opcode, payload_fmt, payload_tuple):
     :param payload_tuple: payload as tuple
     :return:
     """
-    req = struct.pack('<HH' + payload_fmt, opcode, struct.calcsize('<' + payload_fmt), *payload_tuple)
+    cmd = _edtt_struct('<HH' + payload_fmt)
+    req = cmd.pack(opcode, cmd.size - 4, *payload_tuple)
     transport.send(idx, req)
 
 
@@ -511,11 +521,11 @@ def edtt_wait_cmd_cmpl(transport, idx, opcode, payload_fmt, to):
     :param to: timeout
     :return:
     """
-    payload_fmt = '<' + payload_fmt  # specify endianess, avoid alignment
-    exp_payload_len = struct.calcsize(payload_fmt)
+    payload = _edtt_struct('<' + payload_fmt)  # specify endianess, avoid alignment
+    exp_payload_len = payload.size
     rsp_size = 4 + exp_payload_len
-    rsp = transport.recv(idx, rsp_size, to)
-    if rsp_size != len(rsp):
+    rsp = edtt_recv_frame(transport, idx, to, exp_payload_len)
+    if len(rsp) < 4:
         raise Exception("Response too short (Expected %i bytes got %i bytes)" % (rsp_size, len(rsp)))
 
     # unpack and validate EDTT header first
@@ -526,8 +536,296 @@ def edtt_wait_cmd_cmpl(transport, idx, opcode, payload_fmt, to):
     if payload_len != exp_payload_len:
         raise Exception("Payload length field corrupted (Expected %i got %i)" % (exp_payload_len, payload_len))
 
+    if rsp_size != len(rsp):
+        raise Exception("Response too short (Expected %i bytes got %i bytes)" % (rsp_size, len(rsp)))
+
     # finally, unpack the payload
-    return struct.unpack_from(payload_fmt, rsp, 4)
+    return payload.unpack_from(rsp, 4)
+
+
+def edtt_recv_frame(transport, idx, to, payload_len=None):
+    """Receive a complete EDTT response
+    EDTT response PDU format
+    0--------16--------------32--------+
+    | Opcode | PayloadLength | Payload |
+    +--------+---------------+---------+
+    Transports supporting recv_frame read ahead whatever the device produced, so the whole
+    response is normally got with a single read
+    :param transport: bearer to be used
+    :param idx: device index
+    :param to: timeout
+    :param payload_len: expected payload length; if the PayloadLength field differs, only the header is received, so
+                        a corrupted length field is reported at once instead of waiting for a payload that never comes
+    :return: the response, header included (shorter than 4 + PayloadLength on timeout)
+    """
+    if hasattr(transport, 'recv_frame'):
+        return transport.recv_frame(idx, to, payload_len)
+
+    rsp = transport.recv(idx, 4, to)
+    if len(rsp) == 4:
+        _, length = struct.unpack('<HH', rsp)
+        if payload_len is None or length == payload_len:
+            rsp += transport.recv(idx, length, to)
+    return rsp
+
+
+_rx_buffers = {}
+
+def edtt_rx_buffer(idx, size):
+    """Get the reusable receive buffer of device idx, with room for at least size bytes
+    The buffer is only valid until the next response from the same device is received into it
+    :param idx: device index
+    :param size: minimum buffer size
+    :return: bytearray
+    """
+    buffer = _rx_buffers.get(idx)
+    if buffer is None:
+        buffer = _rx_buffers[idx] = bytearray(max(size, 256))
+    elif len(buffer) < size:
+        # Grow keeping whatever was already received
+        buffer.extend(bytes(max(size, 2*len(buffer)) - len(buffer)))
+    return buffer
+
+
+def edtt_recv_into(transport, idx, buffer, offset, number_bytes, to):
+    """Receive number_bytes from device idx into buffer at offset, without intermediate copies if
+    the transport supports recv_into
+    :param transport: bearer to be used
+    :param idx: device index
+    :param buffer: writable buffer (see edtt_rx_buffer)
+    :param offset: position in buffer where to place the received bytes
+    :param number_bytes: number of bytes to receive
+    :param to: timeout
+    :return: number of bytes received
+    """
+    if not hasattr(transport, 'recv_into'):
+        packet = transport.recv(idx, number_bytes, to)
+        buffer[offset:offset + len(packet)] = packet
+        return len(packet)
+
+    view = memoryview(buffer)[offset:offset + number_bytes]
+    try:
+        return transport.recv_into(idx, view, number_bytes, to)
+    finally:
+        view.release()
+
+
+class HCICommand:
+    """
+        HCI command with fixed size parameters and return parameters, compiled once into struct.Struct encoders/decoders
+        (see edtt_hci_cmd)
+
+        Constructor:
+            request - EDTT command request (Commands); the response is the matching _RSP command
+            name    - Name of the command in the exception messages (e.g. 'LE Set Random Address')
+            opcode  - HCI opcode (HCICommands)
+            params  - struct format of the command parameters; '<n>B' is a single parameter of <n> octets (a sequence)
+            returns - struct format of the return parameters, the status first; '<n>B' is a single return parameter of
+                      <n> octets (a tuple)
+            build   - Function of the return parameters giving the return value; by default the status when it is the only
+                      return parameter, otherwise a tuple of all of them
+    """
+    def __init__(self, request, name, opcode, params, returns, build=None):
+        self.request = request
+        self.response = Commands[request.name[:-len('REQ')] + 'RSP']
+        self.name = name
+        self.build = build
+        self.cmd = struct.Struct('<HHH' + params)
+        self.header = (request, self.cmd.size - 4, opcode)
+        # Octet sequence parameters are checked one by one, so a wrong length can not be made up by another one
+        self.lengths = tuple(int(count) if count else 0 for count, code in re.findall(r'(\d*)(\D)', params))
+        self.flat = not any(self.lengths)
+        # Return parameters of several octets are unpacked as bytes and converted to tuples
+        fields = re.findall(r'(\d*)(\D)', returns)
+        self.rsp = struct.Struct('<HH' + ''.join(count + 's' if count else code for count, code in fields))
+        self.size = self.rsp.size
+        self.arrays = tuple(i for i, (count, code) in enumerate(fields, 2) if count)
+        self.single = len(fields) == 1 and build is None
+
+    """
+        Pack the command with the parameters <params>
+    """
+    def pack(self, params):
+        if self.flat:
+            return self.cmd.pack(*self.header, *params)
+        if len(params) != len(self.lengths):
+            raise struct.error("pack expected %i parameters (got %i)" % (len(self.lengths), len(params)))
+        values = list(self.header)
+        for value, length in zip(params, self.lengths):
+            if not length:
+                values.append(value)
+            elif len(value) != length:
+                raise struct.error("pack expected %i items for packing (got %i)" % (length, len(value)))
+            else:
+                values.extend(value)
+        return self.cmd.pack(*values)
+
+    """
+        Send the command with the parameters <params> to device <idx>
+    """
+    def send(self, transport, idx, params):
+        transport.send(idx, self.pack(params))
+
+    """
+        Wait for the response of device <idx> and return its return parameters
+    """
+    def wait(self, transport, idx, to):
+        size = self.size
+        packet = transport.recv(idx, size, to)
+
+        if size != len(packet):
+            raise Exception("%s command failed: Response too short (Expected %i bytes got %i bytes)" % (self.name, size, len(packet)))
+
+        values = self.rsp.unpack(packet)
+
+        if values[0] != self.response:
+            raise Exception("%s command failed: Inappropriate command response received" % self.name)
+
+        if values[1] != size - 4:
+            raise Exception("%s command failed: Response length field corrupted (%i)" % (self.name, values[1]))
+
+        if self.single:
+            return values[2]
+        if self.arrays:
+            values = list(values)
+            for i in self.arrays:
+                values[i] = tuple(values[i])
+            values = tuple(values)
+        return values[2:] if self.build is None else self.build(*values[2:])
+
+
+_hci_commands = {command.request: command for command in (
+    HCICommand(Commands.CMD_INQUIRE_REQ,                                               'Inquire', HCICommands.BT_HCI_OP_INQUIRY, '3BBB', 'B'),
+    HCICommand(Commands.CMD_DISCONNECT_REQ,                                            'Disconnect', HCICommands.BT_HCI_OP_DISCONNECT, 'HB', 'B'),
+    HCICommand(Commands.CMD_READ_REMOTE_VERSION_INFORMATION_REQ,                       'Read Remote Version Information', HCICommands.BT_HCI_OP_READ_REMOTE_VERSION_INFO, 'H', 'B'),
+    HCICommand(Commands.CMD_SET_EVENT_MASK_REQ,                                        'Set Event Mask', HCICommands.BT_HCI_OP_SET_EVENT_MASK, '8B', 'B'),
+    HCICommand(Commands.CMD_RESET_REQ,                                                 'Reset', HCICommands.BT_HCI_OP_RESET, '', 'B'),
+    HCICommand(Commands.CMD_READ_TRANSMIT_POWER_LEVEL_REQ,                             'Read Transmit Power Level', HCICommands.BT_HCI_OP_READ_TX_POWER_LEVEL, 'HB', 'BHb'),
+    HCICommand(Commands.CMD_SET_CONTROLLER_TO_HOST_FLOW_CONTROL_REQ,                   'Set Controller To Host Flow Control', HCICommands.BT_HCI_OP_SET_CTL_TO_HOST_FLOW, 'B', 'B'),
+    HCICommand(Commands.CMD_HOST_BUFFER_SIZE_REQ,                                      'Host Buffer Size', HCICommands.BT_HCI_OP_HOST_BUFFER_SIZE, 'HBHH', 'B'),
+    HCICommand(Commands.CMD_SET_EVENT_MASK_PAGE_2_REQ,                                 'Set Event Mask Page 2', HCICommands.BT_HCI_OP_SET_EVENT_MASK_PAGE_2, '8B', 'B'),
+    HCICommand(Commands.CMD_WRITE_LE_HOST_SUPPORT_REQ,                                 'Write LE Host Support', HCICommands.BT_HCI_OP_LE_WRITE_LE_HOST_SUPP, 'BB', 'B'),
+    HCICommand(Commands.CMD_READ_AUTHENTICATED_PAYLOAD_TIMEOUT_REQ,                    'Read Authenticated Payload Timeout', HCICommands.BT_HCI_OP_READ_AUTH_PAYLOAD_TIMEOUT, 'H', 'BHH'),
+    HCICommand(Commands.CMD_WRITE_AUTHENTICATED_PAYLOAD_TIMEOUT_REQ,                   'Write Authenticated Payload Timeout', HCICommands.BT_HCI_OP_WRITE_AUTH_PAYLOAD_TIMEOUT, 'HH', 'BH'),
+    HCICommand(Commands.CMD_READ_LOCAL_VERSION_INFORMATION_REQ,                        'Read Local Version Information', HCICommands.BT_HCI_OP_READ_LOCAL_VERSION_INFO, '', 'BBHBHH'),
+    HCICommand(Commands.CMD_READ_LOCAL_SUPPORTED_COMMANDS_REQ,                         'Read Local Supported Commands', HCICommands.BT_HCI_OP_READ_SUPPORTED_COMMANDS, '', 'B64B'),
+    HCICommand(Commands.CMD_READ_LOCAL_SUPPORTED_FEATURES_REQ,                         'Read Local Supported Features', HCICommands.BT_HCI_OP_READ_LOCAL_FEATURES, '', 'B8B'),
+    HCICommand(Commands.CMD_READ_BD_ADDR_REQ,                                          'Read BD_ADDR', HCICommands.BT_HCI_OP_READ_BD_ADDR, '', 'B6B'),
+    HCICommand(Commands.CMD_READ_RSSI_REQ,                                             'Read RSSI', HCICommands.BT_HCI_OP_READ_RSSI, 'H', 'BHb'),
+    HCICommand(Commands.CMD_LE_SET_EVENT_MASK_REQ,                                     'LE Set Event Mask', HCICommands.BT_HCI_OP_LE_SET_EVENT_MASK, '8B', 'B'),
+    HCICommand(Commands.CMD_LE_READ_BUFFER_SIZE_REQ,                                   'LE Read Buffer Size', HCICommands.BT_HCI_OP_LE_READ_BUFFER_SIZE, '', 'BHB'),
+    HCICommand(Commands.CMD_LE_READ_BUFFER_SIZE_V2_REQ,                                'LE Read Buffer Size V2', HCICommands.BT_HCI_OP_LE_READ_BUFFER_SIZE_V2, '', 'BHBHB'),
+    HCICommand(Commands.CMD_LE_READ_LOCAL_SUPPORTED_FEATURES_REQ,                      'LE Read Local Supported Features', HCICommands.BT_HCI_OP_LE_READ_LOCAL_FEATURES, '', 'B8B'),
+    HCICommand(Commands.CMD_LE_SET_RANDOM_ADDRESS_REQ,                                 'LE Set Random Address', HCICommands.BT_HCI_OP_LE_SET_RANDOM_ADDRESS, '6B', 'B'),
+    HCICommand(Commands.CMD_LE_SET_ADVERTISING_PARAMETERS_REQ,                         'LE Set Advertising Parameters', HCICommands.BT_HCI_OP_LE_SET_ADV_PARAM, 'HHBBB6BBB', 'B'),
+    HCICommand(Commands.CMD_LE_READ_ADVERTISING_CHANNEL_TX_POWER_REQ,                  'LE Read Advertising Channel TX Power', HCICommands.BT_HCI_OP_LE_READ_ADV_CHAN_TX_POWER, '', 'Bb'),
+    HCICommand(Commands.CMD_LE_SET_ADVERTISING_DATA_REQ,                               'LE Set Advertising Data', HCICommands.BT_HCI_OP_LE_SET_ADV_DATA, 'B31B', 'B'),
+    HCICommand(Commands.CMD_LE_SET_SCAN_RESPONSE_DATA_REQ,                             'LE Set Scan Response Data', HCICommands.BT_HCI_OP_LE_SET_SCAN_RSP_DATA, 'B31B', 'B'),
+    HCICommand(Commands.CMD_LE_SET_ADVERTISING_ENABLE_REQ,                             'LE Set Advertising Enable', HCICommands.BT_HCI_OP_LE_SET_ADV_ENABLE, 'B', 'B'),
+    HCICommand(Commands.CMD_LE_SET_SCAN_PARAMETERS_REQ,                                'LE Set Scan Parameters', HCICommands.BT_HCI_OP_LE_SET_SCAN_PARAM, 'BHHBB', 'B'),
+    HCICommand(Commands.CMD_LE_SET_SCAN_ENABLE_REQ,                                    'LE Set Scan Enable', HCICommands.BT_HCI_OP_LE_SET_SCAN_ENABLE, 'BB', 'B'),
+    HCICommand(Commands.CMD_LE_CREATE_CONNECTION_REQ,                                  'LE Create Connection', HCICommands.BT_HCI_OP_LE_CREATE_CONN, 'HHBB6BBHHHHHH', 'B'),
+    HCICommand(Commands.CMD_LE_CREATE_CONNECTION_CANCEL_REQ,                           'LE Create Connection Cancel', HCICommands.BT_HCI_OP_LE_CREATE_CONN_CANCEL, '', 'B'),
+    HCICommand(Commands.CMD_LE_READ_FILTER_ACCEPT_LIST_SIZE_REQ,                       'LE Read Filter Accept List Size', HCICommands.BT_HCI_OP_LE_READ_FAL_SIZE, '', 'BB'),
+    HCICommand(Commands.CMD_LE_CLEAR_FILTER_ACCEPT_LIST_REQ,                           'LE Clear Filter Accept List', HCICommands.BT_HCI_OP_LE_CLEAR_FAL, '', 'B'),
+    HCICommand(Commands.CMD_LE_ADD_DEVICE_TO_FILTER_ACCEPT_LIST_REQ,                   'LE Add Device To Filter Accept List', HCICommands.BT_HCI_OP_LE_ADD_DEV_TO_FAL, 'B6B', 'B'),
+    HCICommand(Commands.CMD_LE_REMOVE_DEVICE_FROM_FILTER_ACCEPT_LIST_REQ,              'LE Remove Device From Filter Accept List', HCICommands.BT_HCI_OP_LE_REM_DEV_FROM_FAL, 'B6B', 'B'),
+    HCICommand(Commands.CMD_LE_CONNECTION_UPDATE_REQ,                                  'LE Connection Update', HCICommands.BT_HCI_OP_LE_CONN_UPDATE, 'HHHHHHH', 'B'),
+    HCICommand(Commands.CMD_LE_SET_HOST_CHANNEL_CLASSIFICATION_REQ,                    'LE Set Host Channel Classification', HCICommands.BT_HCI_OP_LE_SET_HOST_CHAN_CLASSIF, '5B', 'B'),
+    HCICommand(Commands.CMD_LE_READ_CHANNEL_MAP_REQ,                                   'LE Read Channel Map', HCICommands.BT_HCI_OP_LE_READ_CHAN_MAP, 'H', 'BH5B',
+               lambda status, handle, ChMap: (status, handle, int.from_bytes(ChMap, 'little', signed=False))),
+    HCICommand(Commands.CMD_LE_READ_REMOTE_FEATURES_REQ,                               'LE Read Remote Features', HCICommands.BT_HCI_OP_LE_READ_REMOTE_FEATURES, 'H', 'B'),
+    HCICommand(Commands.CMD_LE_ENCRYPT_REQ,                                            'LE Encrypt', HCICommands.BT_HCI_OP_LE_ENCRYPT, '16B16B', 'B16B'),
+    HCICommand(Commands.CMD_LE_RAND_REQ,                                               'LE Rand', HCICommands.BT_HCI_OP_LE_RAND, '', 'B8B'),
+    HCICommand(Commands.CMD_LE_LONG_TERM_KEY_REQUEST_REPLY_REQ,                        'LE Long Term Key Request Reply', HCICommands.BT_HCI_OP_LE_LTK_REQ_REPLY, 'H16B', 'BH'),
+    HCICommand(Commands.CMD_LE_LONG_TERM_KEY_REQUEST_NEGATIVE_REPLY_REQ,               'LE Long Term Key Request Negative Reply', HCICommands.BT_HCI_OP_LE_LTK_REQ_NEG_REPLY, 'H', 'BH'),
+    HCICommand(Commands.CMD_LE_READ_SUPPORTED_STATES_REQ,                              'LE Read Supported States', HCICommands.BT_HCI_OP_LE_READ_SUPP_STATES, '', 'B8B'),
+    HCICommand(Commands.CMD_LE_RECEIVER_TEST_REQ,                                      'LE Receiver Test', HCICommands.BT_HCI_OP_LE_RX_TEST, 'B', 'B'),
+    HCICommand(Commands.CMD_LE_TRANSMITTER_TEST_REQ,                                   'LE Transmitter Test', HCICommands.BT_HCI_OP_LE_TX_TEST, 'BBB', 'B'),
+    HCICommand(Commands.CMD_LE_TEST_END_REQ,                                           'LE Test End', HCICommands.BT_HCI_OP_LE_TEST_END, '', 'BH'),
+    HCICommand(Commands.CMD_LE_REMOTE_CONNECTION_PARAMETER_REQUEST_REPLY_REQ,          'LE Remote Connection Parameter Request Reply', HCICommands.BT_HCI_OP_LE_CONN_PARAM_REQ_REPLY, 'HHHHHHH', 'BH'),
+    HCICommand(Commands.CMD_LE_REMOTE_CONNECTION_PARAMETER_REQUEST_NEGATIVE_REPLY_REQ, 'LE Remote Connection Parameter Request Negative Reply', HCICommands.BT_HCI_OP_LE_CONN_PARAM_REQ_NEG_REPLY, 'HB', 'BH'),
+    HCICommand(Commands.CMD_LE_SET_DATA_LENGTH_REQ,                                    'LE Set Data Length', HCICommands.BT_HCI_OP_LE_SET_DATA_LEN, 'HHH', 'BH'),
+    HCICommand(Commands.CMD_LE_READ_SUGGESTED_DEFAULT_DATA_LENGTH_REQ,                 'LE Read Suggested Default Data Length', HCICommands.BT_HCI_OP_LE_READ_DEFAULT_DATA_LEN, '', 'BHH'),
+    HCICommand(Commands.CMD_LE_WRITE_SUGGESTED_DEFAULT_DATA_LENGTH_REQ,                'LE Write Suggested Default Data Length', HCICommands.BT_HCI_OP_LE_WRITE_DEFAULT_DATA_LEN, 'HH', 'B'),
+    HCICommand(Commands.CMD_LE_READ_LOCAL_P_256_PUBLIC_KEY_COMMAND_REQ,                'LE Read Local P-256 Public Key Command', HCICommands.BT_HCI_OP_LE_P256_PUBLIC_KEY, '', 'B'),
+    HCICommand(Commands.CMD_LE_GENERATE_DHKEY_COMMAND_REQ,                             'LE Generate DHKey Command', HCICommands.BT_HCI_OP_LE_GENERATE_DHKEY, '64B', 'B'),
+    HCICommand(Commands.CMD_LE_ADD_DEVICE_TO_RESOLVING_LIST_REQ,                       'LE Add Device To Resolving List', HCICommands.BT_HCI_OP_LE_ADD_DEV_TO_RL, 'B6B16B16B', 'B'),
+    HCICommand(Commands.CMD_LE_REMOVE_DEVICE_FROM_RESOLVING_LIST_REQ,                  'LE Remove Device From Resolving List', HCICommands.BT_HCI_OP_LE_REM_DEV_FROM_RL, 'B6B', 'B'),
+    HCICommand(Commands.CMD_LE_CLEAR_RESOLVING_LIST_REQ,                               'LE Clear Resolving List', HCICommands.BT_HCI_OP_LE_CLEAR_RL, '', 'B'),
+    HCICommand(Commands.CMD_LE_READ_RESOLVING_LIST_SIZE_REQ,                           'LE Read Resolving List Size', HCICommands.BT_HCI_OP_LE_READ_RL_SIZE, '', 'BB'),
+    HCICommand(Commands.CMD_LE_READ_PEER_RESOLVABLE_ADDRESS_REQ,                       'LE Read Peer Resolvable Address', HCICommands.BT_HCI_OP_LE_READ_PEER_RPA, 'B6B', 'B6B',
+               lambda status, PeerRpaVal: (status, list(PeerRpaVal))),
+    HCICommand(Commands.CMD_LE_READ_LOCAL_RESOLVABLE_ADDRESS_REQ,                      'LE Read Local Resolvable Address', HCICommands.BT_HCI_OP_LE_READ_LOCAL_RPA, 'B6B', 'B6B',
+               lambda status, LocalRpaVal: (status, list(LocalRpaVal))),
+    HCICommand(Commands.CMD_LE_SET_ADDRESS_RESOLUTION_ENABLE_REQ,                      'LE Set Address Resolution Enable', HCICommands.BT_HCI_OP_LE_SET_ADDR_RES_ENABLE, 'B', 'B'),
+    HCICommand(Commands.CMD_LE_SET_RESOLVABLE_PRIVATE_ADDRESS_TIMEOUT_REQ,             'LE Set Resolvable Private Address Timeout', HCICommands.BT_HCI_OP_LE_SET_RPA_TIMEOUT, 'H', 'B'),
+    HCICommand(Commands.CMD_LE_READ_MAXIMUM_DATA_LENGTH_REQ,                           'LE Read Maximum Data Length', HCICommands.BT_HCI_OP_LE_READ_MAX_DATA_LEN, '', 'BHHHH'),
+    HCICommand(Commands.CMD_LE_READ_PHY_REQ,                                           'LE Read PHY', HCICommands.BT_HCI_OP_LE_READ_PHY, 'H', 'BHBB'),
+    HCICommand(Commands.CMD_LE_SET_DEFAULT_PHY_REQ,                                    'LE Set Default PHY', HCICommands.BT_HCI_OP_LE_SET_DEFAULT_PHY, 'BBB', 'B'),
+    HCICommand(Commands.CMD_LE_SET_PHY_REQ,                                            'LE Set PHY', HCICommands.BT_HCI_OP_LE_SET_PHY, 'HBBBH', 'B'),
+    HCICommand(Commands.CMD_LE_ENHANCED_RECEIVER_TEST_REQ,                             'LE Enhanced Receiver Test', HCICommands.BT_HCI_OP_LE_ENH_RX_TEST, 'BBB', 'B'),
+    HCICommand(Commands.CMD_LE_ENHANCED_TRANSMITTER_TEST_REQ,                          'LE Enhanced Transmitter Test', HCICommands.BT_HCI_OP_LE_ENH_TX_TEST, 'BBBB', 'B'),
+    HCICommand(Commands.CMD_LE_REMOVE_ADVERTISING_SET_REQ,                             'LE Remove Advertising Set', HCICommands.BT_HCI_OP_LE_REMOVE_ADV_SET, 'B', 'B'),
+    HCICommand(Commands.CMD_LE_CLEAR_ADVERTISING_SETS_REQ,                             'LE Clear Advertising Sets', HCICommands.BT_HCI_OP_CLEAR_ADV_SETS, '', 'B'),
+    HCICommand(Commands.CMD_LE_SET_PERIODIC_ADVERTISING_PARAMETERS_REQ,                'LE Set Periodic Advertising Parameters', HCICommands.BT_HCI_OP_LE_SET_PER_ADV_PARAM, 'BHHH', 'B'),
+    HCICommand(Commands.CMD_LE_SET_PERIODIC_ADVERTISING_DATA_REQ,                      'LE Set Periodic Advertising Data', HCICommands.BT_HCI_OP_LE_SET_PER_ADV_DATA, 'BBB251B', 'B'),
+    HCICommand(Commands.CMD_LE_SET_PERIODIC_ADVERTISING_ENABLE_REQ,                    'LE Set Periodic Advertising Enable', HCICommands.BT_HCI_OP_LE_SET_PER_ADV_ENABLE, 'BB', 'B'),
+    HCICommand(Commands.CMD_LE_SET_EXTENDED_SCAN_ENABLE_REQ,                           'LE Set Extended Scan Enable', HCICommands.BT_HCI_OP_LE_SET_EXT_SCAN_ENABLE, 'BBHH', 'B'),
+    HCICommand(Commands.CMD_LE_PERIODIC_ADVERTISING_CREATE_SYNC_REQ,                   'LE Periodic Advertising Create Sync', HCICommands.BT_HCI_OP_LE_PER_ADV_CREATE_SYNC, 'BBB6BHHB', 'B'),
+    HCICommand(Commands.CMD_LE_PERIODIC_ADVERTISING_CREATE_SYNC_CANCEL_REQ,            'LE Periodic Advertising Create Sync Cancel', HCICommands.BT_HCI_OP_LE_PER_ADV_CREATE_SYNC_CANCEL, '', 'B'),
+    HCICommand(Commands.CMD_LE_PERIODIC_ADVERTISING_TERMINATE_SYNC_REQ,                'LE Periodic Advertising Terminate Sync', HCICommands.BT_HCI_OP_LE_PER_ADV_TERMINATE_SYNC, 'H', 'B'),
+    HCICommand(Commands.CMD_LE_ADD_DEVICE_TO_PERIODIC_ADVERTISER_LIST_REQ,             'LE Add Device To Periodic Advertiser List', HCICommands.BT_HCI_OP_LE_ADD_DEV_TO_PER_ADV_LIST, 'B6BB', 'B'),
+    HCICommand(Commands.CMD_LE_REMOVE_DEVICE_FROM_PERIODIC_ADVERTISER_LIST_REQ,        'LE Remove Device From Periodic Advertiser List', HCICommands.BT_HCI_OP_LE_REM_DEV_FROM_PER_ADV_LIST, 'B6BB', 'B'),
+    HCICommand(Commands.CMD_LE_CLEAR_PERIODIC_ADVERTISER_LIST_REQ,                     'LE Clear Periodic Advertiser List', HCICommands.BT_HCI_OP_LE_CLEAR_PER_ADV_LIST, '', 'B'),
+    HCICommand(Commands.CMD_LE_READ_TRANSMIT_POWER_REQ,                                'LE Read Transmit Power', HCICommands.BT_HCI_OP_LE_READ_TX_POWER, '', 'Bbb'),
+    HCICommand(Commands.CMD_LE_WRITE_RF_PATH_COMPENSATION_REQ,                         'LE Write RF Path Compensation', HCICommands.BT_HCI_OP_LE_WRITE_RF_PATH_COMP, 'hh', 'B'),
+    HCICommand(Commands.CMD_LE_SET_PRIVACY_MODE_REQ,                                   'LE Set Privacy Mode', HCICommands.BT_HCI_OP_LE_SET_PRIVACY_MODE, 'B6BB', 'B'),
+    HCICommand(Commands.CMD_WRITE_BD_ADDR_REQ,                                         'Write BD_ADDR', HCICommands.BT_HCI_OP_VS_WRITE_BD_ADDR, '6B', 'B'),
+    HCICommand(Commands.CMD_LE_REMOVE_CIG_REQ,                                         'LE Remove CIG', HCICommands.BT_HCI_OP_LE_REMOVE_CIG, 'B', 'BB'),
+    HCICommand(Commands.CMD_LE_ACCEPT_CIS_REQUEST_REQ,                                 'LE Accept CIS Request', HCICommands.BT_HCI_OP_LE_ACCEPT_CIS_REQUEST, 'H', 'B'),
+    HCICommand(Commands.CMD_LE_REJECT_CIS_REQUEST_REQ,                                 'LE Reject CIS Request', HCICommands.BT_HCI_OP_LE_REJECT_CIS_REQUEST, 'HB', 'BH'),
+    HCICommand(Commands.CMD_LE_REMOVE_ISO_DATA_PATH_REQ,                               'LE Remove ISO Data Path', HCICommands.BT_HCI_OP_LE_REMOVE_ISO_DATA_PATH, 'HB', 'BH'),
+    HCICommand(Commands.CMD_LE_SET_HOST_FEATURE_REQ,                                   'LE Set Host Feature', HCICommands.BT_HCI_OP_LE_SET_HOST_FEATURE, 'BB', 'B'),
+)}
+
+
+def edtt_send_hci_cmd(transport, idx, request, params):
+    """Send an HCI command of the command table (see HCICommand)
+    Several commands can be sent before waiting for their responses (edtt_wait_hci_cmd_cmpl), which arrive in order
+    :param transport: bearer to be used
+    :param idx: device index
+    :param request: EDTT command request (Commands)
+    :param params: command parameters as a sequence, an octet array being a single parameter
+    :return:
+    """
+    _hci_commands[request].send(transport, idx, params)
+
+
+def edtt_wait_hci_cmd_cmpl(transport, idx, request, to):
+    """Wait for the response to an HCI command of the command table (see HCICommand)
+    :param transport: bearer to be used
+    :param idx: device index
+    :param request: EDTT command request (Commands)
+    :param to: timeout
+    :return: the status if it is the only return parameter, otherwise a tuple of the return parameters (or what
+             the build function of the command makes of them)
+    """
+    return _hci_commands[request].wait(transport, idx, to)
+
+
+def edtt_hci_cmd(transport, idx, request, params, to):
+    """Send an HCI command of the command table (see HCICommand) and wait for its response
+    :param transport: bearer to be used
+    :param idx: device index
+    :param request: EDTT command request (Commands)
+    :param params: command parameters as a sequence, an octet array being a single parameter
+    :param to: timeout
+    :return: see edtt_wait_hci_cmd_cmpl
+    """
+    command = _hci_commands[request]
+    transport.send(idx, command.pack(params))
+    return command.wait(transport, idx, to)
 
 
 def echo(transport, idx, message, to):
@@ -565,47 +863,14 @@ def echo(transport, idx, message, to):
 """
 def inquire(transport, idx, lap, length, NumRsp, to):
 
-    cmd = struct.pack('<HHH3B', Commands.CMD_INQUIRE_REQ, 7, HCICommands.BT_HCI_OP_INQUIRY, *lap);
-    cmd += struct.pack('<BB', length, NumRsp);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("Inquire command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status, = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_INQUIRE_RSP ):
-        raise Exception("Inquire command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("Inquire command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_INQUIRE_REQ, (lap, length, NumRsp), to);
 
 """
     The Disconnect command is used to terminate an existing connection.
 """
 def disconnect(transport, idx, handle, reason, to):
 
-    cmd = struct.pack('<HHHHB', Commands.CMD_DISCONNECT_REQ, 5, HCICommands.BT_HCI_OP_DISCONNECT, handle, reason);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("Disconnect command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_DISCONNECT_RSP ):
-        raise Exception("Disconnect command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("Disconnect command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_DISCONNECT_REQ, (handle, reason), to);
 
 """
     This command will obtain the values for the version information for the remote device identified by the Connection_Handle
@@ -613,23 +878,7 @@ def disconnect(transport, idx, handle, reason, to):
 """
 def read_remote_version_information(transport, idx, handle, to):
 
-    cmd = struct.pack('<HHHH', Commands.CMD_READ_REMOTE_VERSION_INFORMATION_REQ, 4, HCICommands.BT_HCI_OP_READ_REMOTE_VERSION_INFO, handle);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("Read Remote Version Information command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_READ_REMOTE_VERSION_INFORMATION_RSP ):
-        raise Exception("Read Remote Version Information command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("Read Remote Version Information command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_READ_REMOTE_VERSION_INFORMATION_REQ, (handle,), to);
 
 """
     The Set_Event_Mask command is used to control which events are generated by the HCI for the Host. If the bit in the
@@ -638,23 +887,7 @@ def read_remote_version_information(transport, idx, handle, to):
 """
 def set_event_mask(transport, idx, events, to):
 
-    cmd = struct.pack('<HHH8B', Commands.CMD_SET_EVENT_MASK_REQ, 10, HCICommands.BT_HCI_OP_SET_EVENT_MASK, *events);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("Set Event Mask command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_SET_EVENT_MASK_RSP ):
-        raise Exception("Set Event Mask command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("Set Event Mask command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_SET_EVENT_MASK_REQ, (events,), to);
 
 """
     The Reset command will reset the Controller and the Link Manager on the BR/ EDR Controller, the PAL on an AMP Controller,
@@ -666,23 +899,7 @@ def set_event_mask(transport, idx, events, to):
 """
 def reset(transport, idx, to):
 
-    cmd = struct.pack('<HHH', Commands.CMD_RESET_REQ, 2, HCICommands.BT_HCI_OP_RESET);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("Reset command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_RESET_RSP ):
-        raise Exception("Reset command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("Reset command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_RESET_REQ, (), to);
 
 """
     This command reads the values for the Transmit_Power_Level parameter for the specified Connection_Handle. The
@@ -690,23 +907,7 @@ def reset(transport, idx, to):
 """
 def read_transmit_power_level(transport, idx, handle, levelType, to):
 
-    cmd = struct.pack('<HHHHB', Commands.CMD_READ_TRANSMIT_POWER_LEVEL_REQ, 5, HCICommands.BT_HCI_OP_READ_TX_POWER_LEVEL, handle, levelType);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 8, to);
-
-    if ( 8 != len(packet) ):
-        raise Exception("Read Transmit Power Level command failed: Response too short (Expected %i bytes got %i bytes)" % (8, len(packet)));
-
-    RespCmd, RespLen, status, handle, TxPowerLevel = struct.unpack('<HHBHb', packet);
-
-    if ( RespCmd != Commands.CMD_READ_TRANSMIT_POWER_LEVEL_RSP ):
-        raise Exception("Read Transmit Power Level command failed: Inappropriate command response received");
-
-    if ( RespLen != 4 ):
-        raise Exception("Read Transmit Power Level command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status, handle, TxPowerLevel;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_READ_TRANSMIT_POWER_LEVEL_REQ, (handle, levelType), to);
 
 """
     This command is used by the Host to turn flow control on or off for data and/or voice sent in the direction from the
@@ -714,23 +915,7 @@ def read_transmit_power_level(transport, idx, handle, levelType, to):
 """
 def set_controller_to_host_flow_control(transport, idx, FlowEnable, to):
 
-    cmd = struct.pack('<HHHB', Commands.CMD_SET_CONTROLLER_TO_HOST_FLOW_CONTROL_REQ, 3, HCICommands.BT_HCI_OP_SET_CTL_TO_HOST_FLOW, FlowEnable);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("Set Controller To Host Flow Control command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_SET_CONTROLLER_TO_HOST_FLOW_CONTROL_RSP ):
-        raise Exception("Set Controller To Host Flow Control command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("Set Controller To Host Flow Control command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_SET_CONTROLLER_TO_HOST_FLOW_CONTROL_REQ, (FlowEnable,), to);
 
 """
     The Host_Buffer_Size command is used by the Host to notify the Controller about the maximum size of the data portion of
@@ -738,23 +923,7 @@ def set_controller_to_host_flow_control(transport, idx, FlowEnable, to):
 """
 def host_buffer_size(transport, idx, AclMtu, ScoMtu, AclPkts, ScoPkts, to):
 
-    cmd = struct.pack('<HHHHBHH', Commands.CMD_HOST_BUFFER_SIZE_REQ, 9, HCICommands.BT_HCI_OP_HOST_BUFFER_SIZE, AclMtu, ScoMtu, AclPkts, ScoPkts);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("Host Buffer Size command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_HOST_BUFFER_SIZE_RSP ):
-        raise Exception("Host Buffer Size command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("Host Buffer Size command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_HOST_BUFFER_SIZE_REQ, (AclMtu, ScoMtu, AclPkts, ScoPkts), to);
 
 """
     The Host_Number_Of_Completed_Packets command is used by the Host to indicate to the Controller the number of HCI Data
@@ -787,23 +956,7 @@ def host_number_of_completed_packets(transport, idx, NumHandles, HHandle, HCount
 """
 def set_event_mask_page_2(transport, idx, EventsPage2, to):
 
-    cmd = struct.pack('<HHH8B', Commands.CMD_SET_EVENT_MASK_PAGE_2_REQ, 10, HCICommands.BT_HCI_OP_SET_EVENT_MASK_PAGE_2, *EventsPage2);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("Set Event Mask Page 2 command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_SET_EVENT_MASK_PAGE_2_RSP ):
-        raise Exception("Set Event Mask Page 2 command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("Set Event Mask Page 2 command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_SET_EVENT_MASK_PAGE_2_REQ, (EventsPage2,), to);
 
 """
     The Write_LE_Host_Support command is used to set the LE Supported (Host) and Simultaneous LE and BR/EDR to Same Device
@@ -812,23 +965,7 @@ def set_event_mask_page_2(transport, idx, EventsPage2, to):
 """
 def write_le_host_support(transport, idx, suppLe, simul, to):
 
-    cmd = struct.pack('<HHHBB', Commands.CMD_WRITE_LE_HOST_SUPPORT_REQ, 4, HCICommands.BT_HCI_OP_LE_WRITE_LE_HOST_SUPP, suppLe, simul);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("Write LE Host Support command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_WRITE_LE_HOST_SUPPORT_RSP ):
-        raise Exception("Write LE Host Support command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("Write LE Host Support command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_WRITE_LE_HOST_SUPPORT_REQ, (suppLe, simul), to);
 
 """
     This command reads the Authenticated_Payload_Timeout (authenticatedPayloadTO, see [Vol 2] Part B, Section Appendix B for
@@ -837,23 +974,7 @@ def write_le_host_support(transport, idx, suppLe, simul, to):
 """
 def read_authenticated_payload_timeout(transport, idx, handle, to):
 
-    cmd = struct.pack('<HHHH', Commands.CMD_READ_AUTHENTICATED_PAYLOAD_TIMEOUT_REQ, 4, HCICommands.BT_HCI_OP_READ_AUTH_PAYLOAD_TIMEOUT, handle);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 9, to);
-
-    if ( 9 != len(packet) ):
-        raise Exception("Read Authenticated Payload Timeout command failed: Response too short (Expected %i bytes got %i bytes)" % (9, len(packet)));
-
-    RespCmd, RespLen, status, handle, AuthPayloadTimeout = struct.unpack('<HHBHH', packet);
-
-    if ( RespCmd != Commands.CMD_READ_AUTHENTICATED_PAYLOAD_TIMEOUT_RSP ):
-        raise Exception("Read Authenticated Payload Timeout command failed: Inappropriate command response received");
-
-    if ( RespLen != 5 ):
-        raise Exception("Read Authenticated Payload Timeout command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status, handle, AuthPayloadTimeout;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_READ_AUTHENTICATED_PAYLOAD_TIMEOUT_REQ, (handle,), to);
 
 """
     This command writes the Authenticated_Payload_Timeout (authenticatedPayloadTO, see [Vol 2] Part B, Section Appendix B and
@@ -862,23 +983,7 @@ def read_authenticated_payload_timeout(transport, idx, handle, to):
 """
 def write_authenticated_payload_timeout(transport, idx, handle, AuthPayloadTimeout, to):
 
-    cmd = struct.pack('<HHHHH', Commands.CMD_WRITE_AUTHENTICATED_PAYLOAD_TIMEOUT_REQ, 6, HCICommands.BT_HCI_OP_WRITE_AUTH_PAYLOAD_TIMEOUT, handle, AuthPayloadTimeout);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 7, to);
-
-    if ( 7 != len(packet) ):
-        raise Exception("Write Authenticated Payload Timeout command failed: Response too short (Expected %i bytes got %i bytes)" % (7, len(packet)));
-
-    RespCmd, RespLen, status, handle = struct.unpack('<HHBH', packet);
-
-    if ( RespCmd != Commands.CMD_WRITE_AUTHENTICATED_PAYLOAD_TIMEOUT_RSP ):
-        raise Exception("Write Authenticated Payload Timeout command failed: Inappropriate command response received");
-
-    if ( RespLen != 3 ):
-        raise Exception("Write Authenticated Payload Timeout command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status, handle;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_WRITE_AUTHENTICATED_PAYLOAD_TIMEOUT_REQ, (handle, AuthPayloadTimeout), to);
 
 """
     This command reads the values for the version information for the local Controller. The HCI Version information defines
@@ -888,23 +993,7 @@ def write_authenticated_payload_timeout(transport, idx, handle, AuthPayloadTimeo
 """
 def read_local_version_information(transport, idx, to):
 
-    cmd = struct.pack('<HHH', Commands.CMD_READ_LOCAL_VERSION_INFORMATION_REQ, 2, HCICommands.BT_HCI_OP_READ_LOCAL_VERSION_INFO);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 13, to);
-
-    if ( 13 != len(packet) ):
-        raise Exception("Read Local Version Information command failed: Response too short (Expected %i bytes got %i bytes)" % (13, len(packet)));
-
-    RespCmd, RespLen, status, HCIVersion, HCIRevision, LMPVersion, manufacturer, LMPSubversion = struct.unpack('<HHBBHBHH', packet);
-
-    if ( RespCmd != Commands.CMD_READ_LOCAL_VERSION_INFORMATION_RSP ):
-        raise Exception("Read Local Version Information command failed: Inappropriate command response received");
-
-    if ( RespLen != 9 ):
-        raise Exception("Read Local Version Information command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status, HCIVersion, HCIRevision, LMPVersion, manufacturer, LMPSubversion;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_READ_LOCAL_VERSION_INFORMATION_REQ, (), to);
 
 """
     This command reads the list of HCI commands supported for the local Controller. This command shall return the
@@ -913,24 +1002,7 @@ def read_local_version_information(transport, idx, to):
 """
 def read_local_supported_commands(transport, idx, to):
 
-    cmd = struct.pack('<HHH', Commands.CMD_READ_LOCAL_SUPPORTED_COMMANDS_REQ, 2, HCICommands.BT_HCI_OP_READ_SUPPORTED_COMMANDS);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 69, to);
-
-    if ( 69 != len(packet) ):
-        raise Exception("Read Local Supported Commands command failed: Response too short (Expected %i bytes got %i bytes)" % (69, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet[:5]);
-    commands = struct.unpack('<64B', packet[5:]);
-
-    if ( RespCmd != Commands.CMD_READ_LOCAL_SUPPORTED_COMMANDS_RSP ):
-        raise Exception("Read Local Supported Commands command failed: Inappropriate command response received");
-
-    if ( RespLen != 65 ):
-        raise Exception("Read Local Supported Commands command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status, commands;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_READ_LOCAL_SUPPORTED_COMMANDS_REQ, (), to);
 
 """
     This command requests a list of the supported features for the local BR/EDR Controller. This command will return a list of
@@ -938,24 +1010,7 @@ def read_local_supported_commands(transport, idx, to):
 """
 def read_local_supported_features(transport, idx, to):
 
-    cmd = struct.pack('<HHH', Commands.CMD_READ_LOCAL_SUPPORTED_FEATURES_REQ, 2, HCICommands.BT_HCI_OP_READ_LOCAL_FEATURES);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 13, to);
-
-    if ( 13 != len(packet) ):
-        raise Exception("Read Local Supported Features command failed: Response too short (Expected %i bytes got %i bytes)" % (13, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet[:5]);
-    features = struct.unpack('<8B', packet[5:]);
-
-    if ( RespCmd != Commands.CMD_READ_LOCAL_SUPPORTED_FEATURES_RSP ):
-        raise Exception("Read Local Supported Features command failed: Inappropriate command response received");
-
-    if ( RespLen != 9 ):
-        raise Exception("Read Local Supported Features command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status, features;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_READ_LOCAL_SUPPORTED_FEATURES_REQ, (), to);
 
 """
     The Read_Buffer_Size command is used to read the maximum size of the data portion of HCI ACL and synchronous Data Packets
@@ -997,70 +1052,21 @@ def read_buffer_size(transport, idx, to):
 """
 def read_bd_addr(transport, idx, to):
 
-    cmd = struct.pack('<HHH', Commands.CMD_READ_BD_ADDR_REQ, 2, HCICommands.BT_HCI_OP_READ_BD_ADDR);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 11, to);
-
-    if ( 11 != len(packet) ):
-        raise Exception("Read BD_ADDR command failed: Response too short (Expected %i bytes got %i bytes)" % (11, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet[:5]);
-    BdaddrVal = struct.unpack('<6B', packet[5:]);
-
-    if ( RespCmd != Commands.CMD_READ_BD_ADDR_RSP ):
-        raise Exception("Read BD_ADDR command failed: Inappropriate command response received");
-
-    if ( RespLen != 7 ):
-        raise Exception("Read BD_ADDR command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status, BdaddrVal;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_READ_BD_ADDR_REQ, (), to);
 
 """
     This command reads the Received Signal Strength Indication (RSSI) value from a Controller.
 """
 def read_rssi(transport, idx, handle, to):
 
-    cmd = struct.pack('<HHHH', Commands.CMD_READ_RSSI_REQ, 4, HCICommands.BT_HCI_OP_READ_RSSI, handle);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 8, to);
-
-    if ( 8 != len(packet) ):
-        raise Exception("Read RSSI command failed: Response too short (Expected %i bytes got %i bytes)" % (8, len(packet)));
-
-    RespCmd, RespLen, status, handle, rssi = struct.unpack('<HHBHb', packet);
-
-    if ( RespCmd != Commands.CMD_READ_RSSI_RSP ):
-        raise Exception("Read RSSI command failed: Inappropriate command response received");
-
-    if ( RespLen != 4 ):
-        raise Exception("Read RSSI command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status, handle, rssi;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_READ_RSSI_REQ, (handle,), to);
 
 """
     The LE_Set_Event_Mask command is used to control which LE events are generated by the HCI for the Host.
 """
 def le_set_event_mask(transport, idx, events, to):
 
-    cmd = struct.pack('<HHH8B', Commands.CMD_LE_SET_EVENT_MASK_REQ, 10, HCICommands.BT_HCI_OP_LE_SET_EVENT_MASK, *events);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Set Event Mask command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_SET_EVENT_MASK_RSP ):
-        raise Exception("LE Set Event Mask command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Set Event Mask command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_SET_EVENT_MASK_REQ, (events,), to);
 
 """
     The LE_Read_Buffer_Size command is used to read the maximum size of the data portion of HCI LE ACL Data Packets sent from
@@ -1071,23 +1077,7 @@ def le_set_event_mask(transport, idx, events, to):
 """
 def le_read_buffer_size(transport, idx, to):
 
-    cmd = struct.pack('<HHH', Commands.CMD_LE_READ_BUFFER_SIZE_REQ, 2, HCICommands.BT_HCI_OP_LE_READ_BUFFER_SIZE);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 8, to);
-
-    if ( 8 != len(packet) ):
-        raise Exception("LE Read Buffer Size command failed: Response too short (Expected %i bytes got %i bytes)" % (8, len(packet)));
-
-    RespCmd, RespLen, status, LeMaxLen, LeMaxNum = struct.unpack('<HHBHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_READ_BUFFER_SIZE_RSP ):
-        raise Exception("LE Read Buffer Size command failed: Inappropriate command response received");
-
-    if ( RespLen != 4 ):
-        raise Exception("LE Read Buffer Size command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status, LeMaxLen, LeMaxNum;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_READ_BUFFER_SIZE_REQ, (), to);
 
 """
     The LE_Read_Buffer_Size command is used to read the maximum size of the data portion of HCI LE ACL Data Packets sent from
@@ -1098,47 +1088,14 @@ def le_read_buffer_size(transport, idx, to):
 """
 def le_read_buffer_size_v2(transport, idx, to):
 
-    cmd = struct.pack('<HHH', Commands.CMD_LE_READ_BUFFER_SIZE_V2_REQ, 2, HCICommands.BT_HCI_OP_LE_READ_BUFFER_SIZE_V2);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 11, to);
-
-    if ( 11 != len(packet) ):
-        raise Exception("LE Read Buffer Size V2 command failed: Response too short (Expected %i bytes got %i bytes)" % (11, len(packet)));
-
-    RespCmd, RespLen, status, LeMaxLen, LeMaxNum, IsoMaxLen, IsoMaxNum = struct.unpack('<HHBHBHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_READ_BUFFER_SIZE_V2_RSP ):
-        raise Exception("LE Read Buffer Size V2 command failed: Inappropriate command response received");
-
-    if ( RespLen != 7 ):
-        raise Exception("LE Read Buffer Size V2 command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status, LeMaxLen, LeMaxNum, IsoMaxLen, IsoMaxNum;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_READ_BUFFER_SIZE_V2_REQ, (), to);
 
 """
     This command requests the list of the supported LE features for the Controller.
 """
 def le_read_local_supported_features(transport, idx, to):
 
-    cmd = struct.pack('<HHH', Commands.CMD_LE_READ_LOCAL_SUPPORTED_FEATURES_REQ, 2, HCICommands.BT_HCI_OP_LE_READ_LOCAL_FEATURES);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 13, to);
-
-    if ( 13 != len(packet) ):
-        raise Exception("LE Read Local Supported Features command failed: Response too short (Expected %i bytes got %i bytes)" % (13, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet[:5]);
-    features = struct.unpack('<8B', packet[5:]);
-
-    if ( RespCmd != Commands.CMD_LE_READ_LOCAL_SUPPORTED_FEATURES_RSP ):
-        raise Exception("LE Read Local Supported Features command failed: Inappropriate command response received");
-
-    if ( RespLen != 9 ):
-        raise Exception("LE Read Local Supported Features command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status, features;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_READ_LOCAL_SUPPORTED_FEATURES_REQ, (), to);
 
 """
     The LE_Set_Random_Address command is used by the Host to set the LE Random Device Address in the Controller (see [Vol 6]
@@ -1146,47 +1103,14 @@ def le_read_local_supported_features(transport, idx, to):
 """
 def le_set_random_address(transport, idx, BdaddrVal, to):
 
-    cmd = struct.pack('<HHH6B', Commands.CMD_LE_SET_RANDOM_ADDRESS_REQ, 8, HCICommands.BT_HCI_OP_LE_SET_RANDOM_ADDRESS, *BdaddrVal);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Set Random Address command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_SET_RANDOM_ADDRESS_RSP ):
-        raise Exception("LE Set Random Address command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Set Random Address command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_SET_RANDOM_ADDRESS_REQ, (BdaddrVal,), to);
 
 """
     The LE_Set_Advertising_Parameters command is used by the Host to set the advertising parameters.
 """
 def le_set_advertising_parameters(transport, idx, MinInterval, MaxInterval, paramType, OwnAddrType, DirectAddrType, AVal, ChannelMap, FilterPolicy, to):
 
-    cmd = struct.pack('<HHHHHBBB6B', Commands.CMD_LE_SET_ADVERTISING_PARAMETERS_REQ, 17, HCICommands.BT_HCI_OP_LE_SET_ADV_PARAM, MinInterval, MaxInterval, paramType, OwnAddrType, DirectAddrType, *AVal);
-    cmd += struct.pack('<BB', ChannelMap, FilterPolicy);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Set Advertising Parameters command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_SET_ADVERTISING_PARAMETERS_RSP ):
-        raise Exception("LE Set Advertising Parameters command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Set Advertising Parameters command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_SET_ADVERTISING_PARAMETERS_REQ, (MinInterval, MaxInterval, paramType, OwnAddrType, DirectAddrType, AVal, ChannelMap, FilterPolicy), to);
 
 """
     The LE_Read_Advertising_Channel_TX_Power command is used by the Host to read the transmit power level used for LE
@@ -1194,69 +1118,21 @@ def le_set_advertising_parameters(transport, idx, MinInterval, MaxInterval, para
 """
 def le_read_advertising_channel_tx_power(transport, idx, to):
 
-    cmd = struct.pack('<HHH', Commands.CMD_LE_READ_ADVERTISING_CHANNEL_TX_POWER_REQ, 2, HCICommands.BT_HCI_OP_LE_READ_ADV_CHAN_TX_POWER);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 6, to);
-
-    if ( 6 != len(packet) ):
-        raise Exception("LE Read Advertising Channel TX Power command failed: Response too short (Expected %i bytes got %i bytes)" % (6, len(packet)));
-
-    RespCmd, RespLen, status, TxPowerLevel = struct.unpack('<HHBb', packet);
-
-    if ( RespCmd != Commands.CMD_LE_READ_ADVERTISING_CHANNEL_TX_POWER_RSP ):
-        raise Exception("LE Read Advertising Channel TX Power command failed: Inappropriate command response received");
-
-    if ( RespLen != 2 ):
-        raise Exception("LE Read Advertising Channel TX Power command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status, TxPowerLevel;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_READ_ADVERTISING_CHANNEL_TX_POWER_REQ, (), to);
 
 """
     The LE_Set_Advertising_Data command is used to set the data used in advertising packets that have a data field.
 """
 def le_set_advertising_data(transport, idx, dataLen, data, to):
 
-    cmd = struct.pack('<HHHB31B', Commands.CMD_LE_SET_ADVERTISING_DATA_REQ, 34, HCICommands.BT_HCI_OP_LE_SET_ADV_DATA, dataLen, *data);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Set Advertising Data command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_SET_ADVERTISING_DATA_RSP ):
-        raise Exception("LE Set Advertising Data command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Set Advertising Data command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_SET_ADVERTISING_DATA_REQ, (dataLen, data), to);
 
 """
     This command is used to provide data used in Scanning Packets that have a data field.
 """
 def le_set_scan_response_data(transport, idx, dataLen, data, to):
 
-    cmd = struct.pack('<HHHB31B', Commands.CMD_LE_SET_SCAN_RESPONSE_DATA_REQ, 34, HCICommands.BT_HCI_OP_LE_SET_SCAN_RSP_DATA, dataLen, *data);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Set Scan Response Data command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_SET_SCAN_RESPONSE_DATA_RSP ):
-        raise Exception("LE Set Scan Response Data command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Set Scan Response Data command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_SET_SCAN_RESPONSE_DATA_REQ, (dataLen, data), to);
 
 """
     The LE_Set_Advertising_Enable command is used to request the Controller to start or stop advertising. The Controller
@@ -1264,23 +1140,7 @@ def le_set_scan_response_data(transport, idx, dataLen, data, to):
 """
 def le_set_advertising_enable(transport, idx, enable, to):
 
-    cmd = struct.pack('<HHHB', Commands.CMD_LE_SET_ADVERTISING_ENABLE_REQ, 3, HCICommands.BT_HCI_OP_LE_SET_ADV_ENABLE, enable);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Set Advertising Enable command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_SET_ADVERTISING_ENABLE_RSP ):
-        raise Exception("LE Set Advertising Enable command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Set Advertising Enable command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_SET_ADVERTISING_ENABLE_REQ, (enable,), to);
 
 """
     The LE_Set_Scan_Parameters command is used to set the scan parameters. The LE_Scan_Type parameter controls the type of
@@ -1288,70 +1148,21 @@ def le_set_advertising_enable(transport, idx, enable, to):
 """
 def le_set_scan_parameters(transport, idx, ScanType, interval, window, AddrType, FilterPolicy, to):
 
-    cmd = struct.pack('<HHHBHHBB', Commands.CMD_LE_SET_SCAN_PARAMETERS_REQ, 9, HCICommands.BT_HCI_OP_LE_SET_SCAN_PARAM, ScanType, interval, window, AddrType, FilterPolicy);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Set Scan Parameters command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_SET_SCAN_PARAMETERS_RSP ):
-        raise Exception("LE Set Scan Parameters command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Set Scan Parameters command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_SET_SCAN_PARAMETERS_REQ, (ScanType, interval, window, AddrType, FilterPolicy), to);
 
 """
     The LE_Set_Scan_Enable command is used to start scanning. Scanning is used to discover advertising devices nearby.
 """
 def le_set_scan_enable(transport, idx, enable, FilterDup, to):
 
-    cmd = struct.pack('<HHHBB', Commands.CMD_LE_SET_SCAN_ENABLE_REQ, 4, HCICommands.BT_HCI_OP_LE_SET_SCAN_ENABLE, enable, FilterDup);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Set Scan Enable command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_SET_SCAN_ENABLE_RSP ):
-        raise Exception("LE Set Scan Enable command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Set Scan Enable command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_SET_SCAN_ENABLE_REQ, (enable, FilterDup), to);
 
 """
     The LE_Create_Connection command is used to create a Link Layer connection to a connectable advertiser.
 """
 def le_create_connection(transport, idx, ScanInterval, ScanWindow, FilterPolicy, PeerAddrType, AVal, OwnAddrType, ConnIntervalMin, ConnIntervalMax, ConnLatency, SupervisionTimeout, MinCeLen, MaxCeLen, to):
 
-    cmd = struct.pack('<HHHHHBB6B', Commands.CMD_LE_CREATE_CONNECTION_REQ, 27, HCICommands.BT_HCI_OP_LE_CREATE_CONN, ScanInterval, ScanWindow, FilterPolicy, PeerAddrType, *AVal);
-    cmd += struct.pack('<BHHHHHH', OwnAddrType, ConnIntervalMin, ConnIntervalMax, ConnLatency, SupervisionTimeout, MinCeLen, MaxCeLen);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Create Connection command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_CREATE_CONNECTION_RSP ):
-        raise Exception("LE Create Connection command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Create Connection command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_CREATE_CONNECTION_REQ, (ScanInterval, ScanWindow, FilterPolicy, PeerAddrType, AVal, OwnAddrType, ConnIntervalMin, ConnIntervalMax, ConnLatency, SupervisionTimeout, MinCeLen, MaxCeLen), to);
 
 """
     The LE_Create_Connection_Cancel command is used to cancel the LE_Create_Connection or LE_Extended_Create_Connection
@@ -1361,23 +1172,7 @@ def le_create_connection(transport, idx, ScanInterval, ScanWindow, FilterPolicy,
 """
 def le_create_connection_cancel(transport, idx, to):
 
-    cmd = struct.pack('<HHH', Commands.CMD_LE_CREATE_CONNECTION_CANCEL_REQ, 2, HCICommands.BT_HCI_OP_LE_CREATE_CONN_CANCEL);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Create Connection Cancel command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_CREATE_CONNECTION_CANCEL_RSP ):
-        raise Exception("LE Create Connection Cancel command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Create Connection Cancel command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_CREATE_CONNECTION_CANCEL_REQ, (), to);
 
 """
     The LE_Read_Filter_Accept_List_Size command is used to read the total number of Filter Accept List entries that can be stored in the
@@ -1385,69 +1180,21 @@ def le_create_connection_cancel(transport, idx, to):
 """
 def le_read_filter_accept_list_size(transport, idx, to):
 
-    cmd = struct.pack('<HHH', Commands.CMD_LE_READ_FILTER_ACCEPT_LIST_SIZE_REQ, 2, HCICommands.BT_HCI_OP_LE_READ_FAL_SIZE);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 6, to);
-
-    if ( 6 != len(packet) ):
-        raise Exception("LE Read Filter Accept List Size command failed: Response too short (Expected %i bytes got %i bytes)" % (6, len(packet)));
-
-    RespCmd, RespLen, status, FalSize = struct.unpack('<HHBB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_READ_FILTER_ACCEPT_LIST_SIZE_RSP ):
-        raise Exception("LE Read Filter Accept List Size command failed: Inappropriate command response received");
-
-    if ( RespLen != 2 ):
-        raise Exception("LE Read Filter Accept List Size command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status, FalSize;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_READ_FILTER_ACCEPT_LIST_SIZE_REQ, (), to);
 
 """
     The LE_Clear_Filter_Accept_List command is used to clear the Filter Accept List stored in the Controller.
 """
 def le_clear_filter_accept_list(transport, idx, to):
 
-    cmd = struct.pack('<HHH', Commands.CMD_LE_CLEAR_FILTER_ACCEPT_LIST_REQ, 2, HCICommands.BT_HCI_OP_LE_CLEAR_FAL);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Clear Filter Accept List command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_CLEAR_FILTER_ACCEPT_LIST_RSP ):
-        raise Exception("LE Clear Filter Accept List command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Clear Filter Accept List command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_CLEAR_FILTER_ACCEPT_LIST_REQ, (), to);
 
 """
     The LE_Add_Device_To_Filter_Accept_List command is used to add a single device to the Filter Accept List stored in the Controller.
 """
 def le_add_device_to_filter_accept_list(transport, idx, AddrType, AVal, to):
 
-    cmd = struct.pack('<HHHB6B', Commands.CMD_LE_ADD_DEVICE_TO_FILTER_ACCEPT_LIST_REQ, 9, HCICommands.BT_HCI_OP_LE_ADD_DEV_TO_FAL, AddrType, *AVal);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Add Device To Filter Accept List command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_ADD_DEVICE_TO_FILTER_ACCEPT_LIST_RSP ):
-        raise Exception("LE Add Device To Filter Accept List command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Add Device To Filter Accept List command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_ADD_DEVICE_TO_FILTER_ACCEPT_LIST_REQ, (AddrType, AVal), to);
 
 """
     The LE_Remove_Device_From_Filter_Accept_List command is used to remove a single device from the Filter Accept List stored in the
@@ -1455,23 +1202,7 @@ def le_add_device_to_filter_accept_list(transport, idx, AddrType, AVal, to):
 """
 def le_remove_device_from_filter_accept_list(transport, idx, AddrType, AVal, to):
 
-    cmd = struct.pack('<HHHB6B', Commands.CMD_LE_REMOVE_DEVICE_FROM_FILTER_ACCEPT_LIST_REQ, 9, HCICommands.BT_HCI_OP_LE_REM_DEV_FROM_FAL, AddrType, *AVal);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Remove Device From Filter Accept List command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_REMOVE_DEVICE_FROM_FILTER_ACCEPT_LIST_RSP ):
-        raise Exception("LE Remove Device From Filter Accept List command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Remove Device From Filter Accept List command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_REMOVE_DEVICE_FROM_FILTER_ACCEPT_LIST_REQ, (AddrType, AVal), to);
 
 """
     The LE_Connection_Update command is used to change the Link Layer connection parameters of a connection. This command may
@@ -1479,23 +1210,7 @@ def le_remove_device_from_filter_accept_list(transport, idx, AddrType, AVal, to)
 """
 def le_connection_update(transport, idx, handle, ConnIntervalMin, ConnIntervalMax, ConnLatency, SupervisionTimeout, MinCeLen, MaxCeLen, to):
 
-    cmd = struct.pack('<HHHHHHHHHH', Commands.CMD_LE_CONNECTION_UPDATE_REQ, 16, HCICommands.BT_HCI_OP_LE_CONN_UPDATE, handle, ConnIntervalMin, ConnIntervalMax, ConnLatency, SupervisionTimeout, MinCeLen, MaxCeLen);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Connection Update command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_CONNECTION_UPDATE_RSP ):
-        raise Exception("LE Connection Update command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Connection Update command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_CONNECTION_UPDATE_REQ, (handle, ConnIntervalMin, ConnIntervalMax, ConnLatency, SupervisionTimeout, MinCeLen, MaxCeLen), to);
 
 """
     The LE_Set_Host_Channel_Classification command allows the Host to specify a channel classification for data channels based
@@ -1505,47 +1220,14 @@ def le_connection_update(transport, idx, handle, ConnIntervalMin, ConnIntervalMa
 """
 def le_set_host_channel_classification(transport, idx, ChMap, to):
 
-    cmd = struct.pack('<HHH5B', Commands.CMD_LE_SET_HOST_CHANNEL_CLASSIFICATION_REQ, 7, HCICommands.BT_HCI_OP_LE_SET_HOST_CHAN_CLASSIF, *ChMap);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Set Host Channel Classification command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_SET_HOST_CHANNEL_CLASSIFICATION_RSP ):
-        raise Exception("LE Set Host Channel Classification command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Set Host Channel Classification command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_SET_HOST_CHANNEL_CLASSIFICATION_REQ, (ChMap,), to);
 
 """
     The LE_Read_Channel_Map command returns the current Channel_Map for the specified Connection_Handle.
 """
 def le_read_channel_map(transport, idx, handle, to):
 
-    cmd = struct.pack('<HHHH', Commands.CMD_LE_READ_CHANNEL_MAP_REQ, 4, HCICommands.BT_HCI_OP_LE_READ_CHAN_MAP, handle);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 12, to);
-
-    if ( 12 != len(packet) ):
-        raise Exception("LE Read Channel Map command failed: Response too short (Expected %i bytes got %i bytes)" % (12, len(packet)));
-
-    RespCmd, RespLen, status, handle = struct.unpack('<HHBH', packet[:7]);
-    ChMap = struct.unpack('<5B', packet[7:]);
-
-    if ( RespCmd != Commands.CMD_LE_READ_CHANNEL_MAP_RSP ):
-        raise Exception("LE Read Channel Map command failed: Inappropriate command response received");
-
-    if ( RespLen != 8 ):
-        raise Exception("LE Read Channel Map command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status, handle, int.from_bytes(ChMap, 'little', signed=False)
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_READ_CHANNEL_MAP_REQ, (handle,), to);
 
 """
     This command requests, from the remote device identified by the connection handle, the features used on the connection and
@@ -1553,23 +1235,7 @@ def le_read_channel_map(transport, idx, handle, to):
 """
 def le_read_remote_features(transport, idx, handle, to):
 
-    cmd = struct.pack('<HHHH', Commands.CMD_LE_READ_REMOTE_FEATURES_REQ, 4, HCICommands.BT_HCI_OP_LE_READ_REMOTE_FEATURES, handle);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Read Remote Features command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_READ_REMOTE_FEATURES_RSP ):
-        raise Exception("LE Read Remote Features command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Read Remote Features command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_READ_REMOTE_FEATURES_REQ, (handle,), to);
 
 """
     The LE_Encrypt command is used to request the Controller to encrypt the Plaintext_Data in the command using the Key given
@@ -1586,25 +1252,7 @@ def le_encrypt(transport, idx, key, plaintext, to):
     key = pad_or_slice(key, 16)
     plaintext = pad_or_slice(plaintext, 16)
 
-    cmd = struct.pack('<HHH16B', Commands.CMD_LE_ENCRYPT_REQ, 34, HCICommands.BT_HCI_OP_LE_ENCRYPT, *key);
-    cmd += struct.pack('<16B', *plaintext);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 21, to);
-
-    if ( 21 != len(packet) ):
-        raise Exception("LE Encrypt command failed: Response too short (Expected %i bytes got %i bytes)" % (21, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet[:5]);
-    EncData = struct.unpack('<16B', packet[5:]);
-
-    if ( RespCmd != Commands.CMD_LE_ENCRYPT_RSP ):
-        raise Exception("LE Encrypt command failed: Inappropriate command response received");
-
-    if ( RespLen != 17 ):
-        raise Exception("LE Encrypt command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status, EncData;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_ENCRYPT_REQ, (key, plaintext), to);
 
 """
     The LE_Rand command is used to request the Controller to generate 8 octets of random data to be sent to the Host. The
@@ -1612,24 +1260,7 @@ def le_encrypt(transport, idx, key, plaintext, to):
 """
 def le_rand(transport, idx, to):
 
-    cmd = struct.pack('<HHH', Commands.CMD_LE_RAND_REQ, 2, HCICommands.BT_HCI_OP_LE_RAND);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 13, to);
-
-    if ( 13 != len(packet) ):
-        raise Exception("LE Rand command failed: Response too short (Expected %i bytes got %i bytes)" % (13, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet[:5]);
-    rand = struct.unpack('<8B', packet[5:]);
-
-    if ( RespCmd != Commands.CMD_LE_RAND_RSP ):
-        raise Exception("LE Rand command failed: Inappropriate command response received");
-
-    if ( RespLen != 9 ):
-        raise Exception("LE Rand command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status, rand;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_RAND_REQ, (), to);
 
 
 def le_start_encryption(transport, idx, handle, rand, ediv, ltk, to):
@@ -1656,23 +1287,7 @@ def le_start_encryption(transport, idx, handle, rand, ediv, ltk, to):
 """
 def le_long_term_key_request_reply(transport, idx, handle, ltk, to):
 
-    cmd = struct.pack('<HHHH16B', Commands.CMD_LE_LONG_TERM_KEY_REQUEST_REPLY_REQ, 20, HCICommands.BT_HCI_OP_LE_LTK_REQ_REPLY, handle, *ltk);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 7, to);
-
-    if ( 7 != len(packet) ):
-        raise Exception("LE Long Term Key Request Reply command failed: Response too short (Expected %i bytes got %i bytes)" % (7, len(packet)));
-
-    RespCmd, RespLen, status, handle = struct.unpack('<HHBH', packet);
-
-    if ( RespCmd != Commands.CMD_LE_LONG_TERM_KEY_REQUEST_REPLY_RSP ):
-        raise Exception("LE Long Term Key Request Reply command failed: Inappropriate command response received");
-
-    if ( RespLen != 3 ):
-        raise Exception("LE Long Term Key Request Reply command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status, handle;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_LONG_TERM_KEY_REQUEST_REPLY_REQ, (handle, ltk), to);
 
 """
     The LE_Long_Term_Key_Request_Negative_Reply command is used to reply to an LE Long Term Key Request event from the
@@ -1680,23 +1295,7 @@ def le_long_term_key_request_reply(transport, idx, handle, ltk, to):
 """
 def le_long_term_key_request_negative_reply(transport, idx, handle, to):
 
-    cmd = struct.pack('<HHHH', Commands.CMD_LE_LONG_TERM_KEY_REQUEST_NEGATIVE_REPLY_REQ, 4, HCICommands.BT_HCI_OP_LE_LTK_REQ_NEG_REPLY, handle);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 7, to);
-
-    if ( 7 != len(packet) ):
-        raise Exception("LE Long Term Key Request Negative Reply command failed: Response too short (Expected %i bytes got %i bytes)" % (7, len(packet)));
-
-    RespCmd, RespLen, status, handle = struct.unpack('<HHBH', packet);
-
-    if ( RespCmd != Commands.CMD_LE_LONG_TERM_KEY_REQUEST_NEGATIVE_REPLY_RSP ):
-        raise Exception("LE Long Term Key Request Negative Reply command failed: Inappropriate command response received");
-
-    if ( RespLen != 3 ):
-        raise Exception("LE Long Term Key Request Negative Reply command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status, handle;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_LONG_TERM_KEY_REQUEST_NEGATIVE_REPLY_REQ, (handle,), to);
 
 """
     The LE_Read_Supported_States command reads the states and state combinations that the link layer supports. See [Vol 6]
@@ -1706,24 +1305,7 @@ def le_long_term_key_request_negative_reply(transport, idx, handle, to):
 """
 def le_read_supported_states(transport, idx, to):
 
-    cmd = struct.pack('<HHH', Commands.CMD_LE_READ_SUPPORTED_STATES_REQ, 2, HCICommands.BT_HCI_OP_LE_READ_SUPP_STATES);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 13, to);
-
-    if ( 13 != len(packet) ):
-        raise Exception("LE Read Supported States command failed: Response too short (Expected %i bytes got %i bytes)" % (13, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet[:5]);
-    LeStates = struct.unpack('<8B', packet[5:]);
-
-    if ( RespCmd != Commands.CMD_LE_READ_SUPPORTED_STATES_RSP ):
-        raise Exception("LE Read Supported States command failed: Inappropriate command response received");
-
-    if ( RespLen != 9 ):
-        raise Exception("LE Read Supported States command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status, LeStates;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_READ_SUPPORTED_STATES_REQ, (), to);
 
 """
     This command is used to start a test where the DUT receives test reference packets at a fixed interval. The tester
@@ -1731,23 +1313,7 @@ def le_read_supported_states(transport, idx, to):
 """
 def le_receiver_test(transport, idx, RxCh, to):
 
-    cmd = struct.pack('<HHHB', Commands.CMD_LE_RECEIVER_TEST_REQ, 3, HCICommands.BT_HCI_OP_LE_RX_TEST, RxCh);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Receiver Test command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_RECEIVER_TEST_RSP ):
-        raise Exception("LE Receiver Test command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Receiver Test command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_RECEIVER_TEST_REQ, (RxCh,), to);
 
 """
     This command is used to start a test where the DUT generates test reference packets at a fixed interval. The Controller
@@ -1755,47 +1321,15 @@ def le_receiver_test(transport, idx, RxCh, to):
 """
 def le_transmitter_test(transport, idx, TxCh, TestDataLen, PktPayload, to):
 
-    cmd = struct.pack('<HHHBBB', Commands.CMD_LE_TRANSMITTER_TEST_REQ, 5, HCICommands.BT_HCI_OP_LE_TX_TEST, TxCh, TestDataLen, PktPayload);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Transmitter Test command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_TRANSMITTER_TEST_RSP ):
-        raise Exception("LE Transmitter Test command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Transmitter Test command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_TRANSMITTER_TEST_REQ, (TxCh, TestDataLen, PktPayload), to);
 
 """
     This command is used to stop any test which is in progress. The Number_Of_Packets for a transmitter test shall be reported
-    as 0x0000. The Number_Of_Packets is an unsigned number and contains the number of received packets.
-"""
-def le_test_end(transport, idx, to):
-
-    cmd = struct.pack('<HHH', Commands.CMD_LE_TEST_END_REQ, 2, HCICommands.BT_HCI_OP_LE_TEST_END);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 7, to);
-
-    if ( 7 != len(packet) ):
-        raise Exception("LE Test End command failed: Response too short (Expected %i bytes got %i bytes)" % (7, len(packet)));
-
-    RespCmd, RespLen, status, RxPktCount = struct.unpack('<HHBH', packet);
-
-    if ( RespCmd != Commands.CMD_LE_TEST_END_RSP ):
-        raise Exception("LE Test End command failed: Inappropriate command response received");
-
-    if ( RespLen != 3 ):
-        raise Exception("LE Test End command failed: Response length field corrupted (%i)" % RespLen);
+    as 0x0000. The Number_Of_Packets is an unsigned number and contains the number of received packets.
+"""
+def le_test_end(transport, idx, to):
 
-    return status, RxPktCount;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_TEST_END_REQ, (), to);
 
 """
     Both the central Host and the peripheral Host use this command to reply to the HCI LE Remote Connection Parameter Request event.
@@ -1803,23 +1337,7 @@ def le_test_end(transport, idx, to):
 """
 def le_remote_connection_parameter_request_reply(transport, idx, handle, IntervalMin, IntervalMax, latency, timeout, MinCeLen, MaxCeLen, to):
 
-    cmd = struct.pack('<HHHHHHHHHH', Commands.CMD_LE_REMOTE_CONNECTION_PARAMETER_REQUEST_REPLY_REQ, 16, HCICommands.BT_HCI_OP_LE_CONN_PARAM_REQ_REPLY, handle, IntervalMin, IntervalMax, latency, timeout, MinCeLen, MaxCeLen);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 7, to);
-
-    if ( 7 != len(packet) ):
-        raise Exception("LE Remote Connection Parameter Request Reply command failed: Response too short (Expected %i bytes got %i bytes)" % (7, len(packet)));
-
-    RespCmd, RespLen, status, handle = struct.unpack('<HHBH', packet);
-
-    if ( RespCmd != Commands.CMD_LE_REMOTE_CONNECTION_PARAMETER_REQUEST_REPLY_RSP ):
-        raise Exception("LE Remote Connection Parameter Request Reply command failed: Inappropriate command response received");
-
-    if ( RespLen != 3 ):
-        raise Exception("LE Remote Connection Parameter Request Reply command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status, handle;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_REMOTE_CONNECTION_PARAMETER_REQUEST_REPLY_REQ, (handle, IntervalMin, IntervalMax, latency, timeout, MinCeLen, MaxCeLen), to);
 
 """
     Both the central Host and the peripheral Host use this command to reply to the HCI LE Remote Connection Parameter Request event.
@@ -1828,23 +1346,7 @@ def le_remote_connection_parameter_request_reply(transport, idx, handle, Interva
 """
 def le_remote_connection_parameter_request_negative_reply(transport, idx, handle, reason, to):
 
-    cmd = struct.pack('<HHHHB', Commands.CMD_LE_REMOTE_CONNECTION_PARAMETER_REQUEST_NEGATIVE_REPLY_REQ, 5, HCICommands.BT_HCI_OP_LE_CONN_PARAM_REQ_NEG_REPLY, handle, reason);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 7, to);
-
-    if ( 7 != len(packet) ):
-        raise Exception("LE Remote Connection Parameter Request Negative Reply command failed: Response too short (Expected %i bytes got %i bytes)" % (7, len(packet)));
-
-    RespCmd, RespLen, status, handle = struct.unpack('<HHBH', packet);
-
-    if ( RespCmd != Commands.CMD_LE_REMOTE_CONNECTION_PARAMETER_REQUEST_NEGATIVE_REPLY_RSP ):
-        raise Exception("LE Remote Connection Parameter Request Negative Reply command failed: Inappropriate command response received");
-
-    if ( RespLen != 3 ):
-        raise Exception("LE Remote Connection Parameter Request Negative Reply command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status, handle;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_REMOTE_CONNECTION_PARAMETER_REQUEST_NEGATIVE_REPLY_REQ, (handle, reason), to);
 
 """
     The LE_Set_Data_Length command allows the Host to suggest maximum transmission packet size and maximum packet transmission
@@ -1853,23 +1355,7 @@ def le_remote_connection_parameter_request_negative_reply(transport, idx, handle
 """
 def le_set_data_length(transport, idx, handle, TxOctets, TxTime, to):
 
-    cmd = struct.pack('<HHHHHH', Commands.CMD_LE_SET_DATA_LENGTH_REQ, 8, HCICommands.BT_HCI_OP_LE_SET_DATA_LEN, handle, TxOctets, TxTime);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 7, to);
-
-    if ( 7 != len(packet) ):
-        raise Exception("LE Set Data Length command failed: Response too short (Expected %i bytes got %i bytes)" % (7, len(packet)));
-
-    RespCmd, RespLen, status, handle = struct.unpack('<HHBH', packet);
-
-    if ( RespCmd != Commands.CMD_LE_SET_DATA_LENGTH_RSP ):
-        raise Exception("LE Set Data Length command failed: Inappropriate command response received");
-
-    if ( RespLen != 3 ):
-        raise Exception("LE Set Data Length command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status, handle;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_SET_DATA_LENGTH_REQ, (handle, TxOctets, TxTime), to);
 
 """
     The LE_Read_Suggested_Default_Data_Length command allows the Host to read the Host's suggested values
@@ -1878,23 +1364,7 @@ def le_set_data_length(transport, idx, handle, TxOctets, TxTime, to):
 """
 def le_read_suggested_default_data_length(transport, idx, to):
 
-    cmd = struct.pack('<HHH', Commands.CMD_LE_READ_SUGGESTED_DEFAULT_DATA_LENGTH_REQ, 2, HCICommands.BT_HCI_OP_LE_READ_DEFAULT_DATA_LEN);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 9, to);
-
-    if ( 9 != len(packet) ):
-        raise Exception("LE Read Suggested Default Data Length command failed: Response too short (Expected %i bytes got %i bytes)" % (9, len(packet)));
-
-    RespCmd, RespLen, status, MaxTxOctets, MaxTxTime = struct.unpack('<HHBHH', packet);
-
-    if ( RespCmd != Commands.CMD_LE_READ_SUGGESTED_DEFAULT_DATA_LENGTH_RSP ):
-        raise Exception("LE Read Suggested Default Data Length command failed: Inappropriate command response received");
-
-    if ( RespLen != 5 ):
-        raise Exception("LE Read Suggested Default Data Length command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status, MaxTxOctets, MaxTxTime;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_READ_SUGGESTED_DEFAULT_DATA_LENGTH_REQ, (), to);
 
 """
     The LE_Write_Suggested_Default_Data_Length command allows the Host to specify its suggested values for the Controller's
@@ -1904,23 +1374,7 @@ def le_read_suggested_default_data_length(transport, idx, to):
 """
 def le_write_suggested_default_data_length(transport, idx, MaxTxOctets, MaxTxTime, to):
 
-    cmd = struct.pack('<HHHHH', Commands.CMD_LE_WRITE_SUGGESTED_DEFAULT_DATA_LENGTH_REQ, 6, HCICommands.BT_HCI_OP_LE_WRITE_DEFAULT_DATA_LEN, MaxTxOctets, MaxTxTime);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Write Suggested Default Data Length command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_WRITE_SUGGESTED_DEFAULT_DATA_LENGTH_RSP ):
-        raise Exception("LE Write Suggested Default Data Length command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Write Suggested Default Data Length command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_WRITE_SUGGESTED_DEFAULT_DATA_LENGTH_REQ, (MaxTxOctets, MaxTxTime), to);
 
 """
     The LE_Read_Local_P-256_Public_Key command is used to return the local P-256 public key from the Controller. The
@@ -1929,23 +1383,7 @@ def le_write_suggested_default_data_length(transport, idx, MaxTxOctets, MaxTxTim
 """
 def le_read_local_p_256_public_key_command(transport, idx, to):
 
-    cmd = struct.pack('<HHH', Commands.CMD_LE_READ_LOCAL_P_256_PUBLIC_KEY_COMMAND_REQ, 2, HCICommands.BT_HCI_OP_LE_P256_PUBLIC_KEY);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Read Local P-256 Public Key Command command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_READ_LOCAL_P_256_PUBLIC_KEY_COMMAND_RSP ):
-        raise Exception("LE Read Local P-256 Public Key Command command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Read Local P-256 Public Key Command command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_READ_LOCAL_P_256_PUBLIC_KEY_COMMAND_REQ, (), to);
 
 """
     The LE_Generate_DHKey command is used to initiate generation of a Diffie-Hellman key in the Controller for use over the LE
@@ -1955,23 +1393,7 @@ def le_read_local_p_256_public_key_command(transport, idx, to):
 """
 def le_generate_dhkey_command(transport, idx, key, to):
 
-    cmd = struct.pack('<HHH64B', Commands.CMD_LE_GENERATE_DHKEY_COMMAND_REQ, 66, HCICommands.BT_HCI_OP_LE_GENERATE_DHKEY, *key);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Generate DHKey Command command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_GENERATE_DHKEY_COMMAND_RSP ):
-        raise Exception("LE Generate DHKey Command command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Generate DHKey Command command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_GENERATE_DHKEY_COMMAND_REQ, (key,), to);
 
 """
     The LE_Add_Device_To_Resolving_List command is used to add one device to the list of address translations used to resolve
@@ -1979,25 +1401,7 @@ def le_generate_dhkey_command(transport, idx, key, to):
 """
 def le_add_device_to_resolving_list(transport, idx, PeerIdAddrType, AVal, PeerIrk, LocalIrk, to):
 
-    cmd = struct.pack('<HHHB6B', Commands.CMD_LE_ADD_DEVICE_TO_RESOLVING_LIST_REQ, 41, HCICommands.BT_HCI_OP_LE_ADD_DEV_TO_RL, PeerIdAddrType, *AVal);
-    cmd += struct.pack('<16B', *PeerIrk);
-    cmd += struct.pack('<16B', *LocalIrk);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Add Device To Resolving List command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_ADD_DEVICE_TO_RESOLVING_LIST_RSP ):
-        raise Exception("LE Add Device To Resolving List command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Add Device To Resolving List command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_ADD_DEVICE_TO_RESOLVING_LIST_REQ, (PeerIdAddrType, AVal, PeerIrk, LocalIrk), to);
 
 """
     The LE_Remove_Device_From_Resolving_List command is used to remove one device from the list of address translations used
@@ -2005,23 +1409,7 @@ def le_add_device_to_resolving_list(transport, idx, PeerIdAddrType, AVal, PeerIr
 """
 def le_remove_device_from_resolving_list(transport, idx, PeerIdAddrType, AVal, to):
 
-    cmd = struct.pack('<HHHB6B', Commands.CMD_LE_REMOVE_DEVICE_FROM_RESOLVING_LIST_REQ, 9, HCICommands.BT_HCI_OP_LE_REM_DEV_FROM_RL, PeerIdAddrType, *AVal);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Remove Device From Resolving List command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_REMOVE_DEVICE_FROM_RESOLVING_LIST_RSP ):
-        raise Exception("LE Remove Device From Resolving List command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Remove Device From Resolving List command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_REMOVE_DEVICE_FROM_RESOLVING_LIST_REQ, (PeerIdAddrType, AVal), to);
 
 """
     The LE_Clear_Resolving_List command is used to remove all devices from the list of address translations used to resolve
@@ -2029,23 +1417,7 @@ def le_remove_device_from_resolving_list(transport, idx, PeerIdAddrType, AVal, t
 """
 def le_clear_resolving_list(transport, idx, to):
 
-    cmd = struct.pack('<HHH', Commands.CMD_LE_CLEAR_RESOLVING_LIST_REQ, 2, HCICommands.BT_HCI_OP_LE_CLEAR_RL);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Clear Resolving List command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_CLEAR_RESOLVING_LIST_RSP ):
-        raise Exception("LE Clear Resolving List command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Clear Resolving List command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_CLEAR_RESOLVING_LIST_REQ, (), to);
 
 """
     The LE_Read_Resolving_List_Size command is used to read the total number of address translation entries in the resolving
@@ -2054,23 +1426,7 @@ def le_clear_resolving_list(transport, idx, to):
 """
 def le_read_resolving_list_size(transport, idx, to):
 
-    cmd = struct.pack('<HHH', Commands.CMD_LE_READ_RESOLVING_LIST_SIZE_REQ, 2, HCICommands.BT_HCI_OP_LE_READ_RL_SIZE);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 6, to);
-
-    if ( 6 != len(packet) ):
-        raise Exception("LE Read Resolving List Size command failed: Response too short (Expected %i bytes got %i bytes)" % (6, len(packet)));
-
-    RespCmd, RespLen, status, RlSize = struct.unpack('<HHBB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_READ_RESOLVING_LIST_SIZE_RSP ):
-        raise Exception("LE Read Resolving List Size command failed: Inappropriate command response received");
-
-    if ( RespLen != 2 ):
-        raise Exception("LE Read Resolving List Size command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status, RlSize;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_READ_RESOLVING_LIST_SIZE_REQ, (), to);
 
 """
     The LE_Read_Peer_Resolvable_Address command is used to get the current peer Resolvable Private Address being used for the
@@ -2079,24 +1435,7 @@ def le_read_resolving_list_size(transport, idx, to):
 """
 def le_read_peer_resolvable_address(transport, idx, PeerIdAddrType, AVal, to):
 
-    cmd = struct.pack('<HHHB6B', Commands.CMD_LE_READ_PEER_RESOLVABLE_ADDRESS_REQ, 9, HCICommands.BT_HCI_OP_LE_READ_PEER_RPA, PeerIdAddrType, *AVal);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 11, to);
-
-    if ( 11 != len(packet) ):
-        raise Exception("LE Read Peer Resolvable Address command failed: Response too short (Expected %i bytes got %i bytes)" % (11, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet[:5]);
-    PeerRpaVal = struct.unpack('<6B', packet[5:]);
-
-    if ( RespCmd != Commands.CMD_LE_READ_PEER_RESOLVABLE_ADDRESS_RSP ):
-        raise Exception("LE Read Peer Resolvable Address command failed: Inappropriate command response received");
-
-    if ( RespLen != 7 ):
-        raise Exception("LE Read Peer Resolvable Address command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status, list(PeerRpaVal);
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_READ_PEER_RESOLVABLE_ADDRESS_REQ, (PeerIdAddrType, AVal), to);
 
 """
     The LE_Read_Local_Resolvable_Address command is used to get the current local Resolvable Private Address being used for
@@ -2104,24 +1443,7 @@ def le_read_peer_resolvable_address(transport, idx, PeerIdAddrType, AVal, to):
 """
 def le_read_local_resolvable_address(transport, idx, PeerIdAddrType, AVal, to):
 
-    cmd = struct.pack('<HHHB6B', Commands.CMD_LE_READ_LOCAL_RESOLVABLE_ADDRESS_REQ, 9, HCICommands.BT_HCI_OP_LE_READ_LOCAL_RPA, PeerIdAddrType, *AVal);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 11, to);
-
-    if ( 11 != len(packet) ):
-        raise Exception("LE Read Local Resolvable Address command failed: Response too short (Expected %i bytes got %i bytes)" % (11, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet[:5]);
-    LocalRpaVal = struct.unpack('<6B', packet[5:]);
-
-    if ( RespCmd != Commands.CMD_LE_READ_LOCAL_RESOLVABLE_ADDRESS_RSP ):
-        raise Exception("LE Read Local Resolvable Address command failed: Inappropriate command response received");
-
-    if ( RespLen != 7 ):
-        raise Exception("LE Read Local Resolvable Address command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status, list(LocalRpaVal);
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_READ_LOCAL_RESOLVABLE_ADDRESS_REQ, (PeerIdAddrType, AVal), to);
 
 """
     The LE_Set_Address_Resolution_Enable command is used to enable resolution of Resolvable Private Addresses in the
@@ -2130,23 +1452,7 @@ def le_read_local_resolvable_address(transport, idx, PeerIdAddrType, AVal, to):
 """
 def le_set_address_resolution_enable(transport, idx, enable, to):
 
-    cmd = struct.pack('<HHHB', Commands.CMD_LE_SET_ADDRESS_RESOLUTION_ENABLE_REQ, 3, HCICommands.BT_HCI_OP_LE_SET_ADDR_RES_ENABLE, enable);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Set Address Resolution Enable command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_SET_ADDRESS_RESOLUTION_ENABLE_RSP ):
-        raise Exception("LE Set Address Resolution Enable command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Set Address Resolution Enable command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_SET_ADDRESS_RESOLUTION_ENABLE_REQ, (enable,), to);
 
 """
     The LE_Set_Resolvable_Private_Address_Timeout command set the length of time the Controller uses a Resolvable Private
@@ -2154,23 +1460,7 @@ def le_set_address_resolution_enable(transport, idx, enable, to):
 """
 def le_set_resolvable_private_address_timeout(transport, idx, RpaTimeout, to):
 
-    cmd = struct.pack('<HHHH', Commands.CMD_LE_SET_RESOLVABLE_PRIVATE_ADDRESS_TIMEOUT_REQ, 4, HCICommands.BT_HCI_OP_LE_SET_RPA_TIMEOUT, RpaTimeout);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Set Resolvable Private Address Timeout command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_SET_RESOLVABLE_PRIVATE_ADDRESS_TIMEOUT_RSP ):
-        raise Exception("LE Set Resolvable Private Address Timeout command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Set Resolvable Private Address Timeout command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_SET_RESOLVABLE_PRIVATE_ADDRESS_TIMEOUT_REQ, (RpaTimeout,), to);
 
 """
     The LE_Read_Maximum_Data_Length command allows the Host to read the Controller\92s maximum supported payload octets and
@@ -2179,23 +1469,7 @@ def le_set_resolvable_private_address_timeout(transport, idx, RpaTimeout, to):
 """
 def le_read_maximum_data_length(transport, idx, to):
 
-    cmd = struct.pack('<HHH', Commands.CMD_LE_READ_MAXIMUM_DATA_LENGTH_REQ, 2, HCICommands.BT_HCI_OP_LE_READ_MAX_DATA_LEN);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 13, to);
-
-    if ( 13 != len(packet) ):
-        raise Exception("LE Read Maximum Data Length command failed: Response too short (Expected %i bytes got %i bytes)" % (13, len(packet)));
-
-    RespCmd, RespLen, status, MaxTxOctets, MaxTxTime, MaxRxOctets, MaxRxTime = struct.unpack('<HHBHHHH', packet);
-
-    if ( RespCmd != Commands.CMD_LE_READ_MAXIMUM_DATA_LENGTH_RSP ):
-        raise Exception("LE Read Maximum Data Length command failed: Inappropriate command response received");
-
-    if ( RespLen != 9 ):
-        raise Exception("LE Read Maximum Data Length command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status, MaxTxOctets, MaxTxTime, MaxRxOctets, MaxRxTime;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_READ_MAXIMUM_DATA_LENGTH_REQ, (), to);
 
 """
     The LE_Read_PHY command is used to read the current transmitter PHY and receiver PHY on the connection identified by the
@@ -2203,23 +1477,7 @@ def le_read_maximum_data_length(transport, idx, to):
 """
 def le_read_phy(transport, idx, handle, to):
 
-    cmd = struct.pack('<HHHH', Commands.CMD_LE_READ_PHY_REQ, 4, HCICommands.BT_HCI_OP_LE_READ_PHY, handle);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 9, to);
-
-    if ( 9 != len(packet) ):
-        raise Exception("LE Read PHY command failed: Response too short (Expected %i bytes got %i bytes)" % (9, len(packet)));
-
-    RespCmd, RespLen, status, handle, TxPhy, RxPhy = struct.unpack('<HHBHBB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_READ_PHY_RSP ):
-        raise Exception("LE Read PHY command failed: Inappropriate command response received");
-
-    if ( RespLen != 5 ):
-        raise Exception("LE Read PHY command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status, handle, TxPhy, RxPhy;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_READ_PHY_REQ, (handle,), to);
 
 """
     The LE_Set_Default_PHY command allows the Host to specify its preferred values for the transmitter PHY and receiver PHY to
@@ -2227,23 +1485,7 @@ def le_read_phy(transport, idx, handle, to):
 """
 def le_set_default_phy(transport, idx, AllPhys, TxPhys, RxPhys, to):
 
-    cmd = struct.pack('<HHHBBB', Commands.CMD_LE_SET_DEFAULT_PHY_REQ, 5, HCICommands.BT_HCI_OP_LE_SET_DEFAULT_PHY, AllPhys, TxPhys, RxPhys);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Set Default PHY command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_SET_DEFAULT_PHY_RSP ):
-        raise Exception("LE Set Default PHY command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Set Default PHY command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_SET_DEFAULT_PHY_REQ, (AllPhys, TxPhys, RxPhys), to);
 
 """
     The LE_Set_PHY command is used to set the PHY preferences for the connection identified by the Connection_Handle. The
@@ -2252,23 +1494,7 @@ def le_set_default_phy(transport, idx, AllPhys, TxPhys, RxPhys, to):
 """
 def le_set_phy(transport, idx, handle, AllPhys, TxPhys, RxPhys, PhyOpts, to):
 
-    cmd = struct.pack('<HHHHBBBH', Commands.CMD_LE_SET_PHY_REQ, 9, HCICommands.BT_HCI_OP_LE_SET_PHY, handle, AllPhys, TxPhys, RxPhys, PhyOpts);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Set PHY command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_SET_PHY_RSP ):
-        raise Exception("LE Set PHY command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Set PHY command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_SET_PHY_REQ, (handle, AllPhys, TxPhys, RxPhys, PhyOpts), to);
 
 """
     This command is used to start a test where the DUT receives test reference packets at a fixed interval. The tester
@@ -2276,23 +1502,7 @@ def le_set_phy(transport, idx, handle, AllPhys, TxPhys, RxPhys, PhyOpts, to):
 """
 def le_enhanced_receiver_test(transport, idx, RxCh, phy, ModIndex, to):
 
-    cmd = struct.pack('<HHHBBB', Commands.CMD_LE_ENHANCED_RECEIVER_TEST_REQ, 5, HCICommands.BT_HCI_OP_LE_ENH_RX_TEST, RxCh, phy, ModIndex);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Enhanced Receiver Test command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_ENHANCED_RECEIVER_TEST_RSP ):
-        raise Exception("LE Enhanced Receiver Test command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Enhanced Receiver Test command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_ENHANCED_RECEIVER_TEST_REQ, (RxCh, phy, ModIndex), to);
 
 """
     This command is used to start a test where the DUT generates test reference packets at a fixed interval. The Controller
@@ -2300,23 +1510,7 @@ def le_enhanced_receiver_test(transport, idx, RxCh, phy, ModIndex, to):
 """
 def le_enhanced_transmitter_test(transport, idx, TxCh, TestDataLen, PktPayload, phy, to):
 
-    cmd = struct.pack('<HHHBBBB', Commands.CMD_LE_ENHANCED_TRANSMITTER_TEST_REQ, 6, HCICommands.BT_HCI_OP_LE_ENH_TX_TEST, TxCh, TestDataLen, PktPayload, phy);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Enhanced Transmitter Test command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_ENHANCED_TRANSMITTER_TEST_RSP ):
-        raise Exception("LE Enhanced Transmitter Test command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Enhanced Transmitter Test command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_ENHANCED_TRANSMITTER_TEST_REQ, (TxCh, TestDataLen, PktPayload, phy), to);
 
 """
     The LE_Set_Extended_Advertising_Parameters command is used by the Host to set the advertising parameters.
@@ -2498,69 +1692,21 @@ def le_read_number_of_supported_advertising_sets(transport, idx, to):
 """
 def le_remove_advertising_set(transport, idx, handle, to):
 
-    cmd = struct.pack('<HHHB', Commands.CMD_LE_REMOVE_ADVERTISING_SET_REQ, 3, HCICommands.BT_HCI_OP_LE_REMOVE_ADV_SET, handle);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Remove Advertising Set command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_REMOVE_ADVERTISING_SET_RSP ):
-        raise Exception("LE Remove Advertising Set command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Remove Advertising Set command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_REMOVE_ADVERTISING_SET_REQ, (handle,), to);
 
 """
     The LE_Clear_Advertising_Sets command is used to remove all existing advertising sets from the Controller.
 """
 def le_clear_advertising_sets(transport, idx, to):
 
-    cmd = struct.pack('<HHH', Commands.CMD_LE_CLEAR_ADVERTISING_SETS_REQ, 2, HCICommands.BT_HCI_OP_CLEAR_ADV_SETS);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Clear Advertising Sets command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_CLEAR_ADVERTISING_SETS_RSP ):
-        raise Exception("LE Clear Advertising Sets command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Clear Advertising Sets command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
-
-"""
-    The LE_Set_Periodic_Advertising_Parameters command is used by the Host to set the parameters for periodic advertising.
-"""
-def le_set_periodic_advertising_parameters(transport, idx, handle, MinInterval, MaxInterval, props, to):
-
-    cmd = struct.pack('<HHHBHHH', Commands.CMD_LE_SET_PERIODIC_ADVERTISING_PARAMETERS_REQ, 9, HCICommands.BT_HCI_OP_LE_SET_PER_ADV_PARAM, handle, MinInterval, MaxInterval, props);
-    transport.send(idx, cmd);
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_CLEAR_ADVERTISING_SETS_REQ, (), to);
 
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Set Periodic Advertising Parameters command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_SET_PERIODIC_ADVERTISING_PARAMETERS_RSP ):
-        raise Exception("LE Set Periodic Advertising Parameters command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Set Periodic Advertising Parameters command failed: Response length field corrupted (%i)" % RespLen);
+"""
+    The LE_Set_Periodic_Advertising_Parameters command is used by the Host to set the parameters for periodic advertising.
+"""
+def le_set_periodic_advertising_parameters(transport, idx, handle, MinInterval, MaxInterval, props, to):
 
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_SET_PERIODIC_ADVERTISING_PARAMETERS_REQ, (handle, MinInterval, MaxInterval, props), to);
 
 """
     The LE_Set_Periodic_Advertising_Data command is used to set the data used in periodic advertising PDUs. This command may
@@ -2571,23 +1717,7 @@ def le_set_periodic_advertising_parameters(transport, idx, handle, MinInterval,
 """
 def le_set_periodic_advertising_data(transport, idx, handle, op, dataLen, data, to):
 
-    cmd = struct.pack('<HHHBBB251B', Commands.CMD_LE_SET_PERIODIC_ADVERTISING_DATA_REQ, 256, HCICommands.BT_HCI_OP_LE_SET_PER_ADV_DATA, handle, op, dataLen, *data);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Set Periodic Advertising Data command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_SET_PERIODIC_ADVERTISING_DATA_RSP ):
-        raise Exception("LE Set Periodic Advertising Data command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Set Periodic Advertising Data command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_SET_PERIODIC_ADVERTISING_DATA_REQ, (handle, op, dataLen, data), to);
 
 """
     The LE_Set_Periodic_Advertising_Enable command is used to request the Controller to enable or disable the periodic
@@ -2595,23 +1725,7 @@ def le_set_periodic_advertising_data(transport, idx, handle, op, dataLen, data,
 """
 def le_set_periodic_advertising_enable(transport, idx, enable, handle, to):
 
-    cmd = struct.pack('<HHHBB', Commands.CMD_LE_SET_PERIODIC_ADVERTISING_ENABLE_REQ, 4, HCICommands.BT_HCI_OP_LE_SET_PER_ADV_ENABLE, enable, handle);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Set Periodic Advertising Enable command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_SET_PERIODIC_ADVERTISING_ENABLE_RSP ):
-        raise Exception("LE Set Periodic Advertising Enable command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Set Periodic Advertising Enable command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_SET_PERIODIC_ADVERTISING_ENABLE_REQ, (enable, handle), to);
 
 """
     The LE_Set_Extended_Scan_Parameters command is used to set the extended scan parameters to be used on the advertising
@@ -2645,23 +1759,7 @@ def le_set_extended_scan_parameters(transport, idx, OwnAddrType, FilterPolicy, p
 """
 def le_set_extended_scan_enable(transport, idx, enable, FilterDup, duration, period, to):
 
-    cmd = struct.pack('<HHHBBHH', Commands.CMD_LE_SET_EXTENDED_SCAN_ENABLE_REQ, 8, HCICommands.BT_HCI_OP_LE_SET_EXT_SCAN_ENABLE, enable, FilterDup, duration, period);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Set Extended Scan Enable command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_SET_EXTENDED_SCAN_ENABLE_RSP ):
-        raise Exception("LE Set Extended Scan Enable command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Set Extended Scan Enable command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_SET_EXTENDED_SCAN_ENABLE_REQ, (enable, FilterDup, duration, period), to);
 
 """
     The LE_Extended_Create_Connection command is used to create a Link Layer connection to a connectable advertiser.
@@ -2698,24 +1796,7 @@ def le_extended_create_connection(transport, idx, FilterPolicy, OwnAddrType, Pee
 """
 def le_periodic_advertising_create_sync(transport, idx, FilterPolicy, sid, AddrType, AVal, skip, SyncTimeout, unused, to):
 
-    cmd = struct.pack('<HHHBBB6B', Commands.CMD_LE_PERIODIC_ADVERTISING_CREATE_SYNC_REQ, 16, HCICommands.BT_HCI_OP_LE_PER_ADV_CREATE_SYNC, FilterPolicy, sid, AddrType, *AVal);
-    cmd += struct.pack('<HHB', skip, SyncTimeout, unused);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Periodic Advertising Create Sync command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_PERIODIC_ADVERTISING_CREATE_SYNC_RSP ):
-        raise Exception("LE Periodic Advertising Create Sync command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Periodic Advertising Create Sync command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_PERIODIC_ADVERTISING_CREATE_SYNC_REQ, (FilterPolicy, sid, AddrType, AVal, skip, SyncTimeout, unused), to);
 
 """
     The LE_Periodic_Advertising_Create_Sync_Cancel command is used to cancel the LE_Periodic_Advertising_Create_Sync command
@@ -2723,23 +1804,7 @@ def le_periodic_advertising_create_sync(transport, idx, FilterPolicy, sid, AddrT
 """
 def le_periodic_advertising_create_sync_cancel(transport, idx, to):
 
-    cmd = struct.pack('<HHH', Commands.CMD_LE_PERIODIC_ADVERTISING_CREATE_SYNC_CANCEL_REQ, 2, HCICommands.BT_HCI_OP_LE_PER_ADV_CREATE_SYNC_CANCEL);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Periodic Advertising Create Sync Cancel command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_PERIODIC_ADVERTISING_CREATE_SYNC_CANCEL_RSP ):
-        raise Exception("LE Periodic Advertising Create Sync Cancel command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Periodic Advertising Create Sync Cancel command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_PERIODIC_ADVERTISING_CREATE_SYNC_CANCEL_REQ, (), to);
 
 """
     The LE_Periodic_Advertising_Terminate_Sync command is used to stop reception of the periodic advertising identified by the
@@ -2747,23 +1812,7 @@ def le_periodic_advertising_create_sync_cancel(transport, idx, to):
 """
 def le_periodic_advertising_terminate_sync(transport, idx, handle, to):
 
-    cmd = struct.pack('<HHHH', Commands.CMD_LE_PERIODIC_ADVERTISING_TERMINATE_SYNC_REQ, 4, HCICommands.BT_HCI_OP_LE_PER_ADV_TERMINATE_SYNC, handle);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Periodic Advertising Terminate Sync command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_PERIODIC_ADVERTISING_TERMINATE_SYNC_RSP ):
-        raise Exception("LE Periodic Advertising Terminate Sync command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Periodic Advertising Terminate Sync command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_PERIODIC_ADVERTISING_TERMINATE_SYNC_REQ, (handle,), to);
 
 """
     The LE_Add_Device_To_Periodic_Advertiser_List command is used to add a single device to the Periodic Advertiser list
@@ -2772,24 +1821,7 @@ def le_periodic_advertising_terminate_sync(transport, idx, handle, to):
 """
 def le_add_device_to_periodic_advertiser_list(transport, idx, AddrType, AVal, sid, to):
 
-    cmd = struct.pack('<HHHB6B', Commands.CMD_LE_ADD_DEVICE_TO_PERIODIC_ADVERTISER_LIST_REQ, 10, HCICommands.BT_HCI_OP_LE_ADD_DEV_TO_PER_ADV_LIST, AddrType, *AVal);
-    cmd += struct.pack('<B', sid);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Add Device To Periodic Advertiser List command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_ADD_DEVICE_TO_PERIODIC_ADVERTISER_LIST_RSP ):
-        raise Exception("LE Add Device To Periodic Advertiser List command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Add Device To Periodic Advertiser List command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_ADD_DEVICE_TO_PERIODIC_ADVERTISER_LIST_REQ, (AddrType, AVal, sid), to);
 
 """
     The LE_Remove_Device_From_Periodic_Advertiser_List command is used to remove one device from the list of Periodic
@@ -2797,24 +1829,7 @@ def le_add_device_to_periodic_advertiser_list(transport, idx, AddrType, AVal, si
 """
 def le_remove_device_from_periodic_advertiser_list(transport, idx, AddrType, AVal, sid, to):
 
-    cmd = struct.pack('<HHHB6B', Commands.CMD_LE_REMOVE_DEVICE_FROM_PERIODIC_ADVERTISER_LIST_REQ, 10, HCICommands.BT_HCI_OP_LE_REM_DEV_FROM_PER_ADV_LIST, AddrType, *AVal);
-    cmd += struct.pack('<B', sid);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Remove Device From Periodic Advertiser List command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_REMOVE_DEVICE_FROM_PERIODIC_ADVERTISER_LIST_RSP ):
-        raise Exception("LE Remove Device From Periodic Advertiser List command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Remove Device From Periodic Advertiser List command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_REMOVE_DEVICE_FROM_PERIODIC_ADVERTISER_LIST_REQ, (AddrType, AVal, sid), to);
 
 """
     The LE_Clear_Periodic_Advertiser_List command is used to remove all devices from the list of Periodic Advertisers in the
@@ -2822,23 +1837,7 @@ def le_remove_device_from_periodic_advertiser_list(transport, idx, AddrType, AVa
 """
 def le_clear_periodic_advertiser_list(transport, idx, to):
 
-    cmd = struct.pack('<HHH', Commands.CMD_LE_CLEAR_PERIODIC_ADVERTISER_LIST_REQ, 2, HCICommands.BT_HCI_OP_LE_CLEAR_PER_ADV_LIST);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Clear Periodic Advertiser List command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_CLEAR_PERIODIC_ADVERTISER_LIST_RSP ):
-        raise Exception("LE Clear Periodic Advertiser List command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Clear Periodic Advertiser List command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_CLEAR_PERIODIC_ADVERTISER_LIST_REQ, (), to);
 
 """
     The LE_Read_Periodic_Advertiser_List_Size command is used to read the total number of Periodic Advertiser list entries
@@ -2875,23 +1874,7 @@ def le_read_periodic_advertiser_list_size(transport, idx, to):
 """
 def le_read_transmit_power(transport, idx, to):
 
-    cmd = struct.pack('<HHH', Commands.CMD_LE_READ_TRANSMIT_POWER_REQ, 2, HCICommands.BT_HCI_OP_LE_READ_TX_POWER);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 7, to);
-
-    if ( 7 != len(packet) ):
-        raise Exception("LE Read Transmit Power command failed: Response too short (Expected %i bytes got %i bytes)" % (7, len(packet)));
-
-    RespCmd, RespLen, status, MinTxPower, MaxTxPower = struct.unpack('<HHBbb', packet);
-
-    if ( RespCmd != Commands.CMD_LE_READ_TRANSMIT_POWER_RSP ):
-        raise Exception("LE Read Transmit Power command failed: Inappropriate command response received");
-
-    if ( RespLen != 3 ):
-        raise Exception("LE Read Transmit Power command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status, MinTxPower, MaxTxPower;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_READ_TRANSMIT_POWER_REQ, (), to);
 
 """
     The LE_Read_RF_Path_Compensation command is used to read the RF Path Compensation Values parameter used in the Tx Power
@@ -2932,23 +1915,7 @@ def le_read_rf_path_compensation(transport, idx, to):
 """
 def le_write_rf_path_compensation(transport, idx, TxPathComp, RxPathComp, to):
 
-    cmd = struct.pack('<HHHhh', Commands.CMD_LE_WRITE_RF_PATH_COMPENSATION_REQ, 6, HCICommands.BT_HCI_OP_LE_WRITE_RF_PATH_COMP, TxPathComp, RxPathComp);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Write RF Path Compensation command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_WRITE_RF_PATH_COMPENSATION_RSP ):
-        raise Exception("LE Write RF Path Compensation command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Write RF Path Compensation command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_WRITE_RF_PATH_COMPENSATION_REQ, (TxPathComp, RxPathComp), to);
 
 """
     The LE_Set_Privacy_Mode command is used to allow the Host to specify the privacy mode to be used for a given entry on the
@@ -2956,53 +1923,24 @@ def le_write_rf_path_compensation(transport, idx, TxPathComp, RxPathComp, to):
 """
 def le_set_privacy_mode(transport, idx, IdAddrType, AVal, mode, to):
 
-    cmd = struct.pack('<HHHB6B', Commands.CMD_LE_SET_PRIVACY_MODE_REQ, 10, HCICommands.BT_HCI_OP_LE_SET_PRIVACY_MODE, IdAddrType, *AVal);
-    cmd += struct.pack('<B', mode);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Set Privacy Mode command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_LE_SET_PRIVACY_MODE_RSP ):
-        raise Exception("LE Set Privacy Mode command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Set Privacy Mode command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_SET_PRIVACY_MODE_REQ, (IdAddrType, AVal, mode), to);
 
 """
     The Write_BD_ADDR command is used to set the Public address of the Device.
 """
 def write_bd_addr(transport, idx, BdaddrVal, to):
 
-    cmd = struct.pack('<HHH6B', Commands.CMD_WRITE_BD_ADDR_REQ, 8, HCICommands.BT_HCI_OP_VS_WRITE_BD_ADDR, *BdaddrVal);
-    transport.send(idx, cmd);
-
-    packet = transport.recv(idx, 5, to);
-
-    if ( 5 != len(packet) ):
-        raise Exception("Write BD_ADDR command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)));
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet);
-
-    if ( RespCmd != Commands.CMD_WRITE_BD_ADDR_RSP ):
-        raise Exception("Write BD_ADDR command failed: Inappropriate command response received");
-
-    if ( RespLen != 1 ):
-        raise Exception("Write BD_ADDR command failed: Response length field corrupted (%i)" % RespLen);
-
-    return status;
+    return edtt_hci_cmd(transport, idx, Commands.CMD_WRITE_BD_ADDR_REQ, (BdaddrVal,), to);
 
 """
     Flush the events queue
 """
 def flush_events(transport, idx, to):
 
+    pump = getattr(transport, 'event_pump', None);
+    if pump:
+        pump.flush(idx);
+
     cmd = struct.pack('<HH', Commands.CMD_FLUSH_EVENTS_REQ, 0);
     transport.send(idx, cmd);
 
@@ -3025,6 +1963,11 @@ def flush_events(transport, idx, to):
 """
 def has_event(transport, idx, to):
 
+    pump = getattr(transport, 'event_pump', None);
+    if pump:
+        count = pump.poll(idx, to);
+        return count > 0, count;
+
     while to >= 0:
         start_t = transport.last_t
 
@@ -3059,46 +2002,188 @@ def has_event(transport, idx, to):
 """
 def get_event(transport, idx, to, multiple=False):
 
-    cmd = struct.pack('<HHB', Commands.CMD_GET_EVENT_REQ, 1, 1 if multiple else 0);
+    pump = getattr(transport, 'event_pump', None);
+    if pump:
+        if multiple:
+            pump.drain(idx, to);
+            return pump.take_all(idx);
+        if pump.pending(idx):
+            return pump.take(idx);
+
+    if multiple:
+        return get_events(transport, idx, to);
+
+    cmd = struct.pack('<HHB', Commands.CMD_GET_EVENT_REQ, 1, 0);
     transport.send(idx, cmd);
 
-    nBytes = 3 if multiple else 10;
-    packet = transport.recv(idx, nBytes, to);
+    packet = edtt_recv_frame(transport, idx, to);
 
-    if nBytes != len(packet):
-        raise Exception("Get Event command failed: Response too short (Expected %i bytes got %i bytes)" % (nBytes, len(packet)));
+    if 10 > len(packet):
+        raise Exception("Get Event command failed: Response too short (Expected %i bytes got %i bytes)" % (10, len(packet)));
 
-    if multiple:
-        RespCmd, count = struct.unpack('<HB', packet);
-        if RespCmd != Commands.CMD_GET_EVENT_RSP:
-            raise Exception("Get Event command failed: Inappropriate command response received");
+    RespCmd, RespLen, time, event, eventLen = struct.unpack_from('<HHIBB', packet);
+    data = "" if RespLen <= 6 else packet[10:];
+    packet = packet[:10];
 
-        events = [];
-        while count > 0:
-            packet = transport.recv(idx, 8, to);
-            RespLen, time, event, eventLen = struct.unpack('<HIBB', packet);
-            data = "" if eventLen == 0 else transport.recv(idx, eventLen, to);
+    if RespCmd != Commands.CMD_GET_EVENT_RSP:
+        raise Exception("Get Event command failed: Inappropriate command response received (%i)" % RespCmd);
 
-            if RespLen != (6 + eventLen):
-                raise Exception("Get Event command failed: Response length field corrupted (%i)" % RespLen);
+    if RespLen != 6 + eventLen:
+        raise Exception("Get Event command failed: Response length field corrupted (%i)" % RespLen);
 
-            events += [Event(event, data, time)];
-            count -= 1;
+    transport.Trace.btsnoop.send_event(idx, packet, data)
 
-        return events;
-    else:
-        RespCmd, RespLen, time, event, eventLen = struct.unpack('<HHIBB', packet[:10]);
-        data = "" if RespLen <= 6 else transport.recv(idx, RespLen - 6, to);
+    return Event(event, data, time);
+
+"""
+    Get all the events in the events queue with a single request (bypassing any event pump)
+"""
+def get_events(transport, idx, to):
+
+    cmd = struct.pack('<HHB', Commands.CMD_GET_EVENT_REQ, 1, 1);
+    transport.send(idx, cmd);
+
+    # Note that the response to a request for multiple events is not a single EDTT frame
+    packet = transport.recv(idx, 3, to);
 
-        if RespCmd != Commands.CMD_GET_EVENT_RSP:
-            raise Exception("Get Event command failed: Inappropriate command response received (%i)" % RespCmd);
+    if 3 > len(packet):
+        raise Exception("Get Event command failed: Response too short (Expected %i bytes got %i bytes)" % (3, len(packet)));
 
-        if RespLen != 6 + eventLen:
+    RespCmd, count = struct.unpack('<HB', packet);
+    if RespCmd != Commands.CMD_GET_EVENT_RSP:
+        raise Exception("Get Event command failed: Inappropriate command response received");
+
+    events = [];
+    while count > 0:
+        packet = transport.recv(idx, 8, to);
+        RespLen, time, event, eventLen = struct.unpack('<HIBB', packet);
+        data = "" if eventLen == 0 else transport.recv(idx, eventLen, to);
+
+        if RespLen != (6 + eventLen):
             raise Exception("Get Event command failed: Response length field corrupted (%i)" % RespLen);
 
-        transport.Trace.btsnoop.send_event(idx, packet, data)
+        events += [Event(event, data, time)];
+        count -= 1;
+
+    return events;
+
+class EventPump:
+    """
+        Buffers the events of the devices, fetching all the events queued in a device with a single request,
+        so waiting for (and looking for) a particular event does not take a round trip per event.
+        Once installed, has_event(), get_event() and flush_events() use the buffers.
+
+        Constructor:
+            transport - Transport to the devices (the pump installs itself as transport.event_pump)
+            step      - Time (ms) let pass between two requests to a device while waiting for its events
+    """
+    def __init__(self, transport, step=100):
+        self.transport = transport;
+        self.step = step;
+        self.buffers = {};
+        transport.event_pump = self;
+
+    def __buffer(self, idx):
+        return self.buffers.setdefault(idx, deque());
+
+    """
+        Number of events of device <idx> in the buffer
+    """
+    def pending(self, idx):
+        return len(self.buffers.get(idx, ()));
+
+    """
+        Move all the events queued in device <idx> to its buffer; Returns the number of events moved
+    """
+    def drain(self, idx, to=100):
+        events = get_events(self.transport, idx, to);
+        for event in events:
+            header = struct.pack('<HHIBB', Commands.CMD_GET_EVENT_RSP, 6 + event.size, event.time, event.event, event.size);
+            self.transport.Trace.btsnoop.send_event(idx, header, event.data);
+        self.__buffer(idx).extend(events);
+        return len(events);
+
+    """
+        Remove the oldest buffered event of device <idx> and return it
+    """
+    def take(self, idx):
+        return self.__buffer(idx).popleft();
+
+    """
+        Remove all the buffered events of device <idx> and return them (oldest first)
+    """
+    def take_all(self, idx):
+        events = list(self.__buffer(idx));
+        self.__buffer(idx).clear();
+        return events;
+
+    def flush(self, idx):
+        self.__buffer(idx).clear();
+
+    def __find(self, idx, predicate):
+        for position, event in enumerate(self.__buffer(idx)):
+            if predicate is None or predicate(event):
+                return position;
+        return None;
+
+    def __wait(self, idx, predicate, to):
+        # Same polling as has_event(): one request every <step> ms, until <to> ms have passed
+        position = self.__find(idx, predicate);
+        while position is None and to >= 0:
+            start_t = self.transport.last_t;
+            if self.drain(idx) > 0:
+                position = self.__find(idx, predicate);
+                if position is not None:
+                    break;
+
+            to_tmp = self.step - int((self.transport.last_t - start_t) / 1000);
+            to -= self.step;
+            if to >= 0 and to_tmp > 0:
+                self.transport.wait(to_tmp);
+        return position;
+
+    """
+        Wait up to <to> ms for device <idx> to have events; Returns the number of buffered events
+    """
+    def poll(self, idx, to):
+        self.__wait(idx, None, to);
+        return self.pending(idx);
 
-        return Event(event, data, time);
+    """
+        Wait up to <to> ms for an event of device <idx> for which <predicate>(event) is true (any event if
+        <predicate> is None). The event is removed from the buffer and returned; the events before it stay buffered.
+        Returns None on timeout
+    """
+    def wait_for_event(self, idx, predicate=None, to=0):
+        position = self.__wait(idx, predicate, to);
+        if position is None:
+            return None;
+        buffer = self.__buffer(idx);
+        event = buffer[position];
+        del buffer[position];
+        return event;
+
+"""
+    Wait up to <to> ms for an event of device <idx> for which <predicate>(event) is true (any event if <predicate> is None).
+    With an EventPump installed on the transport see EventPump.wait_for_event(), the events before the matching one stay buffered.
+    Without one, the events are polled for with has_event() and fetched one by one with get_event(); the events before the
+    matching one are then discarded. Returns None on timeout
+"""
+def wait_for_event(transport, idx, predicate=None, to=0):
+
+    pump = getattr(transport, 'event_pump', None);
+    if pump:
+        return pump.wait_for_event(idx, predicate, to);
+
+    end_t = transport.last_t + to*1000;
+    while has_event(transport, idx, to)[0]:
+        event = get_event(transport, idx, 200);
+        if predicate is None or predicate(event):
+            return event;
+        to = int((end_t - transport.last_t) / 1000);
+        if to < 0:
+            break;
+    return None;
 
 """
     Flush the Data queue
@@ -3186,16 +2271,20 @@ def le_data_read(transport, idx, to):
     cmd = struct.pack('<HH', Commands.CMD_LE_DATA_READ_REQ, 0);
     transport.send(idx, cmd);
 
-    packet = transport.recv(idx, 12, to);
+    packet = edtt_rx_buffer(idx, 12);
+    received = edtt_recv_into(transport, idx, packet, 0, 12, to);
 
-    if ( 12 != len(packet) ):
-        raise Exception("LE Data Read command failed: Response too short (Expected %i bytes got %i bytes)" % (12, len(packet)));
+    if ( 12 != received ):
+        raise Exception("LE Data Read command failed: Response too short (Expected %i bytes got %i bytes)" % (12, received));
 
-    RespCmd, RespLen, time, handle, dataLen = struct.unpack('<HHIHH', packet[:12]);
+    RespCmd, RespLen, time, handle, dataLen = struct.unpack_from('<HHIHH', packet);
     if RespLen > 8:
-        packet = transport.recv(idx, RespLen - 8, to);
+        packet = edtt_rx_buffer(idx, 4 + RespLen);
+        received = edtt_recv_into(transport, idx, packet, 12, RespLen - 8, to);
+        if ( RespLen - 8 != received ):
+            raise Exception("LE Data Read command failed: Response too short (Expected %i bytes got %i bytes)" % (4 + RespLen, 12 + received));
     if dataLen > 0:
-        data = struct.unpack('<' + str(dataLen) + 'B', packet);
+        data = struct.unpack_from('<' + str(dataLen) + 'B', packet, 12);
     else:
         data = [];
 
@@ -3209,7 +2298,11 @@ def le_data_read(transport, idx, to):
     BcFlags = (handle >> 14) & 0x03;
     handle &= 0x0fff;
 
-    transport.Trace.btsnoop.send_monitor_acl_rx(idx, handle, dataLen, packet)
+    payload = memoryview(packet)[12:12 + dataLen];
+    try:
+        transport.Trace.btsnoop.send_monitor_acl_rx(idx, handle, dataLen, payload)
+    finally:
+        payload.release();
 
     return time, handle, PbFlags, BcFlags, data;
 
@@ -3370,16 +2463,20 @@ def le_iso_data_read(transport, idx, to):
     cmd = struct.pack('<HH', Commands.CMD_LE_ISO_DATA_READ_REQ, 0)
     transport.send(idx, cmd)
 
-    packet = transport.recv(idx, 12, to)
+    packet = edtt_rx_buffer(idx, 12)
+    received = edtt_recv_into(transport, idx, packet, 0, 12, to)
 
-    if ( 12 != len(packet) ):
-        raise Exception("LE ISO Data Read command failed: Response too short (Expected %i bytes got %i bytes)" % (12, len(packet)))
+    if ( 12 != received ):
+        raise Exception("LE ISO Data Read command failed: Response too short (Expected %i bytes got %i bytes)" % (12, received))
 
-    RespCmd, RespLen, time, handle, dataLen = struct.unpack('<HHIHH', packet[:12])
+    RespCmd, RespLen, time, handle, dataLen = struct.unpack_from('<HHIHH', packet)
     if RespLen > 8:
-        packet = transport.recv(idx, RespLen - 8, to)
+        packet = edtt_rx_buffer(idx, 4 + RespLen)
+        received = edtt_recv_into(transport, idx, packet, 12, RespLen - 8, to)
+        if ( RespLen - 8 != received ):
+            raise Exception("LE ISO Data Read command failed: Response too short (Expected %i bytes got %i bytes)" % (4 + RespLen, 12 + received))
     if dataLen > 0:
-        data = struct.unpack('<' + str(dataLen) + 'B', packet)
+        data = struct.unpack_from('<' + str(dataLen) + 'B', packet, 12)
     else:
         data = []
 
@@ -3389,7 +2486,11 @@ def le_iso_data_read(transport, idx, to):
     if ( RespLen != 8 + dataLen ):
         raise Exception("LE ISO Data Read command failed: Response length field corrupted (%i)" % RespLen)
 
-    transport.Trace.btsnoop.send_monitor_iso_rx(idx, handle, dataLen, packet)
+    payload = memoryview(packet)[12:12 + dataLen]
+    try:
+        transport.Trace.btsnoop.send_monitor_iso_rx(idx, handle, dataLen, payload)
+    finally:
+        payload.release()
 
     PbFlags = (handle >> 12) & 0x03
     TsFlag  = (handle >> 14) & 0x01
@@ -3462,23 +2563,7 @@ def le_create_cis(transport, idx, CisCount, CisConnectionHandle, AclConnectionHa
 """
 def le_remove_cig(transport, idx, CigId, to):
 
-    cmd = struct.pack('<HHHB', Commands.CMD_LE_REMOVE_CIG_REQ, 3, HCICommands.BT_HCI_OP_LE_REMOVE_CIG, CigId)
-    transport.send(idx, cmd)
-
-    packet = transport.recv(idx, 6, to)
-
-    if ( 6 != len(packet) ):
-        raise Exception("LE Remove CIG command failed: Response too short (Expected %i bytes got %i bytes)" % (6, len(packet)))
-
-    RespCmd, RespLen, status, cigId = struct.unpack('<HHBB', packet)
-
-    if ( RespCmd != Commands.CMD_LE_REMOVE_CIG_RSP ):
-        raise Exception("LE Remove CIG command failed: Inappropriate command response received")
-
-    if ( RespLen != 2 ):
-        raise Exception("LE Remove CIG command failed: Response length field corrupted (%i)" % RespLen)
-
-    return status, cigId
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_REMOVE_CIG_REQ, (CigId,), to)
 
 """
     The HCI_LE_Accept_CIS_Request command is used by the peripheral's Host to
@@ -3489,24 +2574,7 @@ def le_accept_cis_request(transport, idx, ConnectionHandle, to):
 
     ConnectionHandle &= 0x0fff
 
-    cmd = struct.pack('<HHHH', Commands.CMD_LE_ACCEPT_CIS_REQUEST_REQ, 4, HCICommands.BT_HCI_OP_LE_ACCEPT_CIS_REQUEST,
-                      ConnectionHandle)
-    transport.send(idx, cmd)
-
-    packet = transport.recv(idx, 5, to)
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Accept CIS Request command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)))
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet)
-
-    if ( RespCmd != Commands.CMD_LE_ACCEPT_CIS_REQUEST_RSP ):
-        raise Exception("LE Accept CIS Request command failed: Inappropriate command response received")
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Accept CIS Request command failed: Response length field corrupted (%i)" % RespLen)
-
-    return status
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_ACCEPT_CIS_REQUEST_REQ, (ConnectionHandle,), to)
 
 """
     The HCI_LE_Reject_CIS_Request command is used by the peripheral's Host to
@@ -3517,24 +2585,7 @@ def le_reject_cis_request(transport, idx, ConnectionHandle, Reason, to):
 
     ConnectionHandle &= 0x0fff
 
-    cmd = struct.pack('<HHHHB', Commands.CMD_LE_REJECT_CIS_REQUEST_REQ, 5, HCICommands.BT_HCI_OP_LE_REJECT_CIS_REQUEST,
-                      ConnectionHandle, Reason)
-    transport.send(idx, cmd)
-
-    packet = transport.recv(idx, 7, to)
-
-    if ( 7 != len(packet) ):
-        raise Exception("LE Reject CIS Request command failed: Response too short (Expected %i bytes got %i bytes)" % (7, len(packet)))
-
-    RespCmd, RespLen, status, connectionHandle = struct.unpack('<HHBH', packet)
-
-    if ( RespCmd != Commands.CMD_LE_REJECT_CIS_REQUEST_RSP ):
-        raise Exception("LE Reject CIS Request command failed: Inappropriate command response received")
-
-    if ( RespLen != 3 ):
-        raise Exception("LE Reject CIS Request command failed: Response length field corrupted (%i)" % RespLen)
-
-    return status, connectionHandle
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_REJECT_CIS_REQUEST_REQ, (ConnectionHandle, Reason), to)
 
 
 def le_request_peer_sca(transport, idx, acl_conn_handle, to):
@@ -3591,25 +2642,7 @@ def le_remove_iso_data_path(transport, idx, ConnectionHandle, DataPathDirection,
 
     ConnectionHandle &= 0x0fff
 
-    cmd = struct.pack('<HHHHB',
-                      Commands.CMD_LE_REMOVE_ISO_DATA_PATH_REQ, 5, HCICommands.BT_HCI_OP_LE_REMOVE_ISO_DATA_PATH,
-                      ConnectionHandle, DataPathDirection)
-    transport.send(idx, cmd)
-
-    packet = transport.recv(idx, 7, to)
-
-    if ( 7 != len(packet) ):
-        raise Exception("LE Remove ISO Data Path command failed: Response too short (Expected %i bytes got %i bytes)" % (7, len(packet)))
-
-    RespCmd, RespLen, status, connectionHandle = struct.unpack('<HHBH', packet)
-
-    if ( RespCmd != Commands.CMD_LE_REMOVE_ISO_DATA_PATH_RSP ):
-        raise Exception("LE Remove ISO Data Path command failed: Inappropriate command response received")
-
-    if ( RespLen != 3 ):
-        raise Exception("LE Remove ISO Data Path command failed: Response length field corrupted (%i)" % RespLen)
-
-    return status, connectionHandle
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_REMOVE_ISO_DATA_PATH_REQ, (ConnectionHandle, DataPathDirection), to)
 
 """
     The HCI_LE_Set_Host_Feature command is used by the Host to set or clear a bit
@@ -3617,23 +2650,7 @@ def le_remove_iso_data_path(transport, idx, ConnectionHandle, DataPathDirection,
 """
 def le_set_host_feature(transport, idx, BitNumber, BitValue, to):
 
-    cmd = struct.pack('<HHHBB', Commands.CMD_LE_SET_HOST_FEATURE_REQ, 4, HCICommands.BT_HCI_OP_LE_SET_HOST_FEATURE, BitNumber, BitValue)
-    transport.send(idx, cmd)
-
-    packet = transport.recv(idx, 5, to)
-
-    if ( 5 != len(packet) ):
-        raise Exception("LE Set Host Feature command failed: Response too short (Expected %i bytes got %i bytes)" % (5, len(packet)))
-
-    RespCmd, RespLen, status = struct.unpack('<HHB', packet)
-
-    if ( RespCmd != Commands.CMD_LE_SET_HOST_FEATURE_RSP ):
-        raise Exception("LE Set Host Feature command failed: Inappropriate command response received")
-
-    if ( RespLen != 1 ):
-        raise Exception("LE Set Host Feature command failed: Response length field corrupted (%i)" % RespLen)
-
-    return status
+    return edtt_hci_cmd(transport, idx, Commands.CMD_LE_SET_HOST_FEATURE_REQ, (BitNumber, BitValue), to)
 
 
 def get_ixit_value(transport, idx, ixit, to):
@@ -11,6 +11,7 @@
 #
 # The public functions are non-blocking; They simply add to a command queue
 # An internally handled thread will pick up these commands and execute them in order
+# Consecutive waits which are still in the queue are merged into one
 
 import math
 import os
@@ -36,16 +37,32 @@ class BSimDevice:
 
     command_queue = queue.Queue()
     worker_thread = None
+    queue_lock = None
+    queued_wait = None # arguments of the last queued command, if it is a wait not yet picked up
 
     def __init__(self, device_nbr, sim_id, TraceClass):
         self.Trace = TraceClass
 
         self.device_nbr = device_nbr
         self.sim_id = sim_id
+        self.queue_lock = threading.Lock()
+
+    def __get_command(self):
+        command, args = self.command_queue.get()
+        with self.queue_lock:
+            if args is self.queued_wait:
+                self.queued_wait = None
+            args = list(args)
+        return command, args
+
+    def __put_command(self, command, args):
+        with self.queue_lock:
+            self.queued_wait = args if command == PB_MSG_WAIT else None
+            self.command_queue.put_nowait((command, args))
 
     def __process_commands(self):
         while self.connected:
-            command, args = self.command_queue.get()
+            command, args = self.__get_command()
             if (command == PB_MSG_DISCONNECT):
                 self.__device_disconnect()
             elif (command == PB_MSG_WAIT):
@@ -128,7 +145,7 @@ class BSimDevice:
 
     def disconnect(self):
         if self.connected:
-            self.command_queue.put_nowait((PB_MSG_DISCONNECT, []))
+            self.__put_command(PB_MSG_DISCONNECT, [])
             self.worker_thread.join(1.0)
         self.cleanup()
 
@@ -149,7 +166,12 @@ class BSimDevice:
 
     def wait(self, end_of_wait):
         if self.connected:
-            self.command_queue.put_nowait((PB_MSG_WAIT, [end_of_wait]))
+            with self.queue_lock:
+                if self.queued_wait is not None:
+                    # Nothing was queued after the previous wait, and it has not started yet; just extend it
+                    self.queued_wait[0] = max(self.queued_wait[0], end_of_wait)
+                    return
+            self.__put_command(PB_MSG_WAIT, [end_of_wait])
 
     def __device_tx(self, ch_idx, phy, aa, transmit_time, packet_data):
         if self.connected:
@@ -179,4 +201,4 @@ class BSimDevice:
     def tx(self, ch_idx, phy, aa, transmit_time, packet_data):
         # Note: packet_data is expected to include CRC
         if self.connected:
-            self.command_queue.put_nowait((P2G4_MSG_TX, [ch_idx, phy, aa, transmit_time, packet_data]))
+            self.__put_command(P2G4_MSG_TX, [ch_idx, phy, aa, transmit_time, packet_data])
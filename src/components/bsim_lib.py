@@ -135,7 +135,7 @@ def test_and_create_lock_file(com_path, device_nbr, trace):
         else:
             raise Exception("Found a previous, still RUNNING process w pid %s with the same sim_id and device port which would interfere with this one, aborting" % his_pid)
 
-    trace.trace(3, "Found previous lock owned by DEAD process (pid was %s), will attempt to take over" % his_pid)
+    trace.trace(3, "Found previous lock owned by DEAD process (pid was %s), will attempt to take over", his_pid, subsystem='transport')
     lock_file_fill(lock_path, my_pid)
 
     return lock_path
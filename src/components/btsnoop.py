@@ -2,8 +2,11 @@
 # Copyright 2019 Oticon A/S
 # SPDX-License-Identifier: Apache-2.0
 
+import atexit
+import queue
 import socket
 import struct
+import threading
 import time
 
 from components.basic_commands import Commands
@@ -34,7 +37,16 @@ class BtsnoopPriority(IntEnum):
     DEBUG = 7
 
 class Btsnoop:
-    def __init__(self, store_to_file, socket_path) -> None:
+    """
+        Records are written by a background thread, so the test thread only pays for building the record
+        and queuing it. The writer takes all the records queued so far and writes them with one write to
+        the file and one send to the btmon socket.
+
+        At most <queue_size> records are queued. When the queue is full, the test thread waits for the
+        writer (backpressure, the default), or with <drop_when_full> the record is dropped. Dropped records
+        are counted in the "cumulative drops" field of the next btsnoop file record.
+    """
+    def __init__(self, store_to_file, socket_path, file_name=None, queue_size=4096, drop_when_full=False) -> None:
 
         self.non_hci_edtt_cmds = (Commands.CMD_HAS_EVENT_REQ, Commands.CMD_HAS_EVENT_RSP,
                                 Commands.CMD_FLUSH_EVENTS_REQ, Commands.CMD_FLUSH_EVENTS_RSP,
@@ -59,43 +71,87 @@ class Btsnoop:
           print("Could not connect to the btmon socket: ", socket_path, Exception)
 
         self.start_time = time.time()
-
-        if store_to_file == False:
-            self.file = None
-            return
-
-        now = datetime.now()
-        btsnoop_file_name = "btsnoop_" + str(now.date()) + "_" + str(now.time()) +".log"
-
-        print("Opening file ", btsnoop_file_name)
-        self.file = open(btsnoop_file_name, "wb")
-
-        """
-        btsnoop header
-        0----------------------------------------64
-        |                  Id                     |
-        +------------------32---------------------+
-        |   btsnoop_ver= 1  |         type        |
-        +-------------------+---------------------+
-        """
-        btsnoop_id = [0x62, 0x74, 0x73, 0x6e, 0x6f, 0x6f, 0x70, 0x00 ]
-        btsnoop_monitor_format = 2001
-        header = struct.pack(">BBBBBBBBLL", btsnoop_id[0], btsnoop_id[1],
-                                            btsnoop_id[2], btsnoop_id[3],
-                                            btsnoop_id[4], btsnoop_id[5],
-                                            btsnoop_id[6], btsnoop_id[7],
-                                            1, btsnoop_monitor_format)
-        self.file.write(header)
+        self.file = None
+        self.drop_when_full = drop_when_full
+        self.drops = 0
+        self.queue = None
+        self.writer = None
+
+        if store_to_file != False or file_name != None:
+            if file_name:
+                btsnoop_file_name = file_name
+            else:
+                now = datetime.now()
+                btsnoop_file_name = "btsnoop_" + str(now.date()) + "_" + str(now.time()) +".log"
+
+            print("Opening file ", btsnoop_file_name)
+            self.file = open(btsnoop_file_name, "wb")
+
+            """
+            btsnoop header
+            0----------------------------------------64
+            |                  Id                     |
+            +------------------32---------------------+
+            |   btsnoop_ver= 1  |         type        |
+            +-------------------+---------------------+
+            """
+            btsnoop_id = [0x62, 0x74, 0x73, 0x6e, 0x6f, 0x6f, 0x70, 0x00 ]
+            btsnoop_monitor_format = 2001
+            header = struct.pack(">BBBBBBBBLL", btsnoop_id[0], btsnoop_id[1],
+                                                btsnoop_id[2], btsnoop_id[3],
+                                                btsnoop_id[4], btsnoop_id[5],
+                                                btsnoop_id[6], btsnoop_id[7],
+                                                1, btsnoop_monitor_format)
+            self.file.write(header)
+
+        if self.file or self.sock:
+            self.queue = queue.Queue(queue_size)
+            self.writer = threading.Thread(target=self.__write_records, name="btsnoop writer", daemon=True)
+            self.writer.start()
+            atexit.register(self.close)
 
 
     def close(self):
+        if self.writer:
+            # Let the writer empty the queue first
+            self.queue.put(None)
+            self.writer.join()
+            self.writer = None
         if self.file:
             self.file.close()
+            self.file = None
         if self.sock:
             self.sock.close()
+            self.sock = None
 
 
-    def send_monitor_hdr_btmon_socket(self, idx, opcode, data_len):
+    def __write_records(self):
+        while True:
+            records = [self.queue.get()]
+            while True:
+                try:
+                    records.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            done = records[-1] is None
+            records = [record for record in records if record is not None]
+
+            if self.file:
+                self.file.write(b"".join(file_record for file_record, _ in records))
+            if self.sock:
+                try:
+                    self.sock.sendall(b"".join(sock_record for _, sock_record in records))
+                except OSError as e:
+                    print("Could not write to the btmon socket, it will no longer be used: ", e)
+                    self.sock.close()
+                    self.sock = None
+            if done:
+                if self.file:
+                    self.file.flush()
+                return
+
+
+    def monitor_hdr_btmon_socket(self, idx, opcode, data_len):
         """
         mgmt_hdr
         0----------16---------32---------------48
@@ -103,11 +159,10 @@ class Btsnoop:
         +----------+----------+-----------------
 
         """
-        ble_monitor_hdr = struct.pack("<HHH", opcode, idx, data_len)
-        self.sock.send(ble_monitor_hdr)
+        return struct.pack("<HHH", opcode, idx, data_len)
 
 
-    def send_monitor_hdr_file(self, idx, opcode, data_len, timestamp):
+    def monitor_hdr_file(self, idx, opcode, data_len, timestamp):
         """
         btsnoop_pkt
         0-----------------32---------------64
@@ -119,66 +174,34 @@ class Btsnoop:
         +------------------+----------------+
         """
         flags = (idx << 16) | opcode
-        pkt_hdr = struct.pack(">LLLLQ", data_len, data_len, flags, 0, timestamp)
-        self.file.write(pkt_hdr)
+        return struct.pack(">LLLLQ", data_len, data_len, flags, self.drops, timestamp)
 
 
-    def send_monitor_hdr(self, idx, opcode, data_len):
+    def send_record(self, idx, opcode, *data):
+        """
+        Queue one monitor record (header followed by the concatenation of <data>) for the file and
+        the btmon socket. The data is copied, so it may be a memoryview released right after
+        """
+        if not self.writer:
+            return
+        data = b"".join(data)
         idx +=10
         timestamp = int((time.time() - self.start_time) * 1000)
 
-        if self.file:
-            self.send_monitor_hdr_file(idx, opcode, data_len, timestamp)
-        if self.sock:
-            self.send_monitor_hdr_btmon_socket(idx, opcode, data_len)
-
-
-    def send_event_sock(self, packet, data, eventLen):
-        self.sock.send(packet[8:10])
-        if eventLen > 0:
-            self.sock.send(data)
-
-
-    def send_event_file(self, packet, data, eventLen):
-        self.file.write(packet[8:10])
-        if eventLen > 0:
-            self.file.write(data)
+        record = (self.monitor_hdr_file(idx, opcode, len(data), timestamp) + data,
+                  self.monitor_hdr_btmon_socket(idx, opcode, len(data)) + data)
+        if self.drop_when_full:
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                self.drops += 1
+        else:
+            self.queue.put(record)
 
 
     def send_event(self, idx, packet, data):
-        opcode = BleMonitorOpcode.EVENT
         RespCmd, RespLen, time, event, eventLen = struct.unpack('<HHIBB', packet[:10]);
-        self.send_monitor_hdr(idx, opcode, eventLen + 2)
-
-        if self.file:
-            self.send_event_file(packet, data, eventLen)
-        if self.sock:
-            self.send_event_sock(packet, data, eventLen)
-
-
-    def send_command_sock(self, opcode, len, data):
-        self.sock.send(opcode)
-        #This is this additional octet
-        hci_len=struct.pack("<B", len)
-        self.sock.send(hci_len)
-        if len > 0:
-            self.sock.send(data)
-
-
-    def send_command_file(self, opcode, len, data):
-        self.file.write(opcode)
-        #This is this additional octet
-        hci_len=struct.pack("<B", len)
-        self.file.write(hci_len)
-        if len > 0:
-            self.file.write(data)
-
-
-    def send_monitor_command(self, opcode, len, data):
-        if self.file:
-            self.send_command_file(opcode, len, data)
-        if self.sock:
-            self.send_command_sock( opcode, len, data)
+        self.send_record(idx, BleMonitorOpcode.EVENT, packet[8:10], data if eventLen > 0 else b"")
 
 
     def send_index_added(self, idx, addr, name):
@@ -191,41 +214,23 @@ class Btsnoop:
         new_index = struct.pack("<BB6B", 0, 10, addr[0], addr[1], addr[2], addr[3], addr[4], addr[5])
         l = len(name)
         packed_name = struct.pack("<%dsb" % l, name.encode('ascii'), 0)
-        self.send_monitor_hdr(idx, BleMonitorOpcode.NEW_INDEX, 8 + len(packed_name))
-        if self.file:
-            self.file.write(new_index)
-            self.file.write(packed_name)
-
-        if self.sock:
-            self.sock.send(new_index)
-            self.sock.send(packed_name)
+        self.send_record(idx, BleMonitorOpcode.NEW_INDEX, new_index, packed_name)
 
 
     def send_monitor_iso_rx(self, idx, handle, dataLen, packet):
-        self.send_monitor_hdr(idx, BleMonitorOpcode.ISO_RX, dataLen + 4)
-
         hdr = struct.pack('<HH', handle, dataLen)
-        if self.file:
-            self.file.write(hdr)
-            self.file.write(packet)
-        if self.sock:
-            self.sock.send(hdr)
-            self.sock.send(packet)
+        self.send_record(idx, BleMonitorOpcode.ISO_RX, hdr, packet)
 
 
     def send_monitor_acl_rx(self, idx, handle, dataLen, packet):
-        self.send_monitor_hdr(idx, BleMonitorOpcode.ACL_RX, dataLen + 4)
-
         hdr = struct.pack('<HH', handle, dataLen)
-        if self.file:
-            self.file.write(hdr)
-            self.file.write(packet)
-        if self.sock:
-            self.sock.send(hdr)
-            self.sock.send(packet)
+        self.send_record(idx, BleMonitorOpcode.ACL_RX, hdr, packet)
 
 
     def send(self, idx, message):
+        if not self.writer:
+            return
+
           # unpack and validate EDTT header first
         op, payload_len = struct.unpack_from('<HH', message)
 
@@ -242,35 +247,19 @@ class Btsnoop:
             if op == Commands.CMD_LE_ISO_DATA_WRITE_REQ:
                 opcode = BleMonitorOpcode.ISO_TX
 
-            self.send_monitor_hdr(idx, opcode, payload_len)
-            if self.file:
-                self.file.write(message[4:])
-            if self.sock:
-                self.sock.send(message[4:])
-
+            self.send_record(idx, opcode, message[4:])
             return
 
         # All requests are even.
         if op % 2 == 1:
-            opcode = BleMonitorOpcode.COMMAND
-            # + 1 is because we need to add octet for the hci command len
-            self.send_monitor_hdr(idx, opcode, payload_len + 1)
-            data = None
-            if (payload_len - 2 > 0):
-                data = message[6:]
-
-            self.send_monitor_command(message[4:6], payload_len - 2, data)
+            # The HCI command is the opcode, followed by the additional octet for the HCI command length
+            hci_len = struct.pack("<B", payload_len - 2)
+            data = message[6:] if payload_len - 2 > 0 else b""
+            self.send_record(idx, BleMonitorOpcode.COMMAND, message[4:6], hci_len, data)
 
 
     def send_user_data(self, idx, priority, string):
         l = len(string)
         hdr = struct.pack("<BB", priority, l)
         log = struct.pack("<%dsb" % l, string.encode('ascii'), 0)
-        self.send_monitor_hdr(idx, BleMonitorOpcode.USER_LOGGING, 2 + len(log))
-
-        if self.file:
-            self.file.write(hdr)
-            self.file.write(log)
-        if self.sock:
-            self.sock.send(hdr)
-            self.sock.send(log)
+        self.send_record(idx, BleMonitorOpcode.USER_LOGGING, hdr, log)
@@ -1,9 +1,12 @@
 # -*- coding: utf-8 -*-
 # Copyright 2021 Oticon A/S
 # SPDX-License-Identifier: Apache-2.0
+import bisect
+import heapq
 import io
 import math
-import sys
+import os
+from array import array
 from collections import namedtuple
 from enum import IntEnum
 
@@ -19,7 +22,11 @@ class DeviceDumpFile:
         return self.file_path
 
     def open(self):
-        self.f = io.open(self.file_path, 'r')
+        # Unbuffered: each read is one read() call, and only the new data since the last one is read
+        self.f = io.open(self.file_path, 'rb', buffering=0)
+        self.size = 0
+        self.pending = b''
+        self.skip_first_line = True
 
     def close(self):
         self.f.close()
@@ -27,30 +34,54 @@ class DeviceDumpFile:
     def decode(self, line):
         raise NotImplementedError
 
+    def decode_lines(self, lines):
+        # Decode a batch of lines; Subclasses provide faster versions than one decode() per line
+        return [self.decode(line) for line in lines]
+
+    def __read_new(self):
+        # Read what was appended since the last read (a size check is enough to tell there is nothing new)
+        size = os.fstat(self.f.fileno()).st_size
+        if size <= self.size:
+            return b''
+        data = self.f.read(size - self.size)
+        self.size += len(data)
+        return data
+
     def fetch(self, cnt=-1):
         n = 0
-        self.skip_first_line = True
         while True:
-            offset = self.f.tell()
-            line = self.f.readline()
-            if line == '':
-                # EOF read, return what was collected
-                yield None
-            elif not line.endswith('\n'):
-                # Partial line read, rewind and return what was collected
-                self.f.seek(offset, io.SEEK_SET)
+            # Complete lines left over by a previous fetch(cnt) come first, even if nothing new was written
+            data = self.__read_new()
+            data = self.pending + data if self.pending else data
+            end = data.rfind(b'\n') + 1
+            if end == 0:
+                # EOF or partial line read, keep it until the rest of the line is written
+                self.pending = data
                 yield None
-            else:
-                # Full line read, continue unless a specific number of lines have been collected
-                if self.skip_first_line:
-                    self.skip_first_line = False
-                    continue
-
-                yield self.decode(line.strip())
-                n += 1
-
-                if n == cnt:
-                    return
+                continue
+
+            # Full lines read (the partial one at the end is kept for later), decode them all at once
+            chunk, self.pending = data[:end], data[end:]
+            if self.skip_first_line:
+                self.skip_first_line = False
+                chunk = chunk[chunk.index(b'\n') + 1:]
+            if cnt >= 0:
+                # Only the lines up to the requested number are consumed
+                end = 0
+                for _ in range(cnt - n):
+                    end = chunk.find(b'\n', end) + 1
+                    if end == 0:
+                        end = len(chunk)
+                        break
+                chunk, self.pending = chunk[:end], chunk[end:] + self.pending
+
+            lines = chunk.decode('ascii', 'replace').splitlines()
+            for record in self.decode_lines([line.strip() for line in lines]):
+                yield record
+            n += len(lines)
+
+            if n == cnt:
+                return
 
 
 class DeviceDumpFileTx(DeviceDumpFile):
@@ -76,9 +107,24 @@ class DeviceDumpFileTx(DeviceDumpFile):
 
         return self.Tx._make((self.idx, start_time, phy_address, center_freq, modulation, memoryview(packet)))
 
+    def decode_lines(self, lines):
+        # Only the columns which are used are converted, and the packet with a single fromhex()
+        records = []
+        make = self.Tx._make
+        idx = self.idx
+        for line in lines:
+            fields = line.split(',', 10)
+            try:
+                records.append(make((idx, int(fields[0]), int(fields[3], 16), float(fields[2]), int(fields[4]),
+                                     memoryview(bytearray.fromhex(fields[9])))))
+            except (ValueError, IndexError):
+                # Unusual formatting (or a broken line), leave it to the per line decoder
+                records.append(self.decode(line))
+        return records
+
 
 class DeviceDumpFileRx(DeviceDumpFile):
-    Rx = namedtuple('Rx', 'idx, ts, aa, freq, mod, status, packet')
+    Rx = namedtuple('Rx', 'idx, ts, aa, freq, mod, status, biterrors, packet')
 
     def decode(self, line):
         try:
@@ -113,17 +159,53 @@ class DeviceDumpFileRx(DeviceDumpFile):
         packet_size = int(packet_size)
         packet = bytearray(int(v, 16) for v in packet.split())
 
-        return self.Rx._make((self.idx, rx_time_stamp, phy_address, center_freq, modulation, status,
+        return self.Rx._make((self.idx, rx_time_stamp, phy_address, center_freq, modulation, status, biterrors,
                               memoryview(packet)))
 
+    def decode_lines(self, lines):
+        # Only the columns which are used are converted, and the packet with a single fromhex()
+        records = []
+        make = self.Rx._make
+        idx = self.idx
+        for line in lines:
+            fields = line.split(',', 23)
+            try:
+                records.append(make((idx, int(fields[18]), int(fields[2], 16), float(fields[4]), int(fields[3]),
+                                     int(fields[19]), int(fields[14]), memoryview(bytearray.fromhex(fields[22])))))
+            except (ValueError, IndexError):
+                # Unusual formatting (or a broken line), leave it to the per line decoder
+                records.append(self.decode(line))
+        return records
+
+
+class Bitfield:
+    """
+        Decoder of bitfields, given as a comma separated list of field lengths (in bits) from the least
+        significant bit up; The shifts and masks are computed once, when the decoder is created.
+    """
+    def __init__(self, fmt):
+        self.fields = []
+        shift = 0
+        for length in fmt.split(","):
+            length = int(length, 10)
+            self.fields.append((shift, (1 << length) - 1))
+            shift += length
+        self.size = (shift + 7)//8
+
+    def unpack(self, value):
+        return tuple((value >> shift) & mask for shift, mask in self.fields)
+
+    # Decode the bitfield from the (little endian) start of <data>
+    def unpack_from(self, data, offset=0):
+        return self.unpack(int.from_bytes(data[offset:offset + self.size], 'little', signed=False))
+
+__bitfields = {}
 
 def unpack_bitfield(fmt, value):
-    result = []
-    for length in fmt.split(","):
-        length = int(length, 10)
-        result.append(value & abs(1 - (1 << length)))
-        value = value >> length
-    return tuple(result)
+    bitfield = __bitfields.get(fmt)
+    if bitfield is None:
+        bitfield = __bitfields[fmt] = Bitfield(fmt)
+    return bitfield.unpack(value)
 
 # Convert RF Channel number to Physical Channel Index (see Bluetooth Core Specification v5.3, vol 6, part B, section 1.4.1)
 def channel_num_to_index(channel_num):
@@ -145,7 +227,14 @@ PacketType = IntEnum('PacketType', ','.join(AdvPdu + LlControlPdu + LlDataPdu +
 
 
 class Packet:
-    def __init__(self, direction, idx, ts, aa, channel_num, phy, data, payload_type, header, payload):
+    __slots__ = ('direction', 'idx', 'ts', 'aa', 'channel_num', 'phy', 'data', 'type', 'rx',
+                 '__header', '__payload', '__decoder', '__pdu')
+
+    """
+        The header and payload are either given, or decoded on their first access by calling
+        <decoder>(<pdu>), which returns both of them
+    """
+    def __init__(self, direction, idx, ts, aa, channel_num, phy, data, payload_type, header, payload, decoder=None, pdu=None):
         self.direction = direction
         self.idx = idx
         self.ts = ts
@@ -154,8 +243,28 @@ class Packet:
         self.phy = phy
         self.data = data
         self.type = payload_type
-        self.header = header
-        self.payload = payload
+        self.__header = header
+        self.__payload = payload
+        self.__decoder = decoder
+        self.__pdu = pdu
+        # Rx records (idx, ts, status, biterrors, ...) of the devices which received this packet
+        self.rx = []
+
+    def __decode(self):
+        self.__header, self.__payload = self.__decoder(self.__pdu)
+        self.__decoder = self.__pdu = None
+
+    @property
+    def header(self):
+        if self.__decoder:
+            self.__decode()
+        return self.__header
+
+    @property
+    def payload(self):
+        if self.__decoder:
+            self.__decode()
+        return self.__payload
 
     def __len__(self):
         return len(self.data)
@@ -166,23 +275,57 @@ class Packet:
                f"{self.header}, {self.payload}"
 
 
+# Record types of the decoded headers and payloads (the type names are the ones shown in the Packet's repr)
+AdvHeader = namedtuple('Header', 'PDU_Type, ChSel, TxAdd, RxAdd, Length')
+DataHeader = namedtuple('Header', 'LLID, NESN, SN, MD, CP, Length, CTEInfo')
+IsocHeader = namedtuple('Header', 'LLID, NESN, SN, CIE, NPI, Length')
+AdvIndPayload = namedtuple('Payload', 'AdvA, AdvData')
+AdvDirectIndPayload = namedtuple('Payload', 'AdvA, TargetA')
+ConnectIndPayload = namedtuple('Payload', 'InitA, AdvA, LLData')
+LLData = namedtuple('LLData', 'AA, CRCInit, WinSize, WinOffset, Interval, Latency, Timeout, ChM, Hop, SCA')
+AuxScanReqPayload = namedtuple('Payload', 'AdvA, TargetA')
+ADI = namedtuple('ADI', 'DID, SID')
+AuxPtr = namedtuple('AuxPtr', 'chIdx, CA, offsetUnits, auxOffset, auxPHY')
+ControlPayload = namedtuple('Payload', 'Opcode, CtrData')
+TerminateIndCtrData = namedtuple('CtrData', 'ErrorCode')
+CisReqCtrData = namedtuple('CtrData', 'CIG_ID, CIS_ID, PHY_C_To_P, PHY_P_To_C, Max_SDU_C_To_P, Framed, Max_SDU_P_To_C,'
+                                      'SDU_Interval_C_To_P, SDU_Interval_P_To_C, Max_PDU_C_To_P, Max_PDU_P_To_C, NSE,'
+                                      'Sub_Interval, BN_C_To_P, BN_P_To_C, FT_C_To_P, FT_P_To_C, ISO_Interval,'
+                                      'CIS_Offset_Min, CIS_Offset_Max, connEventCount')
+CisRspCtrData = namedtuple('CtrData', 'CIS_Offset_Min, CIS_Offset_Max, connEventCount')
+CisIndCtrData = namedtuple('CtrData', 'AA, CIS_Offset, CIG_Sync_Delay, CIS_Sync_Delay, connEventCount')
+CisTerminateIndCtrData = namedtuple('CtrData', 'CIG_ID, CIS_ID, ErrorCode')
+SegmentationHeader = namedtuple('SegmentationHeader', 'SC, CMPLT, RFU, Length')
+FramedIsocPayload = namedtuple('Payload', 'SegmentationHeader, Payload')
+
+# Bitfield decoders
+ADV_HEADER = Bitfield('4,1,1,1,1,8')
+DATA_HEADER = Bitfield('2,1,1,1,1,2,8')
+ISOC_HEADER = Bitfield('2,1,1,1,1,1,1,8')
+SEGMENTATION_HEADER = Bitfield('1,1,6,8')
+EXT_HEADER_LENGTH = Bitfield('6,2')
+ADI_FIELD = Bitfield('12,4')
+AUX_PTR_FIELD = Bitfield('6,1,1,13,3')
+HOP_SCA = Bitfield('5,3')
+MAX_SDU_FRAMED = Bitfield('12,3,1')
+MAX_SDU = Bitfield('12,4')
+SDU_INTERVAL = Bitfield('20,4')
+BN = Bitfield('4,4')
+
+
 def adv_ind(data):
-    Payload = namedtuple('Payload', 'AdvA, AdvData')
     adv_a = data[:6]
     adv_data = data[6:]
-    return Payload(adv_a, adv_data)
+    return AdvIndPayload(adv_a, adv_data)
 
 
 def adv_direct_ind(data):
-    Payload = namedtuple('Payload', 'AdvA, TargetA')
     adv_a = data[:6]
     target_a = data[6:12]
-    return Payload(adv_a, target_a)
+    return AdvDirectIndPayload(adv_a, target_a)
 
 
 def connect_ind(payload):
-    Payload = namedtuple('Payload', 'InitA, AdvA, LLData')
-    LLData = namedtuple('LLData', 'AA, CRCInit, WinSize, WinOffset, Interval, Latency, Timeout, ChM, Hop, SCA')
     init_a = payload[:6]
     adv_a = payload[6:12]
     aa = int.from_bytes(payload[12:16], 'little', signed=False)
@@ -193,9 +336,9 @@ def connect_ind(payload):
     latency = int.from_bytes(payload[24:26], 'little', signed=False)
     timeout = int.from_bytes(payload[26:28], 'little', signed=False)
     ch_m = int.from_bytes(payload[28:33], 'little', signed=False)
-    hop, sca = unpack_bitfield('5,3', payload[33])
+    hop, sca = HOP_SCA.unpack(payload[33])
     ll_data = LLData(aa, crc_init, win_size, win_offset, interval, latency, timeout, ch_m, hop, sca)
-    return Payload(init_a, adv_a, ll_data)
+    return ConnectIndPayload(init_a, adv_a, ll_data)
 
 
 adv_legacy_pdu_dict = {
@@ -205,23 +348,31 @@ adv_legacy_pdu_dict = {
 }
 
 
+def decode_adv_header(pdu):
+    pdu_type, _, ch_sel, tx_add, rx_add, payload_len = ADV_HEADER.unpack_from(pdu)
+    return AdvHeader(pdu_type, ch_sel, tx_add, rx_add, payload_len)
+
+
+def decode_legacy_adv_pdu(pdu):
+    header = decode_adv_header(pdu)
+    return header, adv_legacy_pdu_dict[header.PDU_Type][1](pdu[2:2 + header.Length])
+
+
 def parse_adv_pdu(direction, idx, ts, aa, channel_num, phy, data, aux_ptr_packets):
-    Header = namedtuple('Header', 'PDU_Type, ChSel, TxAdd, RxAdd, Length')
-    pdu_type, _, ch_sel, tx_add, rx_add, payload_len = \
-        unpack_bitfield('4,1,1,1,1,8', int.from_bytes(data[:2], 'little', signed=False))
-    header = Header(pdu_type, ch_sel, tx_add, rx_add, payload_len)
-    data = data[2:2 + payload_len]
+    pdu_type = data[0] & 0x0F
     if pdu_type in adv_legacy_pdu_dict and channel_num in [0, 12, 39]:
-        payload_type, func = adv_legacy_pdu_dict[pdu_type]
-        payload = func(data)
-    else:
-        return parse_ext_adv_pdu(direction, idx, ts, aa, channel_num, phy, header, data, aux_ptr_packets);
-    return Packet(direction, idx, ts, aa, channel_num, phy, data, payload_type, header, payload)
+        # The type only depends on the PDU type and channel, the header and payload are decoded when used
+        payload_type = adv_legacy_pdu_dict[pdu_type][0]
+        return Packet(direction, idx, ts, aa, channel_num, phy, data[2:2 + data[1]], payload_type, None, None,
+                      decode_legacy_adv_pdu, data)
+    header = decode_adv_header(data)
+    data = data[2:2 + header.Length]
+    return parse_ext_adv_pdu(direction, idx, ts, aa, channel_num, phy, header, data, aux_ptr_packets);
 
 
 def parse_common_ext_adv_payload(data):
     payload = dict()
-    extHeaderLength, AdvMode = unpack_bitfield('6,2', int.from_bytes(data[:1], 'little', signed=False))
+    extHeaderLength, AdvMode = EXT_HEADER_LENGTH.unpack_from(data)
     data = data[1:]
     payload['AdvMode'] = AdvMode
     dataPtr = 0
@@ -239,14 +390,12 @@ def parse_common_ext_adv_payload(data):
             payload['CTEInfo'] = bytes(data[dataPtr:dataPtr+1])[0]
             dataPtr += 1
         if extHeaderFlags & 0x08: # AdvDataInfo present
-            ADI = namedtuple('ADI', 'DID, SID')
-            did, sid = unpack_bitfield('12,4', int.from_bytes(data[dataPtr:dataPtr+2], 'little', signed=False))
+            did, sid = ADI_FIELD.unpack_from(data, dataPtr)
             dataPtr += 2
             payload['ADI'] = ADI(did, sid)
         if extHeaderFlags & 0x10: # AuxPtr present
-            chIdx, clockAcc, offsetUnits, auxOffset, auxPHY = unpack_bitfield('6,1,1,13,3', int.from_bytes(data[dataPtr:dataPtr+3], 'little', signed=False))
+            chIdx, clockAcc, offsetUnits, auxOffset, auxPHY = AUX_PTR_FIELD.unpack_from(data, dataPtr)
             dataPtr += 3
-            AuxPtr = namedtuple('AuxPtr', 'chIdx, CA, offsetUnits, auxOffset, auxPHY')
             payload['AuxPtr'] = AuxPtr(chIdx, clockAcc, offsetUnits, auxOffset, auxPHY)
         if extHeaderFlags & 0x20: # SyncInfo present
             # TODO - decode further
@@ -275,10 +424,9 @@ def parse_ext_adv_pdu(direction, idx, ts, aa, channel_num, phy, header, data, au
     else:
         if header.PDU_Type == 0b0011:
             payload_type = PacketType.AUX_SCAN_REQ
-            Payload = namedtuple('Payload', 'AdvA, TargetA')
             advA = int.from_bytes(data[:6], 'little', signed=False)
             targetA = int.from_bytes(data[6:], 'little', signed=False)
-            payload = Payload(advA, targetA)
+            payload = AuxScanReqPayload(advA, targetA)
         elif header.PDU_Type == 0b0101:
             payload_type = PacketType.AUX_CONNECT_REQ
             # Payload is the same as CONNECT_IND
@@ -297,11 +445,7 @@ def parse_ext_adv_pdu(direction, idx, ts, aa, channel_num, phy, header, data, au
     return Packet(direction, idx, ts, aa, channel_num, phy, data, payload_type, header, payload)
 
 def find_superior_packets(ts, channel_num, phy, aux_ptr_packets):
-    superiorPackets = []
-    for packet in aux_ptr_packets:
-        if aux_ptr_matches(packet.payload['AuxPtr'], packet.ts, ts, channel_num, phy):
-            superiorPackets += [packet]
-    return superiorPackets
+    return aux_ptr_packets.find(ts, channel_num, phy)
 
 def determine_ext_adv_pdu_type(payload):
     if payload['SuperiorPackets']:
@@ -317,71 +461,103 @@ def determine_ext_adv_pdu_type(payload):
     # No matches and does not look like a AUX_SCAN_RSP
     return PacketType.ADV_EXT_UNKNOWN_PDU
 
+# PHY (as given by PacketParser) on which the auxiliary packet of an AuxPtr is received
+def aux_ptr_phy(aux_ptr):
+    return '2M' if aux_ptr.auxPHY == 0x01 else '1M' if aux_ptr.auxPHY in (0x00, 0x02) else None
+
+# Window (t_start, t_end) in which the auxiliary packet pointed to by an AuxPtr starts, or None if there is none
+def aux_ptr_window(aux_ptr, superior_packet_ts):
+    if aux_ptr.auxOffset == 0: # AuxOffset == 0 means no auxillary packet will be transmitted
+        return None
+    t_start_offset = (300 if aux_ptr.offsetUnits == 1 else 30) * aux_ptr.auxOffset
+    t_end_offset = (300 if aux_ptr.offsetUnits == 1 else 30) * (aux_ptr.auxOffset + 1)
+    # Adjust according to clock accuracy value
+    ca_adjustment = math.ceil(t_end_offset * ((50 if aux_ptr.CA == 1 else 500)/1000000))
+    return superior_packet_ts + (t_start_offset - ca_adjustment), superior_packet_ts + (t_end_offset + ca_adjustment)
+
 def aux_ptr_matches(aux_ptr, superior_packet_ts, ts, channel_num, phy):
-    ch = channel_num_to_index(channel_num)
-    if ch == aux_ptr.chIdx and ((phy == '1M' and (aux_ptr.auxPHY == 0x00 or aux_ptr.auxPHY == 0x02)) or (phy == '2M' and aux_ptr.auxPHY == 0x01)):
-        if (aux_ptr.auxOffset > 0): # AuxOffset == 0 means no auxillary packet will be transmitted
-            t_start_offset = (300 if aux_ptr.offsetUnits == 1 else 30) * aux_ptr.auxOffset
-            t_end_offset = (300 if aux_ptr.offsetUnits == 1 else 30) * (aux_ptr.auxOffset + 1)
-            # Adjust according to clock accuracy value
-            ca_adjustment = math.ceil(t_end_offset * ((50 if aux_ptr.CA == 1 else 500)/1000000))
-            t_start = superior_packet_ts + (t_start_offset - ca_adjustment)
-            t_end = superior_packet_ts + (t_end_offset + ca_adjustment)
-            if ts >= t_start and ts <= t_end:
-                return True
+    if channel_num_to_index(channel_num) == aux_ptr.chIdx and phy == aux_ptr_phy(aux_ptr):
+        window = aux_ptr_window(aux_ptr, superior_packet_ts)
+        if window and ts >= window[0] and ts <= window[1]:
+            return True
     return False
 
+
+class AuxPtrIndex:
+    """
+        The packets with an AuxPtr whose auxiliary packet can still arrive, by (channel index, PHY) of the
+        auxiliary packet, each with the window computed from its AuxPtr.
+        Packets are looked up in timestamp order, so a window which ended before the looked up packet is
+        dropped: a packet's superior packets are so found without going through the whole history.
+    """
+    def __init__(self):
+        self.__windows = {}
+
+    def add(self, packet):
+        aux_ptr = packet.payload['AuxPtr']
+        window = aux_ptr_window(aux_ptr, packet.ts)
+        phy = aux_ptr_phy(aux_ptr)
+        if window and phy:
+            self.__windows.setdefault((aux_ptr.chIdx, phy), []).append((window[0], window[1], packet))
+
+    """
+        The packets whose AuxPtr points to a packet starting at <ts> on <channel_num> and <phy>, oldest first
+    """
+    def find(self, ts, channel_num, phy):
+        key = (channel_num_to_index(channel_num), phy)
+        windows = self.__windows.get(key)
+        if not windows:
+            return []
+        if any(t_end < ts for _, t_end, _ in windows):
+            windows = self.__windows[key] = [window for window in windows if window[1] >= ts]
+        return [packet for t_start, _, packet in windows if t_start <= ts]
+
+    def __len__(self):
+        return sum(len(windows) for windows in self.__windows.values())
+
 def ll_terminate_ind(data):
-    CtrData = namedtuple('CtrData', 'ErrorCode')
-    return CtrData(data[0])
+    return TerminateIndCtrData(data[0])
 
 
 def ll_cis_req(data):
-    CtrData = namedtuple('CtrData', 'CIG_ID, CIS_ID, PHY_C_To_P, PHY_P_To_C, Max_SDU_C_To_P, Framed, Max_SDU_P_To_C,'
-                                    'SDU_Interval_C_To_P, SDU_Interval_P_To_C, Max_PDU_C_To_P, Max_PDU_P_To_C, NSE,'
-                                    'Sub_Interval, BN_C_To_P, BN_P_To_C, FT_C_To_P, FT_P_To_C, ISO_Interval,'
-                                    'CIS_Offset_Min, CIS_Offset_Max, connEventCount')
     cig_id, cis_id, phy_c_to_p, phy_p_to_c = data[:4]
-    max_sdu_c_to_p, _, framed = unpack_bitfield('12,3,1', int.from_bytes(data[4:6], 'little', signed=False))
-    max_sdu_p_to_c, _ = unpack_bitfield('12,4', int.from_bytes(data[6:8], 'little', signed=False))
-    sdu_interval_c_to_p, _ = unpack_bitfield('20,4', int.from_bytes(data[8:11], 'little', signed=False))
-    sdu_interval_p_to_c, _ = unpack_bitfield('20,4', int.from_bytes(data[11:14], 'little', signed=False))
+    max_sdu_c_to_p, _, framed = MAX_SDU_FRAMED.unpack_from(data, 4)
+    max_sdu_p_to_c, _ = MAX_SDU.unpack_from(data, 6)
+    sdu_interval_c_to_p, _ = SDU_INTERVAL.unpack_from(data, 8)
+    sdu_interval_p_to_c, _ = SDU_INTERVAL.unpack_from(data, 11)
     max_pdu_c_to_p = int.from_bytes(data[14:16], 'little', signed=False)
     max_pdu_p_to_c = int.from_bytes(data[16:18], 'little', signed=False)
     nse = data[19]
     sub_interval = int.from_bytes(data[19:22], 'little', signed=False)
-    bn_c_to_p, bn_p_to_c = unpack_bitfield('4,4', data[22])
+    bn_c_to_p, bn_p_to_c = BN.unpack(data[22])
     ft_c_to_p, ft_p_to_c = data[23:25]
     iso_interval = int.from_bytes(data[25:27], 'little', signed=False)
     cis_offset_min = int.from_bytes(data[27:30], 'little', signed=False)
     cis_offset_max = int.from_bytes(data[30:33], 'little', signed=False)
     conn_event_count = int.from_bytes(data[33:35], 'little', signed=False)
-    return CtrData(cig_id, cis_id, phy_c_to_p, phy_p_to_c, max_sdu_c_to_p, framed, max_sdu_p_to_c, sdu_interval_c_to_p,
-                   sdu_interval_p_to_c, max_pdu_c_to_p, max_pdu_p_to_c, nse, sub_interval, bn_c_to_p, bn_p_to_c,
-                   ft_c_to_p, ft_p_to_c, iso_interval, cis_offset_min, cis_offset_max, conn_event_count)
+    return CisReqCtrData(cig_id, cis_id, phy_c_to_p, phy_p_to_c, max_sdu_c_to_p, framed, max_sdu_p_to_c, sdu_interval_c_to_p,
+                         sdu_interval_p_to_c, max_pdu_c_to_p, max_pdu_p_to_c, nse, sub_interval, bn_c_to_p, bn_p_to_c,
+                         ft_c_to_p, ft_p_to_c, iso_interval, cis_offset_min, cis_offset_max, conn_event_count)
 
 
 def ll_cis_rsp(data):
-    CtrData = namedtuple('CtrData', 'CIS_Offset_Min, CIS_Offset_Max, connEventCount')
     cis_offset_min = int.from_bytes(data[:3], 'little', signed=False)
     cis_offset_max = int.from_bytes(data[3:6], 'little', signed=False)
     conn_event_count = int.from_bytes(data[6:8], 'little', signed=False)
-    return CtrData(cis_offset_min, cis_offset_max, conn_event_count)
+    return CisRspCtrData(cis_offset_min, cis_offset_max, conn_event_count)
 
 
 def ll_cis_ind(data):
-    CtrData = namedtuple('CtrData', 'AA, CIS_Offset, CIG_Sync_Delay, CIS_Sync_Delay, connEventCount')
     aa = int.from_bytes(data[0:4], 'little', signed=False)
     cis_offset = int.from_bytes(data[4:7], 'little', signed=False)
     cig_sync_delay = int.from_bytes(data[7:10], 'little', signed=False)
     cis_sync_delay = int.from_bytes(data[10:13], 'little', signed=False)
     conn_event_counter = int.from_bytes(data[13:15], 'little', signed=False)
-    return CtrData(aa, cis_offset, cig_sync_delay, cis_sync_delay, conn_event_counter)
+    return CisIndCtrData(aa, cis_offset, cig_sync_delay, cis_sync_delay, conn_event_counter)
 
 
 def ll_cis_terminate_ind(data):
-    CtrData = namedtuple('CtrData', 'CIG_ID, CIS_ID, ErrorCode')
-    return CtrData(*data[:3])
+    return CisTerminateIndCtrData(*data[:3])
 
 
 ll_control_pdu_dict = {
@@ -393,49 +569,62 @@ ll_control_pdu_dict = {
 }
 
 
-def parse_data_pdu(direction, idx, ts, aa, channel_num, phy, data):
-    Header = namedtuple('Header', 'LLID, NESN, SN, MD, CP, Length, CTEInfo')
-    llid, nesn, sn, md, cp, rfu, payload_length = \
-            unpack_bitfield('2,1,1,1,1,2,8', int.from_bytes(data[:2], 'little', signed=False))
-    cte_info = data[2] if cp else None
-    header = Header(llid, nesn, sn, md, cp, payload_length, cte_info)
+def decode_data_pdu(pdu):
+    llid, nesn, sn, md, cp, rfu, payload_length = DATA_HEADER.unpack_from(pdu)
+    cte_info = pdu[2] if cp else None
+    header = DataHeader(llid, nesn, sn, md, cp, payload_length, cte_info)
     pdu_offset = 3 if cp else 2
-    data = data[pdu_offset:pdu_offset + payload_length]
+    data = pdu[pdu_offset:pdu_offset + payload_length]
+    if llid == 0b11:
+        opcode = data[0]
+        if opcode in ll_control_pdu_dict:
+            payload = ControlPayload(opcode, ll_control_pdu_dict[opcode][1](data[1:]))
+        else:
+            payload = ControlPayload(opcode, data[1:])
+    else:
+        payload = data
+    return header, payload
+
+
+def parse_data_pdu(direction, idx, ts, aa, channel_num, phy, data):
+    llid = data[0] & 0b11
+    pdu_offset = 3 if data[0] & 0x20 else 2
+    pdu = data
+    data = data[pdu_offset:pdu_offset + data[1]]
     if llid == 0b11:
-        Payload = namedtuple('Payload', 'Opcode, CtrData')
         opcode = data[0]
         if opcode in ll_control_pdu_dict:
-            payload_type, func = ll_control_pdu_dict[opcode]
-            payload = Payload(opcode, func(data[1:]))
+            payload_type = ll_control_pdu_dict[opcode][0]
         else:
-            payload_type, payload = PacketType.LL_CONTROL_UNKNOWN_PDU, Payload(opcode, data[1:])
+            payload_type = PacketType.LL_CONTROL_UNKNOWN_PDU
     elif llid == 0b10 or llid == 0b01:
         payload_type = PacketType.LL_DATA_PDU
-        payload = data
     else:
         return None
-    return Packet(direction, idx, ts, aa, channel_num, phy, data, payload_type, header, payload)
+    return Packet(direction, idx, ts, aa, channel_num, phy, data, payload_type, None, None, decode_data_pdu, pdu)
+
+
+def decode_isoc_pdu(pdu):
+    llid, nesn, sn, cie, rfu_1, npi, rfu_2, payload_length = ISOC_HEADER.unpack_from(pdu)
+    header = IsocHeader(llid, nesn, sn, cie, npi, payload_length)
+    if llid == 0b10:
+        sc, cmplt, rfu, payload_length = SEGMENTATION_HEADER.unpack_from(pdu, 2)
+        segmentation_header = SegmentationHeader(sc, cmplt, rfu, payload_length)
+        payload = FramedIsocPayload(segmentation_header, pdu[4:4 + payload_length])
+    else:
+        payload = pdu[2:2 + payload_length]
+    return header, payload
 
 
 def parse_isoc_pdu(direction, idx, ts, aa, channel_num, phy, data):
-    Header = namedtuple('Header', 'LLID, NESN, SN, CIE, NPI, Length')
-    llid, nesn, sn, cie, rfu_1, npi, rfu_2, payload_length = \
-        unpack_bitfield('2,1,1,1,1,1,1,8', int.from_bytes(data[:2], 'little', signed=False))
-    header = Header(llid, nesn, sn, cie, npi, payload_length)
+    llid = data[0] & 0b11
     if llid == 0b00 or llid == 0b01:
         payload_type = PacketType.ISOC_UNFRAMED_PDU
-        payload = data[2:2 + payload_length]
     elif llid == 0b10:
         payload_type = PacketType.ISOC_FRAMED_PDU
-        SegmentationHeader = namedtuple('SegmentationHeader', 'SC, CMPLT, RFU, Length')
-        sc, cmplt, rfu, payload_length = unpack_bitfield('1,1,6,8', int.from_bytes(data[2:4], 'little', signed=False))
-        segmentation_header = SegmentationHeader(sc, cmplt, rfu, payload_length)
-        Payload = namedtuple('Payload', 'SegmentationHeader, Payload')
-        payload = Payload(segmentation_header, data[4:4 + payload_length])
     else:
         payload_type = PacketType.ISOC_UNKNOWN_PDU
-        payload = data[2:2 + payload_length]
-    return Packet(direction, idx, ts, aa, channel_num, phy, data, payload_type, header, payload)
+    return Packet(direction, idx, ts, aa, channel_num, phy, data, payload_type, None, None, decode_isoc_pdu, data)
 
 
 class ConnectionData:
@@ -450,7 +639,7 @@ class PacketParser:
         self.__func_by_aa = {
             0x8E89BED6: parse_adv_pdu,
         }
-        self.__aux_ptr_packets = [];
+        self.__aux_ptr_packets = AuxPtrIndex();
 
     def __get_packet(self, direction, idx, ts, aa, channel_num, phy, packet):
         if aa in self.__func_by_aa:
@@ -486,7 +675,7 @@ class PacketParser:
     def __on_ext_adv_packet(self, packet, _):
         # TODO - handle SyncInfo packets as well
         if 'AuxPtr' in packet.payload:
-            self.__aux_ptr_packets.append(packet)
+            self.__aux_ptr_packets.add(packet)
 
     def __on_connect_ind(self, packet, _):
         self.__func_by_aa[packet.payload.LLData.AA] = parse_data_pdu
@@ -536,8 +725,10 @@ class SortedDumps:
             self.generator = self.file.fetch()
             self.dump = None
 
-    def __init__(self):
+    def __init__(self, sync=None):
+        # sync: optional callable to bring the simulation up to date before reading the dumps
         self.dumps = []
+        self.sync = sync
 
     def __del__(self):
         for dump in self.dumps:
@@ -555,10 +746,11 @@ class SortedDumps:
         self.__open(DeviceDumpFileTx(idx, file_path))
 
     def add_rx(self, idx, file_path):
-        # TODO
-        pass
+        self.__open(DeviceDumpFileRx(idx, file_path))
 
     def flush(self):
+        if self.sync:
+            self.sync()
         for dump in self.dumps:
             while next(dump.generator):
                 pass
@@ -566,51 +758,315 @@ class SortedDumps:
             dump.dump = None
 
     def fetch(self):
-        while True:
-            for dump in self.dumps:
-                if not dump.dump:
-                    try:
-                        dump.dump = next(dump.generator)
-                    except StopIteration:
-                        pass
-
-            # sort by timestamp
-            self.dumps.sort(key=lambda entry: entry.dump.ts if entry.dump else sys.maxsize)
-            dump = self.dumps[0]
+        if self.sync:
+            self.sync()
+        # k-way merge: a heap of (timestamp, position, dump) holding the next record of every
+        # dump which has one. A dump which has nothing more for now (EOF or partial line) is
+        # left out of the heap until the next fetch
+        heap = []
+        for position, dump in enumerate(self.dumps):
             if not dump.dump:
-                return
+                dump.dump = self.__next(dump)
+            if dump.dump:
+                heap.append((dump.dump.ts, position, dump))
+        heapq.heapify(heap)
+
+        while heap:
+            _, position, dump = heap[0]
+            record, dump.dump = dump.dump, None
+            yield record
+
+            dump.dump = self.__next(dump)
+            if dump.dump:
+                heapq.heapreplace(heap, (dump.dump.ts, position, dump))
+            else:
+                heapq.heappop(heap)
 
-            yield dump.dump
-            dump.dump = None
+    @staticmethod
+    def __next(dump):
+        try:
+            return next(dump.generator)
+        except StopIteration:
+            return None
+
+
+"""
+    The set of PacketTypes selected by <packet_filter> (a type name or a sequence of type names),
+    or None when it selects all packets.
+    A type name is selected when it is in <packet_filter>, so for a single string this also
+    selects the types whose name is part of it (as the filters always did)
+"""
+def packet_filter_types(packet_filter):
+    if not packet_filter:
+        return None
+    try:
+        iter(packet_filter)
+    except TypeError:
+        packet_filter = (packet_filter,)
+    return frozenset(t for t in PacketType if t.name in packet_filter)
+
+
+class RetentionPolicy:
+    # Packets kept by default whatever their age: the connection setup and LL control PDUs the tests look back for
+    DEFAULT_KEEP = ('CONNECT_IND', 'AUX_CONNECT_REQ', 'AUX_CONNECT_RSP', 'LL_TERMINATE_IND', 'LL_CIS_REQ',
+                    'LL_CIS_RSP', 'LL_CIS_IND', 'LL_CIS_TERMINATE_IND')
+
+    """
+        Constructor:
+            max_count - Most packets kept in memory (None for no limit)
+            max_age   - Packets more than this many microseconds older than the newest one are evicted (None for no limit)
+            keep      - Type or list of types (as for Packets.fetch()) which are never evicted
+            spill_dir - Folder where the evicted packets are stored (see PacketSpill), None to just drop them
+    """
+    def __init__(self, max_count=None, max_age=None, keep=DEFAULT_KEEP, spill_dir=None):
+        self.max_count = max_count
+        self.max_age = max_age
+        self.keep = packet_filter_types(keep) or frozenset()
+        self.spill_dir = spill_dir
+
+
+class PacketSpill:
+    """
+        Columnar store of evicted packets: One file per field in <folder>, with the packet data in a separate file.
+        The stored fields can still be queried with fetch(), without any header or payload decoding.
+    """
+    Record = namedtuple('Record', 'direction, idx, ts, aa, channel_num, phy, type, data')
+    COLUMNS = (('position', 'q'), ('ts', 'q'), ('type', 'H'), ('idx', 'H'), ('aa', 'I'), ('channel_num', 'B'),
+               ('phy', 'B'), ('direction', 'B'), ('offset', 'q'), ('length', 'H'))
+    PHYS = ('unknown', '1M', '2M')
+    DIRECTIONS = ('Tx', 'Rx')
+
+    def __init__(self, folder, name='packets_spill'):
+        os.makedirs(folder, exist_ok=True)
+        self.paths = {column: os.path.join(folder, '%s.%s' % (name, column)) for column, _ in self.COLUMNS}
+        self.data_path = os.path.join(folder, name + '.data')
+        self.offset = 0
+        # Everything is truncated, a spill only holds the packets of one Packets object
+        for path in list(self.paths.values()) + [self.data_path]:
+            open(path, 'wb').close()
+
+    def write(self, positions, packets):
+        columns = {column: array(code) for column, code in self.COLUMNS}
+        data = bytearray()
+        for position, packet in zip(positions, packets):
+            columns['position'].append(position)
+            columns['ts'].append(packet.ts)
+            columns['type'].append(packet.type)
+            columns['idx'].append(packet.idx)
+            columns['aa'].append(packet.aa)
+            columns['channel_num'].append(packet.channel_num)
+            columns['phy'].append(self.PHYS.index(packet.phy) if packet.phy in self.PHYS else 0)
+            columns['direction'].append(self.DIRECTIONS.index(packet.direction))
+            columns['offset'].append(self.offset + len(data))
+            columns['length'].append(len(packet.data))
+            data += packet.data
+        for column, values in columns.items():
+            with open(self.paths[column], 'ab') as file:
+                values.tofile(file)
+        with open(self.data_path, 'ab') as file:
+            file.write(data)
+        self.offset += len(data)
+
+    def __load(self, column, code):
+        values = array(code)
+        with open(self.paths[column], 'rb') as file:
+            values.frombytes(file.read())
+        return values
+
+    """
+        The stored packets matching <packet_filter> with a timestamp from <t0> to <t1> (None for no limit), oldest first
+    """
+    def fetch(self, packet_filter=(), t0=None, t1=None):
+        types = packet_filter_types(packet_filter)
+        columns = {column: self.__load(column, code) for column, code in self.COLUMNS}
+        with open(self.data_path, 'rb') as file:
+            data = file.read()
+        for i, ts in enumerate(columns['ts']):
+            packet_type = PacketType(columns['type'][i])
+            if (types is None or packet_type in types) and (t0 is None or ts >= t0) and (t1 is None or ts <= t1):
+                offset = columns['offset'][i]
+                yield self.Record(self.DIRECTIONS[columns['direction'][i]], columns['idx'][i], ts, columns['aa'][i],
+                                  columns['channel_num'][i], self.PHYS[columns['phy'][i]], packet_type,
+                                  memoryview(data)[offset:offset + columns['length'][i]])
+
+
+class RxMatcher:
+    """
+        Matches the Rx dump records to the Tx record (and its parsed packet) of the transmission they received:
+        the last transmission on the same access address and center frequency, started at most MAX_SYNC_DELAY
+        before the reception's sync and, for a correct reception, with the same content.
+    """
+    # Longest time from the start of a transmission to the receiver's sync (Coded PHY preamble and access address)
+    MAX_SYNC_DELAY = 400
+
+    def __init__(self):
+        # Last transmission on each (access address, center frequency)
+        self.__on_air = {}
+
+    def transmitted(self, tx, packet):
+        self.__on_air[(tx.aa, tx.freq)] = (tx, packet)
+
+    """
+        Returns (matched, packet); <packet> is the packet parsed from the matching Tx record (possibly None)
+    """
+    def received(self, rx):
+        tx, packet = self.__on_air.get((rx.aa, rx.freq), (None, None))
+        if tx and 0 <= rx.ts - tx.ts <= self.MAX_SYNC_DELAY and (rx.status != 1 or rx.packet == tx.packet):
+            return True, packet
+        return False, None
+
+    # Whether an unmatched reception is parsed on its own: only when it was received correctly
+    @staticmethod
+    def parseable(rx):
+        return rx.status == 1 and len(rx.packet) > 0
 
 
 class Packets:
-    def __init__(self, dumps):
+    """
+        Constructor:
+            dumps     - SortedDumps to take the packets from
+            retention - RetentionPolicy limiting the packets kept in memory (None to keep all of them)
+    """
+    def __init__(self, dumps, retention=None):
         self.__dumps = dumps
         self.__dumps.flush()
         self.__parser = PacketParser()
+        self.__retention = retention
+        self.__reset()
+
+    def __reset(self):
         self.__packets = []
+        # Position of __packets[0]; The packets before it have been evicted, except the ones in __kept
+        self.__base = 0
+        self.__kept = {}
+        self.__spill = None
+        if self.__retention and self.__retention.spill_dir:
+            self.__spill = PacketSpill(self.__retention.spill_dir)
+        self.__matcher = RxMatcher()
+        # Positions (in __packets) of the packets per type, access address and device, and (ts, position) sorted by ts
+        self.__by_type = {}
+        self.__by_aa = {}
+        self.__by_idx = {}
+        self.__by_ts = []
+
+    def __at(self, position):
+        return self.__packets[position - self.__base] if position >= self.__base else self.__kept[position]
+
+    def __append(self, packet):
+        position = self.__base + len(self.__packets)
+        self.__packets.append(packet)
+        if packet is None:
+            return
+        self.__by_type.setdefault(packet.type, []).append(position)
+        self.__by_aa.setdefault(packet.aa, []).append(position)
+        self.__by_idx.setdefault(packet.idx, []).append(position)
+        if self.__by_ts and self.__by_ts[-1][0] > packet.ts:
+            bisect.insort(self.__by_ts, (packet.ts, position))
+        else:
+            self.__by_ts.append((packet.ts, position))
+        if self.__retention:
+            self.__evict(packet.ts)
+
+    def __evict(self, now):
+        # Packets are evicted in batches (of 1/8 of the limits), so the indexes are not trimmed for each new packet
+        retention = self.__retention
+        count = 0
+        if retention.max_count is not None and len(self.__packets) > retention.max_count + retention.max_count//8:
+            count = len(self.__packets) - retention.max_count
+        if retention.max_age is not None:
+            oldest = now - retention.max_age
+            first = next((packet for packet in self.__packets if packet is not None), None)
+            if first is not None and first.ts < oldest - retention.max_age//8:
+                count = max(count, next((i for i, packet in enumerate(self.__packets)
+                                         if packet is not None and packet.ts >= oldest), len(self.__packets)))
+        if count == 0:
+            return
+
+        evicted = [(self.__base + i, packet) for i, packet in enumerate(self.__packets[:count]) if packet is not None]
+        spilled = []
+        for position, packet in evicted:
+            if packet.type in retention.keep:
+                self.__kept[position] = packet
+            else:
+                spilled.append((position, packet))
+        if self.__spill and spilled:
+            self.__spill.write(*zip(*spilled))
+
+        del self.__packets[:count]
+        self.__base += count
+
+        # Trim the indexes, the kept packets stay in them
+        kept, base = self.__kept, self.__base
+        def trim(positions, position=lambda entry: entry):
+            n = 0
+            while n < len(positions) and position(positions[n]) < base:
+                n += 1
+            positions[:n] = [entry for entry in positions[:n] if position(entry) in kept]
+        for packet_type, positions in self.__by_type.items():
+            if packet_type not in retention.keep:
+                del positions[:bisect.bisect_left(positions, base)]
+        for index in (self.__by_aa, self.__by_idx):
+            for positions in index.values():
+                trim(positions)
+        trim(self.__by_ts, lambda entry: entry[1])
+
+    def __append_new(self):
+        for dump in self.__dumps.fetch():
+            if isinstance(dump, Packet):
+                # Already parsed (e.g. loaded from a dump cache)
+                packet = dump
+            elif isinstance(dump, DeviceDumpFileRx.Rx):
+                packet = self.__receive(dump)
+                if packet is False:
+                    continue
+            else:
+                packet = self.__parser.parse(dump)
+                self.__matcher.transmitted(dump, packet)
+            self.__append(packet)
+
+    def __receive(self, rx):
+        # A reception of a packet transmitted by one of the dumped devices is only attached to that packet
+        matched, packet = self.__matcher.received(rx)
+        if matched:
+            if packet is not None:
+                packet.rx.append(rx)
+            return False
+        # Otherwise it is parsed on its own, provided it was received correctly
+        if not RxMatcher.parseable(rx):
+            return False
+        packet = self.__parser.parse(rx)
+        if packet is not None:
+            packet.rx.append(rx)
+        return packet
+
+    def __next_position(self, types, i):
+        # Position of the first packet at or after position <i> of one of <types> (None for any type)
+        found = None
+        for packet_type in (self.__by_type if types is None else types):
+            positions = self.__by_type.get(packet_type)
+            if positions:
+                n = bisect.bisect_left(positions, i)
+                if n < len(positions) and (found is None or positions[n] < found):
+                    found = positions[n]
+        return found
+
+    def __select(self, positions, types):
+        packets = (self.__at(i) for i in positions)
+        return [packet for packet in packets if types is None or packet.type in types]
 
     def fetch(self, packet_filter=()):
-        try:
-            iter(packet_filter)
-        except TypeError:
-            packet_filter = (packet_filter,)
-        else:
-            packet_filter = packet_filter
+        types = packet_filter_types(packet_filter)
 
         i = 0
         while True:
             # Append new packets
-            for dump in self.__dumps.fetch():
-                self.__packets.append(self.__parser.parse(dump))
+            self.__append_new()
 
-            if i < len(self.__packets):
-                if self.__packets[i] != None and (not packet_filter or self.__packets[i].type.name in packet_filter):
-                    yield self.__packets[i]
-                i += 1
-            else:
+            i = self.__next_position(types, i)
+            if i is None:
                 return
+            yield self.__at(i)
+            i += 1
 
     def find(self, packet_type=None):
         try:
@@ -619,24 +1075,51 @@ class Packets:
             return None
 
     def findLast(self, packet_filter=()):
-        try:
-            iter(packet_filter)
-        except TypeError:
-            packet_filter = (packet_filter,)
-        else:
-            packet_filter = packet_filter
+        types = packet_filter_types(packet_filter)
 
         # Append new packets
-        for dump in self.__dumps.fetch():
-            self.__packets.append(self.__parser.parse(dump))
-
-        for i in reversed(range(len(self.__packets))):
-            if self.__packets[i] != None and (not packet_filter or self.__packets[i].type.name in packet_filter):
-                return self.__packets[i]
-        return None
+        self.__append_new()
+
+        last = max((self.__by_type[t][-1] for t in (self.__by_type if types is None else types)
+                    if self.__by_type.get(t)), default=None)
+        return None if last is None else self.__at(last)
+
+    """
+        The packets with a timestamp from <t0> to <t1> (both included) matching <packet_filter>, in timestamp order
+    """
+    def fetchRange(self, t0, t1, packet_filter=()):
+        self.__append_new()
+        start = bisect.bisect_left(self.__by_ts, (t0, -1))
+        end = bisect.bisect_right(self.__by_ts, (t1, self.__base + len(self.__packets)))
+        return self.__select((position for _, position in self.__by_ts[start:end]), packet_filter_types(packet_filter))
+
+    """
+        The packets on access address <aa> matching <packet_filter>, from oldest to newest
+    """
+    def fetchAccessAddress(self, aa, packet_filter=()):
+        self.__append_new()
+        return self.__select(self.__by_aa.get(aa, ()), packet_filter_types(packet_filter))
+
+    """
+        The packets transmitted (or, for 'Rx' packets, received) by device <idx> matching <packet_filter>,
+        from oldest to newest
+    """
+    def fetchDevice(self, idx, packet_filter=()):
+        self.__append_new()
+        return self.__select(self.__by_idx.get(idx, ()), packet_filter_types(packet_filter))
+
+    """
+        The packets evicted to the spill folder of the retention policy, matching <packet_filter> and with a
+        timestamp from <t0> to <t1> (None for no limit), from oldest to newest; Only the fields stored by
+        PacketSpill are available
+    """
+    def fetchSpilled(self, packet_filter=(), t0=None, t1=None):
+        if not self.__spill:
+            return iter(())
+        return self.__spill.fetch(packet_filter, t0, t1)
 
     def flush(self):
         for dump in self.__dumps.fetch():
             pass
         self.__parser = PacketParser()
-        self.__packets = []
+        self.__reset()
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 Oticon A/S
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+    Columnar cache of the BabbleSim dump files of a simulation, and of the packets parsed from them,
+    so a run can be inspected again without parsing the CSV dumps.
+
+    The cache is a folder with one NumPy .npy file per column (so each of them can be memory mapped):
+
+        rec_*  - One row per Tx/Rx dump record: kind (0: Tx, 1: Rx), idx, ts, aa, freq, mod, status and
+                 biterrors (-1 for Tx records), and the offset and length of its packet in rec_data
+        pkt_*  - One row per parsed packet: the record it was parsed from, type, direction (0: Tx, 1: Rx),
+                 idx, ts, aa, channel_num, phy (0: unknown, 1: 1M, 2: 2M), the offset and length of its data
+                 in rec_data, and where its superior packets (extended advertising) are in pkt_superiors
+        rx_*   - One row per reception attached to a transmitted packet: the packet and the Rx record
+
+    load_packets() rebuilds a Packets object from the cache. The packets are created with the same PDU
+    parsers as when reading the dumps, so their headers and payloads are still only decoded when used.
+"""
+
+import os
+import numpy as np
+from components.dump import (Packets, PacketParser, PacketType, RxMatcher, DeviceDumpFileRx, AdvPdu,
+                             LlControlPdu, LlDataPdu, parse_adv_pdu, parse_data_pdu, parse_isoc_pdu)
+
+PHYS = ('unknown', '1M', '2M')
+DIRECTIONS = ('Tx', 'Rx')
+
+REC_COLUMNS = (('kind', np.uint8), ('idx', np.uint16), ('ts', np.int64), ('aa', np.uint32), ('freq', np.float64),
+               ('mod', np.uint8), ('status', np.int8), ('biterrors', np.int32), ('offset', np.int64),
+               ('length', np.uint16))
+PKT_COLUMNS = (('record', np.int64), ('type', np.uint8), ('direction', np.uint8), ('idx', np.uint16),
+               ('ts', np.int64), ('aa', np.uint32), ('channel_num', np.uint8), ('phy', np.uint8),
+               ('data_offset', np.int64), ('data_length', np.uint16), ('superior_start', np.int64),
+               ('superior_count', np.uint16))
+RX_COLUMNS = (('packet', np.int64), ('record', np.int64))
+
+ADV_TYPES = frozenset(PacketType[name] for name in AdvPdu)
+DATA_TYPES = frozenset(PacketType[name] for name in LlControlPdu + LlDataPdu)
+
+def _data_offset(packet_type, pdu):
+    # Offset of Packet.data in the PDU, as the parsers slice it
+    if packet_type in ADV_TYPES:
+        return 2
+    if packet_type in DATA_TYPES:
+        return 3 if pdu[0] & 0x20 else 2
+    return 0
+
+"""
+    Read all the records available in <dumps> (a SortedDumps), parse them as Packets would, and store
+    everything in the cache folder <folder>. Returns the number of packets stored
+"""
+def export_dumps(folder, dumps):
+    parser = PacketParser()
+    matcher = RxMatcher()
+    rec = {column: [] for column, _ in REC_COLUMNS}
+    pkt = {column: [] for column, _ in PKT_COLUMNS}
+    rx = {column: [] for column, _ in RX_COLUMNS}
+    superiors = []
+    data = bytearray()
+    positions = {}
+
+    for record in dumps.fetch():
+        received = isinstance(record, DeviceDumpFileRx.Rx)
+        r = len(rec['kind'])
+        rec['kind'].append(1 if received else 0)
+        rec['idx'].append(record.idx)
+        rec['ts'].append(record.ts)
+        rec['aa'].append(record.aa)
+        rec['freq'].append(record.freq)
+        rec['mod'].append(record.mod)
+        rec['status'].append(record.status if received else -1)
+        rec['biterrors'].append(record.biterrors if received else -1)
+        rec['offset'].append(len(data))
+        rec['length'].append(len(record.packet))
+        data += record.packet
+
+        if received:
+            matched, packet = matcher.received(record)
+            if matched:
+                if packet is not None:
+                    rx['packet'].append(positions[id(packet)])
+                    rx['record'].append(r)
+                continue
+            if not RxMatcher.parseable(record):
+                continue
+        packet = parser.parse(record)
+        if not received:
+            matcher.transmitted(record, packet)
+        if packet is None:
+            continue
+
+        positions[id(packet)] = len(pkt['record'])
+        if received:
+            rx['packet'].append(positions[id(packet)])
+            rx['record'].append(r)
+        pkt['record'].append(r)
+        pkt['type'].append(packet.type)
+        pkt['direction'].append(DIRECTIONS.index(packet.direction))
+        pkt['idx'].append(packet.idx)
+        pkt['ts'].append(packet.ts)
+        pkt['aa'].append(packet.aa)
+        pkt['channel_num'].append(packet.channel_num)
+        pkt['phy'].append(PHYS.index(packet.phy) if packet.phy in PHYS else 0)
+        pkt['data_offset'].append(rec['offset'][r] + _data_offset(packet.type, record.packet))
+        pkt['data_length'].append(len(packet.data))
+        superior = packet.payload.get('SuperiorPackets', []) if packet.type in ADV_TYPES and isinstance(packet.payload, dict) else []
+        pkt['superior_start'].append(len(superiors))
+        pkt['superior_count'].append(len(superior))
+        superiors += [positions[id(superior_packet)] for superior_packet in superior]
+
+    os.makedirs(folder, exist_ok=True)
+    for prefix, columns, values in (('rec', REC_COLUMNS, rec), ('pkt', PKT_COLUMNS, pkt), ('rx', RX_COLUMNS, rx)):
+        for column, dtype in columns:
+            np.save(os.path.join(folder, '%s_%s.npy' % (prefix, column)), np.array(values[column], dtype=dtype))
+    np.save(os.path.join(folder, 'pkt_superiors.npy'), np.array(superiors, dtype=np.int64))
+    np.save(os.path.join(folder, 'rec_data.npy'), np.frombuffer(bytes(data), dtype=np.uint8))
+    return len(pkt['record'])
+
+"""
+    Load the columns of the cache folder <folder>, as a dictionary of (memory mapped) arrays keyed on
+    the file names without extension (e.g. 'pkt_ts')
+"""
+def load_columns(folder, mmap_mode='r'):
+    columns = {}
+    for file_name in os.listdir(folder):
+        if file_name.endswith('.npy'):
+            columns[file_name[:-4]] = np.load(os.path.join(folder, file_name), mmap_mode=mmap_mode)
+    return columns
+
+class _StoredSuperiors:
+    # Stands in for the AuxPtr index of the parser, with the superior packets found when the cache was written
+    def __init__(self, packets):
+        self.packets = packets
+
+    def find(self, ts, channel_num, phy):
+        return self.packets
+
+class StoredDumps:
+    """
+        Stands in for SortedDumps, handing parsed packets to Packets (once)
+    """
+    def __init__(self, packets):
+        self.packets = packets
+
+    def flush(self):
+        pass
+
+    def fetch(self):
+        packets, self.packets = self.packets, []
+        return iter(packets)
+
+"""
+    Rebuild the Packets of a cache folder written by export_dumps(); <retention> as for Packets
+"""
+def load_packets(folder, retention=None):
+    c = {name: column.tolist() for name, column in load_columns(folder).items() if name != 'rec_data'}
+    data = memoryview(np.load(os.path.join(folder, 'rec_data.npy'), mmap_mode='r'))
+    rec_offset, rec_length = c['rec_offset'], c['rec_length']
+
+    def pdu(r):
+        return data[rec_offset[r]:rec_offset[r] + rec_length[r]]
+
+    packets = []
+    superiors = c['pkt_superiors']
+    for i, (r, packet_type, direction, idx, ts, aa, channel_num, phy, superior_start, superior_count) in enumerate(zip(
+            c['pkt_record'], c['pkt_type'], c['pkt_direction'], c['pkt_idx'], c['pkt_ts'], c['pkt_aa'],
+            c['pkt_channel_num'], c['pkt_phy'], c['pkt_superior_start'], c['pkt_superior_count'])):
+        packet_type = PacketType(packet_type)
+        args = (DIRECTIONS[direction], idx, ts, aa, channel_num, PHYS[phy], pdu(r))
+        if packet_type in ADV_TYPES:
+            superior = [packets[j] for j in superiors[superior_start:superior_start + superior_count]]
+            packet = parse_adv_pdu(*args, _StoredSuperiors(superior))
+        elif packet_type in DATA_TYPES:
+            packet = parse_data_pdu(*args)
+        else:
+            packet = parse_isoc_pdu(*args)
+        if packet is None or packet.type != packet_type:
+            raise Exception("Dump cache %s is inconsistent (packet %i)" % (folder, i))
+        packets.append(packet)
+
+    for i, r in zip(c['rx_packet'], c['rx_record']):
+        packets[i].rx.append(DeviceDumpFileRx.Rx(c['rec_idx'][r], c['rec_ts'][r], c['rec_aa'][r], c['rec_freq'][r],
+                                                 c['rec_mod'][r], c['rec_status'][r], c['rec_biterrors'][r], pdu(r)))
+
+    return Packets(StoredDumps(packets), retention)
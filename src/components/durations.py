@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 Oticon A/S
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+    Historical test durations, kept in a json file, and the scheduling which can
+    be done with them (longest-first ordering, balancing shards, fitting a time budget).
+
+    For each test the file holds the average wall-clock duration (seconds), the
+    average simulated duration (microseconds), the number of runs and the last result.
+
+    The file changes after every run, so EDTTs which must agree on a schedule (the
+    shards of a run) take it from a snapshot of the file instead (see snapshot()).
+"""
+
+import fcntl
+import json
+import os
+
+class TestDurations:
+    """
+        Constructor:
+            file_name - json file with the durations (it does not need to exist yet)
+    """
+    def __init__(self, file_name):
+        self.file_name = file_name
+        self.tests = self.__load()
+        self.new = {}
+
+    def __load(self):
+        try:
+            with open(self.file_name, "r") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+
+    """
+        Record one run of test <name>; <wall> in seconds, <sim> in microseconds
+    """
+    def record(self, name, wall, sim, result):
+        self.new.setdefault(name, []).append((wall, sim, result))
+        self.__add(self.tests, name, wall, sim, result)
+
+    @staticmethod
+    def __add(tests, name, wall, sim, result):
+        entry = tests.setdefault(name, {"wall": 0.0, "sim": 0, "runs": 0, "result": None})
+        runs = entry["runs"]
+        entry["wall"] = (entry["wall"]*runs + wall)/(runs + 1)
+        entry["sim"] = (entry["sim"]*runs + sim)/(runs + 1)
+        entry["runs"] = runs + 1
+        entry["result"] = result
+
+    """
+        Store the recorded runs. The file is re-read under a lock first, so several
+        EDTTs (e.g. shards) can share it
+    """
+    def save(self):
+        with open(self.file_name + ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            tests = self.__load()
+            for name, runs in self.new.items():
+                for wall, sim, result in runs:
+                    self.__add(tests, name, wall, sim, result)
+            tmp_name = self.file_name + ".tmp"
+            with open(tmp_name, "w") as file:
+                json.dump(tests, file, indent=1, sort_keys=True)
+            os.replace(tmp_name, self.file_name)
+        self.tests = tests
+        self.new = {}
+
+    """
+        Expected wall-clock duration of test <name> (seconds). Tests never run before
+        are assumed to take as long as the average test
+    """
+    def estimate(self, name):
+        if name in self.tests:
+            return self.tests[name]["wall"]
+        if not self.tests:
+            return 1.0
+        return sum(entry["wall"] for entry in self.tests.values())/len(self.tests)
+
+    def last_result(self, name):
+        return self.tests[name]["result"] if name in self.tests else None
+
+    """
+        Store the durations as they are now in <file_name>, a file in the same format which
+        can be loaded with TestDurations and does not change when tests are run
+    """
+    def snapshot(self, file_name):
+        tmp_name = file_name + ".tmp"
+        with open(tmp_name, "w") as file:
+            json.dump(self.tests, file, indent=1, sort_keys=True)
+        os.replace(tmp_name, file_name)
+
+"""
+    Order <names> by decreasing expected duration (ties keep their order)
+"""
+def longest_first(names, durations):
+    return sorted(names, key=lambda name: -durations.estimate(name))
+
+"""
+    Split <names> in <shards> of similar expected duration (longest processing time first),
+    and return the ones of shard <shard>, in their original order
+"""
+def shard_by_duration(names, durations, shards, shard):
+    loads = [0.0]*shards
+    assigned = {}
+    for position in sorted(range(len(names)), key=lambda i: -durations.estimate(names[i])):
+        target = loads.index(min(loads))
+        loads[target] += durations.estimate(names[position])
+        assigned[position] = target
+    return [name for i, name in enumerate(names) if assigned[i] == shard]
+
+"""
+    Select from <names> the tests which fit in <budget> seconds, in their original order.
+    Tests which failed in their last run come first, then those without history, and then
+    as many of the rest as possible (shortest first)
+"""
+def select_budget(names, durations, budget):
+    def value(i):
+        result = durations.last_result(names[i])
+        return (0 if result == "FAILED" else 1 if result is None else 2, durations.estimate(names[i]))
+
+    selected = set()
+    used = 0.0
+    for i in sorted(range(len(names)), key=value):
+        estimate = durations.estimate(names[i])
+        if used + estimate <= budget:
+            selected.add(i)
+            used += estimate
+    return [name for i, name in enumerate(names) if i in selected]
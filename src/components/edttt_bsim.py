@@ -6,8 +6,14 @@
 #   __init__(args)
 #   connect()
 #   send(idx, message)
+#   send_many(idx, messages) (optional)
 #   recv(idx, number_bytes, timeout)
+#   recv_into(idx, buffer, number_bytes, timeout) (optional)
+#   recv_frame(idx, timeout, payload_len) (optional)
+#   select(idxs, number_bytes, timeout) (optional)
+#   recv_any(idxs, number_bytes, timeout) (optional)
 #   wait(time)
+#   commit_time() (optional)
 #   close()
 #   get_time()
 #   n_devices : Number of devices it is connected to
@@ -19,6 +25,71 @@ import fcntl;
 from components.bsim_device import BSimDevice
 from components.bsim_lib import ( PB_MSG_DISCONNECT, PB_MSG_TERMINATE, PB_MSG_WAIT, PB_MSG_WAIT_END, TIME_NEVER, create_com_folder, create_fifo_if_not_there, test_and_create_lock_file);
 
+class RxBuffer:
+    """
+        Reusable receive buffer for one device.
+        Data is read into the free space after its end and consumed from its start,
+        so no new objects are allocated per read
+    """
+    def __init__(self, size=4096):
+        self.buffer = bytearray(size)
+        self.start = 0
+        self.end = 0
+
+    def __len__(self):
+        return self.end - self.start
+
+    def __reserve(self, nbytes):
+        # Make room for nbytes after the end of the data
+        if self.end + nbytes <= len(self.buffer):
+            return
+        used = self.end - self.start
+        if self.start > 0:
+            self.buffer[0:used] = self.buffer[self.start:self.end]
+            self.start = 0
+            self.end = used
+        if used + nbytes > len(self.buffer):
+            self.buffer.extend(bytes(max(used + nbytes, 2*len(self.buffer)) - len(self.buffer)))
+
+    def fill(self, fd, nbytes):
+        # Read (as the file descriptor allows) up to nbytes from fd; Returns the number of bytes read
+        self.__reserve(nbytes)
+        view = memoryview(self.buffer)[self.end:self.end + nbytes]
+        try:
+            nread = os.readv(fd, [view])
+        finally:
+            view.release()
+        self.end += nread
+        return nread
+
+    def peek(self, fmt, offset=0):
+        # Unpack (without consuming) the data at offset according to the struct format fmt
+        return struct.unpack_from(fmt, self.buffer, self.start + offset)
+
+    def take_into(self, dest, nbytes):
+        # Move the first nbytes of data into the writable buffer dest
+        view = memoryview(self.buffer)[self.start:self.start + nbytes]
+        try:
+            dest[:nbytes] = view
+        finally:
+            view.release()
+        self.consume(nbytes)
+
+    def take(self, nbytes):
+        # Remove and return the first nbytes of data
+        view = memoryview(self.buffer)[self.start:self.start + nbytes]
+        try:
+            packet = bytes(view)
+        finally:
+            view.release()
+        self.consume(nbytes)
+        return packet
+
+    def consume(self, nbytes):
+        self.start += nbytes
+        if self.start >= self.end:
+            self.start = self.end = 0
+
 class EDTTT:
     TO_EDTT  = 0;
     TO_DEVICE = 1;
@@ -27,8 +98,11 @@ class EDTTT:
     PhyFIFO_names = ["",""];
     FIFOs = [];
     FIFOnames = [];
+    RxBuffers = []; #RxBuffer with the data already read from each device but not yet received
     verbosity = 0;
-    last_t =  0; #last timestamp received from the Phy
+    last_t =  0; #current simulation time, as seen by the EDTT
+    phy_t = 0; #last time the Phy was told to wait until (lags behind last_t in lazy wait mode)
+    lazy_wait = False
     Connected = False;
     n_devices = 0;
     low_level_device = None
@@ -36,6 +110,8 @@ class EDTTT:
     lock_path = ""
     autoterminate = True
     RxWait = 10000
+    RxWaitMin = 10000
+    RxReadAhead = 4096 #bytes attempted to be read from a device at once, even if less are needed right now
 
     def __init__(self, pending_args, TraceClass):
         self.Trace = TraceClass;
@@ -46,6 +122,8 @@ class EDTTT:
         parser.add_argument("-D", "--number-of-devices", required=True, type=int, help="Number of simulated devices we will connect to (the low level device does not count)");
         parser.add_argument("-devs", "--devices-numbers", required=True, type=int, nargs='+', help="Set of simulated devices we will connect to. There should <number-of-devices> in this list, where the first one will be the \"device 0\" for EDTT and so forth");
         parser.add_argument("-RxWait", required=False, default=10000, type=float, help="(10e3) while there is no enough data for a read, the simulation will be advanced in this steps");
+        parser.add_argument("-RxWaitMin", required=False, type=float, help="(RxWait) if set lower than RxWait, reads advance the simulation adaptively: starting with steps of RxWaitMin, doubling them while no data arrives, up to RxWait");
+        parser.add_argument("-LazyWait", required=False, action='store_true', help="Do not let the simulation advance on each wait, but only when needed for the next interaction with the devices (consecutive waits are merged into one)");
         parser.add_argument("-l", "--low-level-device", required=False, help="Enable BSim low level device; Note that this requires --low-level-device-nbr to be supplied", action='store_true');
         parser.add_argument("--low-level-device-nbr", required=False, type=int, help="Device number of the BSim low level device");
         parser.add_argument("--DontAutoTerminate", required=False, action='store_true', help="Do not terminate simulation when the test ends (by default it will)");
@@ -56,6 +134,10 @@ class EDTTT:
         self.n_devices = args.number_of_devices;
         self.devices_numbers = args.devices_numbers;
         self.RxWait = int(args.RxWait)
+        self.RxWaitMin = self.RxWait if args.RxWaitMin == None else min(int(args.RxWaitMin), self.RxWait)
+        if self.RxWaitMin <= 0:
+            raise Exception("-RxWaitMin must be a positive number of microseconds")
+        self.lazy_wait = args.LazyWait
 
         if args.low_level_device:
             if not args.low_level_device_nbr:
@@ -70,12 +152,13 @@ class EDTTT:
         
         self.FIFOs = [[-1, -1] for i in range(0,args.number_of_devices)];
         self.FIFOnames = [["", ""] for i in range(0,args.number_of_devices)];
+        self.RxBuffers = [RxBuffer() for i in range(0,args.number_of_devices)];
         
         if args.DontAutoTerminate:
             self.autoterminate = false
 
     def connect(self):
-        self.Trace.trace(3,"Connecting to EDTT Phy and devices");
+        self.Trace.trace(3, "Connecting to EDTT Phy and devices", subsystem='transport');
         self.com_path = create_com_folder(self.sim_id);
         self.lock_path = test_and_create_lock_file(self.com_path, self.EDTT_tool_dev_nbr, self.Trace)
 
@@ -101,16 +184,16 @@ class EDTTT:
             self.cleanup()
             raise
 
-        self.Trace.trace(6,"Connected to Phy");
+        self.Trace.trace(6, "Connected to Phy", subsystem='transport');
 
         if self.low_level_device:
             self.low_level_device.connect()
-            self.Trace.trace(8,"Low level device connected to Phy");
+            self.Trace.trace(8, "Low level device connected to Phy", subsystem='transport');
         
         try:
             for i in range(0, self.n_devices):
                 d = self.devices_numbers[i];
-                self.Trace.trace(8,"Connecting to device %i"%d);
+                self.Trace.trace(8, "Connecting to device %i", d, subsystem='transport');
                 self.FIFOnames[i][self.TO_DEVICE] = "%s/Device%i.PTTin" % (self.com_path, d)
                 self.FIFOnames[i][self.TO_EDTT]   = "%s/Device%i.PTTout" % (self.com_path, d)
                 #Long ago the EDTT was called PTT. The FIFOs were never renamed as it would be a backwards compatibility change.
@@ -139,19 +222,20 @@ class EDTTT:
                 flags |= os.O_NONBLOCK;
                 fcntl.fcntl(self.FIFOs[i][self.TO_DEVICE], fcntl.F_SETFL, flags);
 
-                self.Trace.trace(8,"Connected to device %i"%d);
+                self.Trace.trace(8, "Connected to device %i", d, subsystem='transport');
         except:
             self.cleanup()
             raise
 
         self.Connected = True;
-        self.Trace.trace(4,"Connected to Phy and all devices");
+        self.Trace.trace(4, "Connected to Phy and all devices", subsystem='transport');
 
         # Wait for dump files to have been opened by the 2G4 phy
         # Since there isn't a method implemented for synchronizing that, use the
         # fact that any commands to the 2G4 phy will not run until after it has
         #opened the files for writing; So use a minimal wait as a blocking mechanism
         self.wait_until_t(1)
+        self.commit_time()
 
     def cleanup(self):
         if self.lock_path:
@@ -162,54 +246,57 @@ class EDTTT:
             self.lock_path = ""
 
         if self.low_level_device:
-            self.Trace.trace(4,"Cleaning up low-level device");
+            self.Trace.trace(4, "Cleaning up low-level device", subsystem='transport');
             self.low_level_device.cleanup()
 
-        self.Trace.trace(4,"Cleaning up transport");
+        self.Trace.trace(4, "Cleaning up transport", subsystem='transport');
         try:
             if self.PhyFIFOs[self.TO_EDTT]:
                 os.close(self.PhyFIFOs[self.TO_EDTT]);
                 self.PhyFIFOs[self.TO_EDTT] = 0
-                self.Trace.trace(9,"Closed FIFO to Phy (->EDTT direction)");
+                self.Trace.trace(9, "Closed FIFO to Phy (->EDTT direction)", subsystem='transport');
             if self.PhyFIFOs[self.TO_PHY]:
                 os.close(self.PhyFIFOs[self.TO_PHY]);
                 self.PhyFIFOs[self.TO_PHY] = 0
-                self.Trace.trace(9,"Closed FIFO to Phy (->Phy direction)");
+                self.Trace.trace(9, "Closed FIFO to Phy (->Phy direction)", subsystem='transport');
             os.remove(self.PhyFIFO_names[self.TO_PHY]);
             os.remove(self.PhyFIFO_names[self.TO_EDTT]);
 
             for i in range(0, self.n_devices):
-                self.Trace.trace(9,"Cleaning up interface to Device %i"%i);
+                self.Trace.trace(9, "Cleaning up interface to Device %i", i, subsystem='transport');
                 if self.FIFOs[i][self.TO_EDTT]:
                     os.close(self.FIFOs[i][self.TO_EDTT]);
                     self.FIFOs[i][self.TO_EDTT] = 0
-                    self.Trace.trace(9,"Closed FIFO to Device %i (->EDTT direction)"%i);
+                    self.Trace.trace(9, "Closed FIFO to Device %i (->EDTT direction)", i, subsystem='transport');
                 if self.FIFOs[i][self.TO_DEVICE]:
                     os.close(self.FIFOs[i][self.TO_DEVICE]);
                     self.FIFOs[i][self.TO_DEVICE] = 0
-                    self.Trace.trace(9,"Closed FIFO to Device %i (->Device direction)"%i);
+                    self.Trace.trace(9, "Closed FIFO to Device %i (->Device direction)", i, subsystem='transport');
                 os.remove(self.FIFOnames[i][self.TO_DEVICE]);
                 os.remove(self.FIFOnames[i][self.TO_EDTT]);
         except OSError:
-            self.Trace.trace(9,"(minor) Error closing FIFO "
-                             "(most likely either file does not exist yet)");
+            self.Trace.trace(9, "(minor) Error closing FIFO "
+                             "(most likely either file does not exist yet)", subsystem='transport');
 
     def __disconnect(self):
         if self.Connected:
             self.Connected = False
             if self.autoterminate:
                 msg = struct.pack('=I', PB_MSG_TERMINATE)
-                self.Trace.trace(4,"Terminating simulation")
+                self.Trace.trace(4, "Terminating simulation", subsystem='transport')
             else:
                 msg = struct.pack('=I', PB_MSG_DISCONNECT)
-                self.Trace.trace(4,"Disconnecting from Phy")
+                self.Trace.trace(4, "Disconnecting from Phy", subsystem='transport')
             self.__write_to_phy(msg);
         if self.low_level_device:
             self.low_level_device.disconnect()
 
     def close(self):
-        self.__disconnect();
-        self.cleanup();
+        try:
+            self.commit_time();
+        finally:
+            self.__disconnect();
+            self.cleanup();
 
     def __write_to_device(self, d, content):
         # Write content to device d
@@ -218,27 +305,28 @@ class EDTTT:
             if written != len(content):
                 raise;
         except:
-            self.Trace.trace(4,"The Device %i disappeared when trying to "
-                             "write to it"%d);
+            self.Trace.trace(4, "The Device %i disappeared when trying to "
+                             "write to it", d, subsystem='transport');
             self.close();
             raise Exception("Abruptly disconnected from device %i"%d);
 
     def __read_from_device(self, d, nbytes):
-        # Atttempt a non-blocking read of nbytes from device d
-        pkt=b""
+        # Atttempt a non-blocking read of up to nbytes from device d into its Rx buffer
+        # Returns the number of bytes read
+        self.commit_time()
+        nread = 0
         try:
-            pkt = os.read(self.FIFOs[d][self.TO_EDTT], nbytes);
+            nread = self.RxBuffers[d].fill(self.FIFOs[d][self.TO_EDTT], nbytes);
         except BlockingIOError:
-            #No enough data available yet, we just return an empty packet
-            #or whatever we got so far
+            #No data available yet
             pass
         except:
-            self.Trace.trace(4,"The Device %i disappeared when trying to "
-                             "read from it"%d);
+            self.Trace.trace(4, "The Device %i disappeared when trying to "
+                             "read from it", d, subsystem='transport');
             self.close();
             raise Exception("Abruptly disconnected from device %i"%d);
 
-        return pkt;
+        return nread;
 
     def __write_to_phy(self,  content):
         # Write content to the Phy
@@ -247,8 +335,8 @@ class EDTTT:
             if written != len(content):
                 raise;
         except:
-            self.Trace.trace(4,"The Phy disappeared when trying to "
-                             "write to it");
+            self.Trace.trace(4, "The Phy disappeared when trying to "
+                             "write to it", subsystem='transport');
             self.Connected = False
             self.close();
             raise Exception("Abruptly disconnected from Phy");
@@ -262,8 +350,8 @@ class EDTTT:
                 raise;
             return pkt;
         except:
-            self.Trace.trace(4,"The Phy disappeared when trying to "
-                             "read from it");
+            self.Trace.trace(4, "The Phy disappeared when trying to "
+                             "read from it", subsystem='transport');
             self.Connected = False
             self.close();
             raise Exception("Abruptly disconnected from Phy");
@@ -273,49 +361,159 @@ class EDTTT:
         if (idx > self.n_devices -1):
             raise Exception("Trying to access unconnected device %i"%idx);
 
-        self.Trace.trace(8,"Writing %i bytes to device %i"%(len(message),idx));
+        self.Trace.trace(8, "Writing %i bytes to device %i", len(message), idx, subsystem='transport');
+        self.commit_time()
         self.__write_to_device(idx,message)
         # a send is immediate (no time advance)
         self.Trace.btsnoop.send(idx, message)
 
-    def recv(self, idx, number_bytes, to=None):
-        #Attempt to receive <number_bytes> from device <idx>, with a timeout of <to> ms
+    def send_many(self, idx, messages):
+        #Send all <messages> to device <idx> with a single write
+        if (idx > self.n_devices -1):
+            raise Exception("Trying to access unconnected device %i"%idx);
+
+        content = b"".join(messages)
+        self.Trace.trace(8, "Writing %i messages (%i bytes) to device %i", len(messages), len(content), idx, subsystem='transport');
+        self.commit_time()
+        self.__write_to_device(idx,content)
+        for message in messages:
+            self.Trace.btsnoop.send(idx, message)
+
+    def __fill_rx_buffer(self, d, nbytes):
+        # Attempt a non-blocking read from device d until its Rx buffer holds nbytes
+        # Whatever else the device already produced is read ahead as well (up to RxReadAhead)
+        # Returns the number of new bytes read
+        pending_to_read = nbytes - len(self.RxBuffers[d])
+        if pending_to_read <= 0:
+            return 0
+        return self.__read_from_device(d, max(pending_to_read, self.RxReadAhead))
+
+    def __wait_for_rx(self, idx, number_bytes, timeout):
+        # Let time advance until the Rx buffer of device <idx> holds <number_bytes>, or the simulation reaches <timeout> (us)
+        # Returns how many of those bytes are available
+        rx_buffer = self.RxBuffers[idx]
+        rx_wait = self.RxWaitMin
+        # Let's try to read from the device. We will either manage right away
+        # (possibly because the data was already read ahead)
+        # or we will need to let time advance while we keep retrying
+        while len(rx_buffer) < number_bytes:
+            nread = self.__fill_rx_buffer(idx, number_bytes)
+            pending_to_read = number_bytes - len(rx_buffer)
+            if pending_to_read <= 0 or self.last_t >= timeout:
+                break
+            #we need to wait a bit
+            if nread > 0:
+                # The device is producing data, go back to the smallest step
+                rx_wait = self.RxWaitMin
+            self.Trace.trace(6, "During recv of %iB from dev %d, pending %i, Waiting for %s us",
+                             number_bytes, idx, pending_to_read, rx_wait, subsystem='transport')
+            self.wait(rx_wait/1000)
+            # Back off exponentially (up to RxWait) while the device stays silent
+            rx_wait = min(rx_wait*2, self.RxWait)
+
+        received = min(len(rx_buffer), number_bytes)
+        if received != number_bytes:
+            self.Trace.trace(2, "Attempt to recv from dev %d, but only read %i out of %i bytes", idx, received, number_bytes, subsystem='transport')
+        else:
+            self.Trace.trace(8, "Attempt to recv from dev %d, read all %i bytes", idx, number_bytes, subsystem='transport')
+
+        return received
+
+    def __recv_timeout(self, idx, to):
         if (idx > self.n_devices -1):
             raise Exception("Trying to access unconnected device %i"%idx);
 
         if to == None:
             to = self.default_to
+
+        return to*1000 + self.last_t;
+
+    def recv(self, idx, number_bytes, to=None):
+        #Attempt to receive <number_bytes> from device <idx>, with a timeout of <to> ms
+        timeout = self.__recv_timeout(idx, to)
         if ( number_bytes == 0 ):
           return b""
 
-        timeout = to*1000 + self.last_t;
-        
-        self.Trace.trace(8, "Recv of %iB from dev %d, timeout %i ms"% (number_bytes, idx, to) )
+        self.Trace.trace(8, "Recv of %iB from dev %d, timeout %i ms", number_bytes, idx, (timeout - self.last_t)/1000, subsystem='transport')
 
-        # Let's try to read from the device. We will either manage right away
-        # or we will need to let time advance while we keep retrying
-        pending_to_read = number_bytes
-        readsofar = 0
-        packet = b""
-        while self.last_t < timeout:
-            segment = self.__read_from_device(idx, pending_to_read)
-            packet += segment
-            nread = len(segment)
-            readsofar += nread
-            pending_to_read -= nread;
-            if pending_to_read > 0: #we need to wait a bit
-                self.Trace.trace(6, "During recv of %iB from dev %d, pending %i, Waiting for %s us"%
-                                  (number_bytes, idx, pending_to_read, str(self.RxWait)) )
-                self.wait(self.RxWait/1000)
-            else:
-                break 
+        received = self.__wait_for_rx(idx, number_bytes, timeout)
+        return self.RxBuffers[idx].take(received)
 
-        if pending_to_read != 0:
-            self.Trace.trace(2, "Attempt to recv from dev %d, but only read %i out of %i bytes"%(idx, readsofar, number_bytes))
-        else:
-            self.Trace.trace(8, "Attempt to recv from dev %d, read all %i bytes"%(idx, number_bytes))
+    def recv_into(self, idx, buffer, number_bytes=None, to=None):
+        #Attempt to receive <number_bytes> (by default len(<buffer>)) from device <idx> directly into
+        #the writable <buffer> (e.g. a bytearray or a memoryview of one), with a timeout of <to> ms
+        #Returns the number of bytes received
+        timeout = self.__recv_timeout(idx, to)
+        if number_bytes == None:
+            number_bytes = len(buffer)
+        if ( number_bytes == 0 ):
+          return 0
+
+        self.Trace.trace(8, "Recv of %iB from dev %d, timeout %i ms", number_bytes, idx, (timeout - self.last_t)/1000, subsystem='transport')
+
+        received = self.__wait_for_rx(idx, number_bytes, timeout)
+        self.RxBuffers[idx].take_into(buffer, received)
+        return received
+
+    def recv_frame(self, idx, to=None, payload_len=None):
+        #Attempt to receive a complete EDTT frame (<HH header: opcode, payload length; followed by the payload)
+        #from device <idx>, with a timeout of <to> ms
+        #If <payload_len> is given and the length field of the frame differs from it, only the header is received
+        #Returns the frame, or as much as was received of it on timeout
+        timeout = self.__recv_timeout(idx, to)
+
+        self.Trace.trace(8, "Recv of frame from dev %d, timeout %i ms", idx, (timeout - self.last_t)/1000, subsystem='transport')
+
+        received = self.__wait_for_rx(idx, 4, timeout)
+        if received == 4:
+            _, length = self.RxBuffers[idx].peek('<HH')
+            if payload_len is None or length == payload_len:
+                received = self.__wait_for_rx(idx, 4 + length, timeout)
+        return self.RxBuffers[idx].take(received)
+
+    def select(self, idxs, number_bytes, to=None):
+        #Wait until at least one of the devices in <idxs> has <number_bytes> ready to be received, with a timeout of <to> ms
+        #Returns the list of devices which are ready (empty on timeout). The data is kept for the following recv() calls
+        idxs = list(idxs)
+        for idx in idxs:
+            if (idx > self.n_devices -1):
+                raise Exception("Trying to access unconnected device %i"%idx);
 
-        return packet
+        if to == None:
+            to = self.default_to
+
+        timeout = to*1000 + self.last_t;
+
+        self.Trace.trace(8, "Select of %iB from devs %s, timeout %i ms", number_bytes, idxs, to, subsystem='transport')
+
+        # All devices are polled after each step, so the Phy is advanced once for all of them
+        rx_wait = self.RxWaitMin
+        while True:
+            nread = 0
+            for idx in idxs:
+                nread += self.__fill_rx_buffer(idx, number_bytes)
+            ready = [idx for idx in idxs if len(self.RxBuffers[idx]) >= number_bytes]
+            if ready or self.last_t >= timeout:
+                break
+            if nread > 0:
+                rx_wait = self.RxWaitMin
+            self.Trace.trace(6, "During select of %iB from devs %s, Waiting for %s us",
+                             number_bytes, idxs, rx_wait, subsystem='transport')
+            self.wait(rx_wait/1000)
+            rx_wait = min(rx_wait*2, self.RxWait)
+
+        if not ready:
+            self.Trace.trace(2, "Attempt to select on devs %s, but none had %i bytes ready", idxs, number_bytes, subsystem='transport')
+
+        return ready
+
+    def recv_any(self, idxs, number_bytes, to=None):
+        #Attempt to receive <number_bytes> from whichever device in <idxs> produces them first, with a timeout of <to> ms
+        #Returns a tuple (idx, packet); (None, b"") on timeout
+        ready = self.select(idxs, number_bytes, to)
+        if not ready:
+            return None, b""
+        return ready[0], self.recv(ready[0], number_bytes, 0)
 
     def wait(self, delay_in_ms):
         end_of_wait = int(delay_in_ms*1000 + self.last_t);
@@ -323,10 +521,24 @@ class EDTTT:
 
     def wait_until_t(self, end_of_wait):
         if self.last_t >= end_of_wait:
-            self.Trace.trace(3, "Ignoring end_of_wait with a time not in the future: simulation time: %s; Requested end of wait: %s" % (self.last_t, end_of_wait))
+            self.Trace.trace(3, "Ignoring end_of_wait with a time not in the future: simulation time: %s; Requested end of wait: %s", self.last_t, end_of_wait, subsystem='transport')
             return
 
-        self.Trace.trace(8, "Waiting until %d"%end_of_wait)
+        if self.lazy_wait:
+            # The Phy will be told when the devices are next interacted with (see commit_time())
+            self.Trace.trace(8, "Deferring wait until %d", end_of_wait, subsystem='transport')
+            self.last_t = end_of_wait
+            return
+
+        self.__phy_wait(end_of_wait)
+
+    def commit_time(self):
+        # Let the simulation catch up with any deferred (lazy) wait
+        if self.phy_t < self.last_t:
+            self.__phy_wait(self.last_t)
+
+    def __phy_wait(self, end_of_wait):
+        self.Trace.trace(8, "Waiting until %d", end_of_wait, subsystem='transport')
 
         if self.low_level_device:
             self.low_level_device.wait(end_of_wait)
@@ -344,13 +556,14 @@ class EDTTT:
 
             header, = struct.unpack("=I", raw_header)
             if header == PB_MSG_DISCONNECT:
-                self.Trace.trace(2, "Phy told us to disconnect")
+                self.Trace.trace(2, "Phy told us to disconnect", subsystem='transport')
                 self.Connected = False
                 self.__disconnect()
                 raise Exception("Simulated terminated by the Phy")
             elif header != PB_MSG_WAIT_END:
                 raise Exception("Low level communication with PHY failed; Received invalid response %s" % header)
 
+        self.phy_t = end_of_wait
         self.last_t = end_of_wait
 
     def get_time(self):
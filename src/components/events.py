@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import functools;
 import struct;
 from enum import IntEnum;
 from components.address import *;
@@ -200,6 +201,191 @@ class ErrorCodes(IntEnum):
     BT_HCI_ERR_BAD_ENC_KEY_SIZE             = 0x28
 
 
+class EventCheck:
+    """
+        Validity of a field of an event: the field is valid when it is in [<low>, <high>] (None for no limit) or,
+        when <legal> is given, when it is one of the <legal> values. An invalid field adds <error> to the errors of the event.
+        The valid values are kept as a range or a set (values), so a field is checked with a single 'in'.
+
+        Constructor:
+            error     - Error code (ErrorCodes)
+            low, high - Limits of the valid values
+            legal     - Valid values (instead of limits)
+            ifSuccess - Only check the field when the event reports success (its first field, the status, is 0)
+    """
+    def __init__(self, error, low=None, high=None, legal=None, ifSuccess=False):
+        self.error = error;
+        self.low = low;
+        self.high = high;
+        self.legal = None if legal is None else frozenset(legal);
+        self.ifSuccess = ifSuccess;
+        if self.legal is None:
+            # Event fields are at most 64 bits
+            self.values = range(-(1 << 64) if low is None else low, (1 << 64 if high is None else high) + 1);
+        else:
+            self.values = self.legal;
+
+    """
+        The same check with other limits or legal values
+    """
+    def limits(self, low, high):
+        return EventCheck(self.error, low, high, None, self.ifSuccess);
+
+    def legalValues(self, legal):
+        return EventCheck(self.error, None, None, legal, self.ifSuccess);
+
+    """
+        The same check, only done when the event reports success
+    """
+    def onSuccess(self):
+        return EventCheck(self.error, self.low, self.high, self.legal, True);
+
+_CONNECTION_HANDLE    = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_CONN_HANDLE, 0, 0xEFF);
+_ENCRYPTION_ENABLED   = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_ENCRYPT_ENABLED, 0, 2);
+_ENCRYPTION_KEY_SIZE  = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_ENC_KEY_SIZE, 0x01, 0x10);
+_TX_POWER_LEVEL       = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_TX_POWER_LEVEL, -30, 20);
+_LE_SUPPORTED_HOST    = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_LE_SUPPORTED_HOST, 0, 1);
+_LE_SIMULTANEOUS_HOST = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_LE_SIMULTANEOUS_HOST, 0, 0);
+_PAYLOAD_TIMEOUT      = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_PAYLOAD_TIMEOUT, 1);
+_RSSI                 = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_RSSI_VALUE, legal=list(range(-127, 21)) + [127]);
+_ADV_TX_POWER_LEVEL   = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_ADV_TX_POWER_LEVEL, -20, 10);
+_LIST_SIZE            = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_LIST_SIZE, 1);
+_MAX_DATA_OCTETS      = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_MAX_DATA_OCTETS, 0x001B, 0x00FB);
+_MAX_DATA_TIME        = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_MAX_DATA_TRANSMIT_TIME, 0x0148, 0x4290);
+_CHANNEL_MAP          = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_CHANNEL_MAP, None, 0x1FFFFFFFFF);
+_PHY                  = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_PHY_CHANNEL, legal=[1,2,3]);
+_SELECTED_TX_POWER    = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_SELECTED_TX_POWER, -127, 126);
+_MAX_ADV_DATA_LENGTH  = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_MAX_DATA_LENGTH, 0x001F, 0x0672);
+_SUPPORTED_ADV_SETS   = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_SUPPORTED_ADV_SETS, 1, 240);
+_RF_COMPENSATION      = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_RF_COMPENSATION_VALUE, -1280, 1280);
+_LINK_TYPE            = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_LINK_TYPE, 0, 1);
+_CONNECTION_INTERVAL  = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_CONNECTION_INTERVAL, 0x0006, 0x0C80);
+_CONNECTION_LATENCY   = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_CONNECTION_LATENCY, 0x0000, 0x01F3);
+_SUPERVISION_TIMEOUT  = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_SUPERVISION_TIMEOUT, 0x000A, 0x0C80);
+_CLOCK_ACCURACY       = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_CENTRAL_CLOCK_ACCURACY, 0, 7);
+_CONNECTION_ROLE      = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_CONNECTION_ROLE, 0, 1);
+_ADDRESS_TYPE         = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_ADDRESS_TYPE, legal=[0,1,2,3]);
+_ADV_EVENT            = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_ADV_REPORT_EVENT, 0, 4);
+_ADV_DATA_LENGTH      = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_ADV_DATA_LENGTH, 0, 31);
+_SID                  = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_ADV_SID, legal=range(16));
+_SYNC_HANDLE          = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_SYNC_HANDLE, 0, 0xEFF);
+_PERIODIC_ADV_INTERVAL= EventCheck(ErrorCodes.BT_HCI_ERR_BAD_PERIODIC_ADV_INTERVAL, 6);
+_ADV_DATA_STATUS      = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_ADV_DATA_STATUS, 0, 2);
+_ADVERTISING_HANDLE   = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_ADVERTISING_HANDLE, 0, 0xEF);
+_CHANNEL_ALGORITHM    = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_CHANNEL_SEL_ALGORITHM, 0, 1);
+_PEER_CLOCK_ACCURACY  = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_PEER_CLOCK_ACCURACY, 0x00, 0x07);
+_ADVERTISING_REPORTS  = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_NO_ADVERTISING_REPORTS, 1, 25);
+_EXT_ADVERTISING_REPORTS = _ADVERTISING_REPORTS.limits(1, 10);
+_EXT_ADV_EVENT        = _ADV_EVENT.limits(0, 0x7F);
+_EXT_ADDRESS_TYPE     = _ADDRESS_TYPE.legalValues([0,1,2,3,255]);
+_DIRECT_ADDRESS_TYPE  = _ADDRESS_TYPE.legalValues([0,1,2,3,254]);
+_PRIMARY_PHY          = _PHY.legalValues([1,3]);
+_SECONDARY_PHY        = _PHY.legalValues([0,1,2,3]);
+_EXT_SID              = _SID.legalValues(list(range(16)) + [255]);
+_EXT_TX_POWER         = _SELECTED_TX_POWER.limits(-127, 127);
+_EXT_ADV_DATA_LENGTH  = _ADV_DATA_LENGTH.limits(0, 229);
+_PER_ADV_DATA_LENGTH  = _ADV_DATA_LENGTH.limits(0, 248);
+_COMMAND_OPCODE       = EventCheck(ErrorCodes.BT_HCI_ERR_BAD_COMMAND_STATUS_OPCODE, legal=CmdOpcodes._value2member_map_);
+
+class EventLayout:
+    """
+        Declarative decoder of an event (or of the return parameters of a Command Complete Event) made of fixed size fields,
+        compiled once into a struct.Struct.
+
+        Constructor:
+            offset - Offset of the first field in the event data
+            size   - Size of the event data
+            fields - One entry per field: a struct format code ('B', 'H', 'b', ...), '<n>B' for <n> octets (a tuple, e.g. an address),
+                     or '<n>N' for <n> octets forming a little endian number; or a tuple (code, EventCheck) for a checked field
+            build  - Function of the field values returning the decoded values (by default the field values as they are)
+    """
+    def __init__(self, offset, size, fields, build=None):
+        self.offset = offset;
+        self.size = size;
+        self.build = build;
+        self.checks = [];
+        self.converters = [];
+        fmt = '<';
+        for i, field in enumerate(fields):
+            code, check = field if isinstance(field, tuple) else (field, None);
+            if code[-1] in 'BN' and len(code) > 1:
+                fmt += code[:-1] + 's';
+                self.converters.append((i, tuple if code[-1] == 'B' else self.__asNumber));
+            else:
+                fmt += code;
+            if not check is None:
+                self.checks.append((i, check));
+        self.struct = struct.Struct(fmt);
+        self.__zeros = self.unpack(bytes(offset + self.struct.size));
+        self.__octets = tuple(i for i, convert in self.converters if convert is tuple);
+        # The valid values of the checked fields, split on whether they are always checked (see valid())
+        self.__always = tuple((i, check.values) for i, check in self.checks if not check.ifSuccess);
+        self.__onSuccess = tuple((i, check.values) for i, check in self.checks if check.ifSuccess);
+
+    @staticmethod
+    def __asNumber(octets):
+        return int.from_bytes(octets, 'little');
+
+    """
+        Field values of the event data <data> (without checking them)
+    """
+    def unpack(self, data):
+        values = self.struct.unpack_from(data, self.offset);
+        if self.converters:
+            values = list(values);
+            for i, convert in self.converters:
+                values[i] = convert(values[i]);
+            values = tuple(values);
+        return values;
+
+    """
+        Field values given to an event of the wrong size: all zero, the octet fields being new lists
+    """
+    def defaults(self):
+        if not self.__octets:
+            return self.__zeros;
+        values = list(self.__zeros);
+        for i in self.__octets:
+            values[i] = [0] * len(values[i]);
+        return tuple(values);
+
+    """
+        Whether all the checked field <values> are valid
+    """
+    def valid(self, values):
+        for i, valid in self.__always:
+            if not values[i] in valid:
+                return False;
+        if self.__onSuccess and values[0] == 0:
+            for i, valid in self.__onSuccess:
+                if not values[i] in valid:
+                    return False;
+        return True;
+
+"""
+    Cached struct.Struct of <count> little endian uint16 values
+"""
+@functools.lru_cache(maxsize=None)
+def _uint16s(count):
+    return struct.Struct('<%iH' % count);
+
+_COMMAND_COMPLETE_HEADER = struct.Struct('<BHB');
+_ADVERTISING_REPORT      = struct.Struct('<BBB6sB');
+_EXT_ADVERTISING_REPORT  = struct.Struct('<BHB6sBBBbbHB6sB');
+_PER_ADVERTISING_REPORT  = struct.Struct('<HbbBBB');
+_COMPLETED_PACKETS       = struct.Struct('<HH');
+_CONN_PARAM_REQUEST      = struct.Struct('<HHHHH');
+_RSSI_VALUE              = struct.Struct('<b');
+_CIG_PARAMETERS          = struct.Struct('<BB');
+
+# Return parameters shared by several Command Complete Events
+_HANDLE_RESULT      = EventLayout(4, 6, (('H', _CONNECTION_HANDLE),));
+_ADDRESS_RESULT     = EventLayout(4, 10, ('6B',), lambda address: (Address(None, address),));
+_FEATURES_RESULT    = EventLayout(4, 12, ('8B',));
+_LIST_SIZE_RESULT   = EventLayout(4, 5, (('B', _LIST_SIZE),));
+_ISO_COUNTERS_RESULT= EventLayout(4, 18, (('H', _CONNECTION_HANDLE), 'I', 'I', 'I'));
+
+
 class Event:
 
     __metaFormats__ = { MetaEvents.BT_HCI_EVT_LE_CONN_COMPLETE:            'LE Connection Complete Event for handle {1:d} status 0x{0:02X} role {2:d} from {3:s} interval {4:d} latency {5:d} timeout {6:d} accuracy {7:d}',
@@ -362,19 +548,13 @@ class Event:
 
     def __init__(self, event, data, time=None):
         self.event = event;
-        self.data  = data[:];
+        # The event data is decoded in place (bytes are immutable; anything else is copied once)
+        self.data  = data if isinstance(data, (bytes, str)) else bytes(data);
         self.values = None;
         self.errors = set([]);
         self.time = time;
         self.size = len(self.data);
-        self.subEvent = struct.unpack('B', self.data[:1])[0] if self.size > 0 and self.event == Events.BT_HCI_EVT_LE_META_EVENT else 0;
-
-    def __asNumber(self, data):
-        value = 0;
-        for part in reversed(data):
-            value <<= 8;
-            value += part;
-        return value;
+        self.subEvent = self.data[0] if self.size > 0 and self.event == Events.BT_HCI_EVT_LE_META_EVENT else 0;
 
     def __checkSize(self, size):
         if self.size != size:
@@ -389,816 +569,134 @@ class Event:
             self.errors.add(ErrorCodes.BT_HCI_ERR_SIZE);
         return self.size >= size;
 
-    def __checkConnectionHandle(self, handle):
-        if not (0 <= handle <= 0xEFF):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_CONN_HANDLE);
-
-    def __checkEncryptionEnabled(self, enabled):
-        if not (0 <= enabled <= 2):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_ENCRYPT_ENABLED);
-
-    def __checkEncryptionKeySize(self, key_size):
-        if not (0x01 <= key_size <= 0x10):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_ENC_KEY_SIZE)
-
-    def __checkTXPowerLevel(self, level):
-        if not (-30 <= level <= 20):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_TX_POWER_LEVEL);
-
-    def __checkLESupportedHost(self, value):
-        if not (0 <= value <= 1):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_LE_SUPPORTED_HOST);
-
-    def __checkLESimultaneousHost(self, value):
-        if not (0 == value):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_LE_SIMULTANEOUS_HOST);
-
-    def __checkPayloadTimeout(self, timeout):
-        if not (0 < timeout):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_PAYLOAD_TIMEOUT);
-
-    def __checkRSSI(self, rssi):
-        if not ((-127 <= rssi <= 20) or (rssi == 127)):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_RSSI_VALUE);
-
-    def __checkAdvTXPowerLevel(self, level):
-        if not (-20 <= level <= 10):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_ADV_TX_POWER_LEVEL);
-
-    def __checkListSize(self, size):
-        if not (1 <= size):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_LIST_SIZE);
-
-    def __checkMaxDataOctets(self, octets):
-        if not (0x001B <= octets <= 0x00FB):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_MAX_DATA_OCTETS);
-
-    def __checkMaxDataTransmitTime(self, time):
-        if not (0x0148 <= time <= 0x4290):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_MAX_DATA_TRANSMIT_TIME);
-
-    def __checkChannelMap(self, map):
-        if not (map <= 0x1FFFFFFFFF):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_CHANNEL_MAP);
-
-    def __checkPhy(self, phy, legal=[1,2,3]):
-        if not (phy in legal):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_PHY_CHANNEL);
-
-    def __checkSelectedTXPower(self, power, minPower=-127, maxPower=126):
-        if not (minPower <= power <= maxPower):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_SELECTED_TX_POWER);
-
-    def __checkMaxAdvDataLength(self, length):
-        if not (0x001F <= length <= 0x0672):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_MAX_DATA_LENGTH);
-
-    def __checkSupportedAdvSets(self, sets):
-        if not (1 <= sets <= 240):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_SUPPORTED_ADV_SETS);
-
-    def __checkRFPathCompensation(self, value):
-        if not (-1280 <= value <= 1280):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_RF_COMPENSATION_VALUE);
-
-    def __checkLinkType(self, linkType):
-        if not (0 <= linkType <= 1):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_LINK_TYPE);
-
-    def __checkConnectionInterval(self, interval):
-        if not (0x0006 <= interval <= 0x0C80):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_CONNECTION_INTERVAL);
-
-    def __checkConnectionLatency(self, latency):
-        if not (0x0000 <= latency <= 0x01F3):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_CONNECTION_LATENCY);
-
-    def __checkSupervisionTimeout(self, timeout):
-        if not (0x000A <= timeout <= 0x0C80):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_SUPERVISION_TIMEOUT);
+    def __check(self, check, value):
+        if not value in check.values:
+            self.errors.add(check.error);
 
-    def __checkCentralClockAccuracy(self, accuracy):
-        if not (0 <= accuracy <= 7):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_CENTRAL_CLOCK_ACCURACY);
-
-    def __checkConnectionRole(self, role):
-        if not (0 <= role <= 1):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_CONNECTION_ROLE);
-
-    def __checkAddressType(self, type, legalTypes=[0,1,2,3]):
-        if not (type in legalTypes):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_ADDRESS_TYPE);
-
-    def __checkAdvEvent(self, event, minEvent=0, maxEvent=4):
-        if not (minEvent <= event <= maxEvent):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_ADV_REPORT_EVENT);
-
-    def __checkAdvDataLength(self, length, maxLength=31):
-        if not (0 <= length <= maxLength):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_ADV_DATA_LENGTH);
-
-    def __checkSid(self, sid, legal):
-        if not (sid in legal):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_ADV_SID);
-
-    def __checkSyncHandle(self, handle):
-        if not (0 <= handle <= 0xEFF):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_SYNC_HANDLE);
-
-    def __checkPeriodicAdvInterval(self, interval):
-        if not (6 <= interval):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_PERIODIC_ADV_INTERVAL);
-
-    def __checkAdvDataStatus(self, status):
-        if not (0 <= status <= 2):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_ADV_DATA_STATUS);
-
-    def __checkAdvertisingHandle(self, handle):
-        if not (0 <= handle <= 0xEF):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_ADVERTISING_HANDLE);
-
-    def __checkChannelAlgorithm(self, algorithm):
-        if not (0 <= algorithm <= 1):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_CHANNEL_SEL_ALGORITHM);
-
-    def __checkPeerClockAccuracy(self, accuracy):
-        if not (0x00 <= accuracy <= 0x07):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_PEER_CLOCK_ACCURACY)
-
-    def __checkAdvertisingReports(self, reports, minReports=1, maxReports=25):
-        if not (minReports <= reports <= maxReports):
-            self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_NO_ADVERTISING_REPORTS);
-
-
-    def __disconnectComplete(self):
-        if self.__checkSize(4):
-            status, handle, reason = struct.unpack('<BHB', self.data[:4]);
-            self.__checkConnectionHandle(handle);
-        else:
-            status = handle = reason = 0;
-        return status, handle, reason;
-
-    def __encryptionChangeV1(self):
-        if self.__checkSize(4):
-            status, handle, enabled = struct.unpack('<BHB', self.data[:4]);
-            self.__checkConnectionHandle(handle);
-            self.__checkEncryptionEnabled(enabled);
-        else:
-            status = handle = enabled = 0;
-        return status, handle, enabled;
-
-
-    def __encryptionChangeV2(self):
-        if self.__checkSize(5):
-            status, handle, enabled, key_size = struct.unpack('<BHBB', self.data[:5])
-            self.__checkConnectionHandle(handle)
-            self.__checkEncryptionEnabled(enabled)
-            self.__checkEncryptionKeySize(key_size)
+    """
+        Decode the event with an EventLayout
+    """
+    def __decodeLayout(self, layout):
+        if self.__checkSize(layout.size):
+            values = layout.unpack(self.data);
+            if not layout.valid(values):
+                for i, check in layout.checks:
+                    if not values[i] in check.values and not (check.ifSuccess and values[0] != 0):
+                        self.errors.add(check.error);
         else:
-            status = handle = enabled = key_size = 0
-        return status, handle, enabled, key_size
+            values = layout.defaults();
+        return values if layout.build is None else layout.build(*values);
 
-
-    def __RemoteVersionComplete(self):
-        if self.__checkSize(8):
-            status, handle, version, manufacturer, subVersion = struct.unpack('<BHBHH', self.data[:8]);
-            self.__checkConnectionHandle(handle);
-        else:
-            status = handle = version = manufacturer = subVersion = 0;
-        return status, handle, version, manufacturer, subVersion;
+    def __decodeWith(self, decoder):
+        return self.__decodeLayout(decoder) if isinstance(decoder, EventLayout) else decoder(self);
 
     """ ================================================================================
 
-          The following private methods are all sub-sets of the Command Complete Event
+          The events (and Command Complete Event return parameters) with fields of
+          variable size, which cannot be described by an EventLayout
 
         ================================================================================ """
 
-    def __readTXPowerLevel(self):
-        if self.__checkSize(7):
-            handle, level = struct.unpack('<Hb', self.data[4:7]);
-            self.__checkConnectionHandle(handle);
-            self.__checkTXPowerLevel(level);
-        else:
-            handle = level = 0;
-        return handle, level
-
-    def __readLEHostSupport(self):
-        if self.__checkSize(6):
-            supported, simultaneous = struct.unpack('<BB', self.data[4:6]);
-            self.__checkLESupportedHost(supported);
-            self.__checkLESimultaneousHost(simultaneous);
-        else:
-            supported = simultaneous = 0;
-        return supported, simultaneous;
-
-    def __readAuthPayloadTimeout(self):
-        if self.__checkSize(8):
-            handle, timeout = struct.unpack('<HH', self.data[4:8]);
-            self.__checkConnectionHandle(handle);
-            self.__checkPayloadTimeout(timeout);
-            self.__checkConnectionHandle(handle);
-            self.__checkPayloadTimeout(timeout);
-        else:
-            handle = timeout = 0;
-        return handle, timeout;
-
-    def __writeAuthPayloadTimeout(self):
-        if self.__checkSize(6):
-            handle = struct.unpack('<H', self.data[4:6])[0];
-            self.__checkConnectionHandle(handle);
-        else:
-            handle = 0;
-        return (handle,);
-
-    def __readLocalVersionInformation(self):
-        if self.__checkSize(12):
-            hciVersion, hciRevision, lmpVersion, manufacturer, lmpSubversion = struct.unpack('<BHBHH', self.data[4:12]);
-        else:
-            hciVersion = hciRevision = lmpVersion = lmpSubversion = manufacturer = 0;
-        return hciVersion, hciRevision, lmpVersion, lmpSubversion, manufacturer;
-
-    def __readLocalSupportedCommands(self):
-        if self.__checkSize(68):
-            commands = struct.unpack('<64B', self.data[4:68]);
-        else:
-            commands = [0 for _ in range(64)];
-        return (commands,);
-
-    def __readLocalSupportedFeatures(self):
-        if self.__checkSize(12):
-            features = struct.unpack('<8B', self.data[4:12]);
-        else:
-            features = [0 for _ in range(8)];
-        return (features,);
-
-    def __readBufferSize(self):
-        if self.__checkSize(11):
-            aclLength, synLength, aclPackets, synPackets = struct.unpack('<HBHH', self.data[4:11]);
-        else:
-            aclLength = synLength = aclPackets = synPackets = 0
-        return aclLength, synLength, aclPackets, synPackets;
-
-    def __readBDAddress(self):
-        if self.__checkSize(10):
-            address = struct.unpack('<6B', self.data[4:10]);
-        else:
-            address = None;
-        return (Address(None, address),);
-
-    def __readRssi(self):
-        if self.__checkSize(7):
-            handle, rssi = struct.unpack('<Hb', self.data[4:7]);
-            self.__checkConnectionHandle(handle);
-            self.__checkRSSI(rssi);
-        else:
-            handle = rssi = 0;
-        return handle, rssi;
-
-    def __leReadBufferSize(self):
-        if self.__checkSize(7):
-            dpLength, dpCount = struct.unpack('<HB', self.data[4:7]);
-        else:
-            dpLength = dpCount = 0;
-        return dpLength, dpCount;
-
-    def __leReadBufferSizeV2(self):
-        if self.__checkSize(10):
-            dpLength, dpCount, isoLength, isoCount = struct.unpack('<HBHB', self.data[4:10]);
-        else:
-            dpLength = dpCount = isoLength = isoCount = 0;
-        return dpLength, dpCount, isoLength, isoCount;
-
-    def __leReadLocalSupportedFeatures(self):
-        if self.__checkSize(12):
-            features = struct.unpack('<8B', self.data[4:12]);
-        else:
-            features = [0 for _ in range(8)];
-        return (features,);
-
-    def __leReadAdvChannelTXPower(self):
-        if self.__checkSize(5):
-            power = struct.unpack('<b', self.data[4:5])[0];
-            self.__checkAdvTXPowerLevel(power);
-        else:
-            power = 0;
-        return (power,);
-
-    def __leReadListSize(self):
-        if self.__checkSize(5):
-            size = struct.unpack('<B', self.data[4:5])[0];
-            self.__checkListSize(size);
-        else:
-            size = 0;
-        return (size,);
-
-    def __leReadChannelMap(self):
-        if self.__checkSize(11):
-            handle = struct.unpack('<H', self.data[4:6])[0];
-            chnMap = struct.unpack('<5B', self.data[6:11]);
-            chnMapNo = self.__asNumber(chnMap);
-            self.__checkConnectionHandle(handle);
-            self.__checkChannelMap(chnMapNo);
-        else:
-            handle = chnMapNo = 0;
-        return handle, chnMapNo;
-
-    def __leEncrypt(self):
-        if self.__checkSize(20):
-            encData = struct.unpack('<16B', self.data[4:20]);
-        else:
-            encData = [0 for _ in range(16)];
-        return (encData,);
-
-    def __leRand(self):
-        if self.__checkSize(12):
-            number = struct.unpack('<8B', self.data[4:12]);
-        else:
-            number = [0 for _ in range(8)];
-        return (self.__asNumber(number),);
-
-    def __leLTKRequestReply(self):
-        if self.__checkSize(6):
-            handle = struct.unpack('<H', self.data[4:6])[0];
-            self.__checkConnectionHandle(handle);
-        else:
-            handle = 0;
-        return (handle,);
-
-    def __leReadSupportedStates(self):
-        if self.__checkSize(12):
-            states = struct.unpack('<8B', self.data[4:12]);
-        else:
-            states = [0 for _ in range(8)];
-        return (self.__asNumber(states),);
-
-    def __leTestEnd(self):
-        if self.__checkSize(6):
-            packets = struct.unpack('<H', self.data[4:6])[0];
-        else:
-            packets = 0;
-        return (packets,);
-
-    def __leRemoteConnectionParameterRequest(self):
-        if self.__checkSize(6):
-            handle = struct.unpack('<H', self.data[4:6])[0];
-            self.__checkConnectionHandle(handle);
-        else:
-            handle = 0;
-        return (handle,);
-
-    def __leSetDataLength(self):
-        if self.__checkSize(6):
-            handle = struct.unpack('<H', self.data[4:6])[0];
-            self.__checkConnectionHandle(handle);
-        else:
-            handle = 0;
-        return (handle,);
-
-    def __leReadDefaultDataLength(self):
-        if self.__checkSize(8):
-            maxOctets, maxTime = struct.unpack('<HH', self.data[4:8]);
-            self.__checkMaxDataOctets(maxOctets);
-            self.__checkMaxDataTransmitTime(maxTime);
-        else:
-            maxOctets = maxTime = 0;
-        return maxOctets, maxTime;
-
-    def __leReadResolvingListSize(self):
-        if self.__checkSize(5):
-            size = struct.unpack('<B', self.data[4:5])[0];
-        else:
-            size = 0;
-        return (size,);
-
-    def __leReadResolvableAddress(self):
-        if self.__checkSize(10):
-            address = struct.unpack('<6B', self.data[4:10]);
-        else:
-            address = None;
-        return (Address(None, address),);
-
-    def __leReadMaximumDataLength(self):
-        if self.__checkSize(12):
-            maxTXOctets, maxTXTime, maxRXOctets, maxRXTime = struct.unpack('<HHHH', self.data[4:12]);
-            self.__checkMaxDataOctets(maxTXOctets);
-            self.__checkMaxDataTransmitTime(maxTXTime);
-            self.__checkMaxDataOctets(maxRXOctets);
-            self.__checkMaxDataTransmitTime(maxRXTime);
-        else:
-            maxTXOctets = maxTXTime = maxRXOctets = maxRXTime = 0;
-        return maxTXOctets, maxTXTime, maxRXOctets, maxRXTime;
-
-    def __leReadPHY(self):
-        if self.__checkSize(8):
-            handle, txPHY, rxPHY = struct.unpack('<HBB', self.data[4:8]);
-            self.__checkConnectionHandle(handle);
-            self.__checkPhy(txPHY);
-            self.__checkPhy(rxPHY);
-        else:
-            handle = txPHY = rxPHY = 0;
-        return handle, txPHY, rxPHY;
-
-    def __leSetExtAdvParameters(self):
-        if self.__checkSize(5):
-            power = struct.unpack('<b', self.data[4:5])[0];
-            self.__checkSelectedTXPower(power);
-        else:
-            power = 0;
-        return (power,);
-
-    def __leReadMaxAdvDataLength(self):
-        if self.__checkSize(6):
-            maxLength = struct.unpack('<H', self.data[4:6])[0];
-            self.__checkMaxAdvDataLength(maxLength);
-        else:
-            maxLength = 0;
-        return (maxLength,);
-
-    def __leReadNoOfSupportedAdvSets(self):
-        if self.__checkSize(5):
-            maxSets = struct.unpack('<B', self.data[4:5])[0];
-            self.__checkSupportedAdvSets(maxSets);
-        else:
-            maxSets = 0;
-        return (maxSets,);
-
-    def __leReadTransmitPower(self):
-        if self.__checkSize(6):
-            minPower, maxPower = struct.unpack('<bb', self.data[4:6]);
-            self.__checkSelectedTXPower(minPower);
-            self.__checkSelectedTXPower(maxPower);
-        else:
-            minPower = maxPower = 0;
-        return minPower, maxPower;
-
-    def __leReadRFPathCompensation(self):
-        if self.__checkSize(8):
-            txPCValue, rxPCValue = struct.unpack('<hh', self.data[4:8]);
-            self.__checkRFPathCompensation(txPCValue);
-            self.__checkRFPathCompensation(rxPCValue);
-        else:
-            txPCValue = rxPCValue = 0;
-        return txPCValue, rxPCValue;
-
     def __leSetCigParameters(self):
         if self.__checkMinSize(6):
-            cigId, cisCount = struct.unpack('<BB', self.data[4:6])
+            cigId, cisCount = _CIG_PARAMETERS.unpack_from(self.data, 4)
         else:
             cigId = cisCount = 0
 
         if self.__checkSize(6+cisCount*2):
-            connectionHandle = struct.unpack('<' + str(cisCount) + 'H', self.data[6:6+cisCount*2])
+            connectionHandle = _uint16s(cisCount).unpack_from(self.data, 6)
         else:
             connectionHandle = None
         return cigId, cisCount, connectionHandle
 
-    def __leSetCigParametersTest(self):
-        return self.__leSetCigParameters()
-
-    def __leRemoveCig(self):
-        if self.__checkSize(5):
-            cigId = struct.unpack('<B', self.data[4:5])[0]
-        else:
-            cigId = 0
-        return (cigId,)
-
-    def __leRejectCisRequest(self):
-        if self.__checkSize(6):
-            connectionHandle = struct.unpack('<H', self.data[4:6])[0]
-            self.__checkConnectionHandle(connectionHandle)
-        else:
-            connectionHandle = 0
-        return (connectionHandle,)
-
-    def __leSetupIsoPath(self):
-        if self.__checkSize(6):
-            connectionHandle = struct.unpack('<H', self.data[4:6])[0]
-            self.__checkConnectionHandle(connectionHandle)
-        else:
-            connectionHandle = 0
-        return (connectionHandle,)
-
-    def __leRemoveIsoPath(self):
-        if self.__checkSize(6):
-            connectionHandle = struct.unpack('<H', self.data[4:6])[0]
-            self.__checkConnectionHandle(connectionHandle)
-        else:
-            connectionHandle = 0
-        return (connectionHandle,)
-
-    def __leIsoTransmitTest(self):
-        if self.__checkSize(6):
-            connectionHandle = struct.unpack('<H', self.data[4:6])[0]
-            self.__checkConnectionHandle(connectionHandle)
-        else:
-            connectionHandle = 0
-        return (connectionHandle,)
-
-    def __leIsoReceiveTest(self):
-        if self.__checkSize(6):
-            connectionHandle = struct.unpack('<H', self.data[4:6])[0]
-            self.__checkConnectionHandle(connectionHandle)
-        else:
-            connectionHandle = 0
-        return (connectionHandle,)
-
-    def __leIsoReadTestCounters(self):
-        if self.__checkSize(18):
-            connectionHandle, receivedSduCount, missedSduCount, failedSduCount = struct.unpack('<HIII', self.data[4:18])
-            self.__checkConnectionHandle(connectionHandle)
-        else:
-            connectionHandle = 0
-        return connectionHandle, receivedSduCount, missedSduCount, failedSduCount
-
-    def __leIsoTestEnd(self):
-        return self.__leIsoReadTestCounters()
-
-
-    """ ================================================================================
-
-           The above private methods were all sub-sets of the Command Complete Event
-
-        ================================================================================ """
-
     def __commandComplete(self):
         if self.size >= 4:
-            numPackets, opCode, status = struct.unpack('<BHB', self.data[:4]);
+            numPackets, opCode, status = _COMMAND_COMPLETE_HEADER.unpack_from(self.data);
             if opCode in self.__cceFuncs__:
-                return (numPackets, opCode, status) + self.__cceFuncs__[opCode](self);
+                return (numPackets, opCode, status) + self.__decodeWith(self.__cceFuncs__[opCode]);
         else:
             numPackets = opCode = status = 0;
         self.__checkSize(4);
         return numPackets, opCode, status;
 
-    def __commandStatus(self):
-        if self.__checkSize(4):
-            status, numPackets, opCode = struct.unpack('<BBH', self.data[:4]);
-            if not (opCode in CmdOpcodes._value2member_map_):
-                self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_COMMAND_STATUS_OPCODE);
-        else:
-            numPackets = opCode = status = 0;
-        return numPackets, opCode, status;
-
-    def __hardwareError(self):
-        if self.__checkSize(1):
-            error = struct.unpack('<B', self.data[:1])[0];
-        else:
-            error = 0;
-        return (error,);
-
     def __completedPackets(self):
-        numHandles = struct.unpack('<B', self.data[:1])[0] if self.size > 0 else 0;
+        numHandles = self.data[0] if self.size > 0 else 0;
         handles = []
         packets = []
         if self.__checkSize(1 + 4*numHandles):
-            for i in range(numHandles):
-                handles.append(struct.unpack_from('<H', self.data, 1+i*4)[0])
-                packets.append(struct.unpack_from('<H', self.data, 3+i*4)[0])
+            for handle, count in _COMPLETED_PACKETS.iter_unpack(memoryview(self.data)[1:1 + 4*numHandles]):
+                handles.append(handle)
+                packets.append(count)
             for handle in handles:
-                self.__checkConnectionHandle(handle);
+                self.__check(_CONNECTION_HANDLE, handle);
         return numHandles, handles, packets;
 
-    def __dataBufferOverflow(self):
-        if self.__checkSize(1):
-            linkType = struct.unpack('<B', self.data[:1])[0];
-            self.__checkLinkType(linkType);
-        else:
-            linkType = 0;
-        return (linkType,);
-
-    def __encryptionKeyRefreshComplete(self):
-        if self.__checkSize(3):
-            status, handle = struct.unpack('<BH', self.data[:3]);
-            self.__checkConnectionHandle(handle);
-        else:
-            status = handle = 0;
-        return status, handle;
-
-    def __authenticatedPayloadTimeout(self):
-        if self.__checkSize(2):
-            handle = struct.unpack('<H', self.data[:2])[0];
-            self.__checkConnectionHandle(handle);
-        else:
-            handle = 0;
-        return (handle,);
-
-    def __connectionComplete(self):
-        if self.__checkSize(19):
-            status, handle, role, addressType = struct.unpack('<BHBB', self.data[1:6]);
-            address = struct.unpack('<6B', self.data[6:12]);
-            interval, latency, timeout, accuracy = struct.unpack('<HHHB', self.data[12:19]);
-            self.__checkConnectionHandle(handle);
-            self.__checkConnectionRole(role);
-            self.__checkAddressType(addressType, [0,1]);
-            self.__checkConnectionInterval(interval);
-            self.__checkConnectionLatency(latency);
-            self.__checkSupervisionTimeout(timeout);
-            self.__checkCentralClockAccuracy(accuracy);
-        else:
-            status = handle = role = addressType = interval = latency = timeout = accuracy = 0;
-            address = None;
-        return status, handle, role, Address(addressType, address), interval, latency, timeout, accuracy;
-
     def __advertisingReport(self):
         if self.__checkMinSize(12):
-            reports, event, addressType = struct.unpack('<BBB', self.data[1:4]);
-            address = struct.unpack('<6B', self.data[4:10]);
-            dataSize = struct.unpack('<B', self.data[10:11])[0];
+            reports, event, addressType, address, dataSize = _ADVERTISING_REPORT.unpack_from(self.data, 1);
+            address = tuple(address);
             if self.__checkSize(12 + dataSize):
-                if dataSize > 0:
-                    data = list(struct.unpack('<' + str(dataSize) + 'B', self.data[11:11+dataSize]));
-                else:
-                    data = [];
-                rssi = struct.unpack('b', self.data[11+dataSize:12+dataSize])[0];
+                data = list(self.data[11:11+dataSize]);
+                rssi = _RSSI_VALUE.unpack_from(self.data, 11+dataSize)[0];
             else:
                 rssi, data = 0, [];
-            self.__checkAdvEvent(event);
-            self.__checkAddressType(addressType);
-            self.__checkAdvDataLength(dataSize);
-            self.__checkRSSI(rssi);
+            self.__check(_ADV_EVENT, event);
+            self.__check(_ADDRESS_TYPE, addressType);
+            self.__check(_ADV_DATA_LENGTH, dataSize);
+            self.__check(_RSSI, rssi);
         else:
             event, addressType, rssi, address, data = 0, 0, 0, None, [];
         return event, Address(addressType, address), data, rssi;
 
-    def __connectionUpdateComplete(self):
-        if self.__checkSize(10):
-            status, handle, interval, latency, timeout = struct.unpack('<BHHHH', self.data[1:10]);
-            self.__checkConnectionHandle(handle);
-            self.__checkConnectionInterval(interval);
-            self.__checkConnectionLatency(latency);
-            self.__checkSupervisionTimeout(timeout);
-        else:
-            status = handle = interval = latency = timeout = 0;
-        return status, handle, interval, latency, timeout;
-
-    def __remoteFeaturesComplete(self):
-        if self.__checkSize(12):
-            status, handle = struct.unpack('<BH', self.data[1:4]);
-            features = struct.unpack('<8B', self.data[4:12]);
-            self.__checkConnectionHandle(handle);
-        else:
-            status, handle, features = 0, 0, [0 for _ in range(8)];
-        return status, handle, self.__asNumber(features);
-
-    def __leLTKRequest(self):
-        if self.__checkSize(13):
-            handle = struct.unpack('<H', self.data[1:3])[0];
-            number = struct.unpack('<8B', self.data[3:11]);
-            diversifier = struct.unpack('<H', self.data[11:13])[0];
-            self.__checkConnectionHandle(handle);
-        else:
-            handle, number, diversifier = 0, [0 for _ in range(8)], 0;
-        return handle, self.__asNumber(number), diversifier;
-
     def __connectionParameterRequest(self):
         if self.__checkSize(11):
-            handle, minInterval, maxInterval, latency, timeout = struct.unpack('<HHHHH', self.data[1:11]);
-            self.__checkConnectionHandle(handle);
-            self.__checkConnectionInterval(minInterval);
-            self.__checkConnectionInterval(maxInterval);
-            self.__checkConnectionLatency(latency);
-            self.__checkSupervisionTimeout(timeout);
+            handle, minInterval, maxInterval, latency, timeout = _CONN_PARAM_REQUEST.unpack_from(self.data, 1);
+            self.__check(_CONNECTION_HANDLE, handle);
+            self.__check(_CONNECTION_INTERVAL, minInterval);
+            self.__check(_CONNECTION_INTERVAL, maxInterval);
+            self.__check(_CONNECTION_LATENCY, latency);
+            self.__check(_SUPERVISION_TIMEOUT, timeout);
             if not (minInterval <= maxInterval):
                 self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_PARAMETER_INTERRELATION);
         else:
             handle = minInterval = maxInterval = latency = timeout = 0;
         return handle, minInterval, maxInterval, latency, timeout;
 
-    def __dataLengthChange(self):
-        if self.__checkSize(11):
-            handle, maxTxOctets, maxTxTime, maxRxOctets, maxRxTime = struct.unpack('<HHHHH', self.data[1:11]);
-            self.__checkConnectionHandle(handle);
-            self.__checkMaxDataOctets(maxTxOctets);
-            self.__checkMaxDataTransmitTime(maxTxTime);
-            self.__checkMaxDataOctets(maxRxOctets);
-            self.__checkMaxDataTransmitTime(maxRxTime);
-        else:
-            handle = maxTxOctets = maxTxTime = maxRxOctets = maxRxTime = 0;
-        return handle, maxTxOctets, maxTxTime, maxRxOctets, maxRxTime;
-
-    def __publicKeyComplete(self):
-        if self.__checkSize(66):
-            status = struct.unpack('<B', self.data[1:2])[0];
-            key = struct.unpack('<64B', self.data[2:66]);
-        else:
-            status, key = 0, [0 for _ in range(64)];
-        return status, self.__asNumber(key);
-
-    def __generateDHKeyComplete(self):
-        if self.__checkSize(34):
-            status = struct.unpack('<B', self.data[1:2])[0];
-            key = struct.unpack('<32B', self.data[2:34]);
-        else:
-            status, key = 0, [0 for _ in range(32)];
-        return status, self.__asNumber(key);
-
-    def __enhancedConnectionComplete(self):
-        if self.__checkSize(31):
-            status, handle, role, addressType = struct.unpack('<BHBB', self.data[1:6]);
-            peerAddress = struct.unpack('<6B', self.data[6:12]);
-            localResolvableAddress = struct.unpack('<6B', self.data[12:18]);
-            peerResolvableAddress = struct.unpack('<6B', self.data[18:24]);
-            interval, latency, timeout, accuracy = struct.unpack('<HHHB', self.data[24:31]);
-            if status == 0:
-                self.__checkConnectionHandle(handle);
-                self.__checkConnectionRole(role);
-                self.__checkAddressType(addressType);
-                self.__checkConnectionInterval(interval);
-                self.__checkConnectionLatency(latency);
-                self.__checkSupervisionTimeout(timeout);
-                self.__checkCentralClockAccuracy(accuracy);
-        else:
-            status = handle = role = addressType = interval = latency = timeout = accuracy = 0;
-            peerAddress = localResolvableAddress = peerResolvableAddress = None;
-        return status, handle, role, Address(addressType, peerAddress), Address(None, localResolvableAddress), Address(None, peerResolvableAddress), \
-               interval, latency, timeout, accuracy;
-
-    def __directAdvertisingReport(self):
-        if self.__checkSize(18):
-            reports, event, addressType = struct.unpack('<BBB', self.data[1:4]);
-            address = struct.unpack('<6B', self.data[4:10]);
-            directAddressType = struct.unpack('<B', self.data[10:11])[0];
-            directAddress = struct.unpack('<6B', self.data[11:17]);
-            rssi = struct.unpack('<b', self.data[17:18])[0];
-            self.__checkAdvertisingReports(reports);
-            self.__checkAdvEvent(event, 1, 1);
-            self.__checkAddressType(addressType);
-            self.__checkAddressType(directAddressType, [1]);
-            self.__checkRSSI(rssi);
-        else:
-            event = addressType = directAddressType = rssi = 0;
-            address = directAddress = None;
-        return event, Address(addressType, address), Address(directAddressType, directAddress), rssi;
-
-    def __phyUpdateComplete(self):
-        if self.__checkSize(6):
-            status, handle, txPhysical, rxPhysical = struct.unpack('<BHBB', self.data[1:6]);
-            self.__checkConnectionHandle(handle);
-            self.__checkPhy(txPhysical);
-            self.__checkPhy(rxPhysical);
-        else:
-            status = handle = txPhysical = rxPhysical = 0;
-        return status, handle, txPhysical, rxPhysical;
-
     def __extendedAdvertisingReport(self):
         if self.__checkMinSize(26):
-            reports, eventType, addressType = struct.unpack('<BHB', self.data[1:5]);
-            address = struct.unpack('<6B', self.data[5:11]);
-            priPHY, secPHY, sid, txPower, rssi, interval, dirAddressType = struct.unpack('<BBBbbHB', self.data[11:19]);
-            dirAddress = struct.unpack('<6B', self.data[19:25]);
-            dataSize = struct.unpack('<B', self.data[25:26])[0];
+            reports, eventType, addressType, address, priPHY, secPHY, sid, txPower, rssi, interval, dirAddressType, dirAddress, dataSize = \
+                _EXT_ADVERTISING_REPORT.unpack_from(self.data, 1);
+            address, dirAddress = tuple(address), tuple(dirAddress);
             if self.__checkSize(26 + dataSize):
-                if dataSize > 0:
-                    data = list(struct.unpack('<' + str(dataSize) + 'B', self.data[26:26+dataSize]));
-                else:
-                    data = [];
+                data = list(self.data[26:26+dataSize]);
             else:
                 data = [];
-            self.__checkAdvertisingReports(reports, 1, 10);
-            self.__checkAdvEvent(eventType, 0, 0x7F);
-            self.__checkAddressType(addressType, [0,1,2,3,255]);
-            self.__checkPhy(priPHY, [1,3]);
-            self.__checkPhy(secPHY, [0,1,2,3]);
-            self.__checkSid(sid, [_ for _ in range(16)] + [255]);
-            self.__checkSelectedTXPower(txPower, -127, 127);
-            self.__checkRSSI(rssi);
-            self.__checkPeriodicAdvInterval(interval);
-            self.__checkAddressType(dirAddressType, [0,1,2,3,254]);
-            self.__checkAdvDataLength(dataSize, 229);
+            self.__check(_EXT_ADVERTISING_REPORTS, reports);
+            self.__check(_EXT_ADV_EVENT, eventType);
+            self.__check(_EXT_ADDRESS_TYPE, addressType);
+            self.__check(_PRIMARY_PHY, priPHY);
+            self.__check(_SECONDARY_PHY, secPHY);
+            self.__check(_EXT_SID, sid);
+            self.__check(_EXT_TX_POWER, txPower);
+            self.__check(_RSSI, rssi);
+            self.__check(_PERIODIC_ADV_INTERVAL, interval);
+            self.__check(_DIRECT_ADDRESS_TYPE, dirAddressType);
+            self.__check(_EXT_ADV_DATA_LENGTH, dataSize);
         else:
             eventType = addressType = priPHY = secPHY = sid = txPower = rssi = interval = dirAddressType = 0;
             address, dirAddress, data = None, None, [];
         return eventType, Address(addressType, address), priPHY, secPHY, sid, txPower, rssi, interval, Address(dirAddressType, dirAddress), data;
 
-    def __periodicAdvertisingSync(self):
-        if self.__checkSize(16):
-            status, handle, sid, addressType = struct.unpack('<BHBB', self.data[1:6]);
-            address = struct.unpack('<6B', self.data[6:12]);
-            phy, interval, accuracy = struct.unpack('<BHB', self.data[12:16]);
-            self.__checkSyncHandle(handle);
-            self.__checkSid(sid, [_ for _ in range(16)]);
-            self.__checkAddressType(addressType);
-            self.__checkPhy(phy);
-            self.__checkPeriodicAdvInterval(interval);
-            self.__checkCentralClockAccuracy(accuracy);
-        else:
-            status = handle = sid = addressType = phy = interval = accuracy = 0;
-            address = None;
-        return status, handle, sid, Address(addressType, address), phy, interval, accuracy;
-
     def __periodicAdvertisingReport(self):
         if self.__checkMinSize(8):
-            handle, txPower, rssi, unUsed, dataStatus, dataSize = struct.unpack('<HbbBBB', self.data[1:8]);
+            handle, txPower, rssi, unUsed, dataStatus, dataSize = _PER_ADVERTISING_REPORT.unpack_from(self.data, 1);
             if self.__checkSize(8 + dataSize):
-                if dataSize > 0:
-                    data = list(struct.unpack('<' + str(dataSize) + 'B', self.data[8:8+dataSize]));
-                else:
-                    data = [];
-                self.__checkSyncHandle(handle);
-                self.__checkSelectedTXPower(txPower, -127, 127);
-                self.__checkRSSI(rssi);
-                self.__checkAdvDataStatus(dataStatus);
-                self.__checkAdvDataLength(dataSize, 248);
+                data = list(self.data[8:8+dataSize]);
+                self.__check(_SYNC_HANDLE, handle);
+                self.__check(_EXT_TX_POWER, txPower);
+                self.__check(_RSSI, rssi);
+                self.__check(_ADV_DATA_STATUS, dataStatus);
+                self.__check(_PER_ADV_DATA_LENGTH, dataSize);
                 if not (unUsed == 0xFF):
                     self.errors.add(ErrorCodes.BT_HCI_ERR_BAD_ADV_UNUSED_VALUE);
             else:
@@ -1207,96 +705,9 @@ class Event:
             handle, txPower, rssi, dataStatus, data = 0, 0, 0, 0, [];
         return handle, txPower, rssi, dataStatus, data;
 
-    def __periodicAdvertisingSyncLost(self):
-        if self.__checkSize(3):
-            handle = struct.unpack('<H', self.data[1:3])[0];
-            self.__checkSyncHandle(handle);
-        else:
-            handle = 0;
-        return (handle,);
-
-    def __scanTimeout(self):
-        self.__checkSize(1);
-        return (None,);
-
-    def __advertiseSetTerminated(self):
-        if self.__checkSize(6):
-            status, advertiseHandle, connectionHandle, completedEvents = struct.unpack('<BBHB', self.data[1:6]);
-            self.__checkAdvertisingHandle(advertiseHandle);
-            if status == 0:
-                self.__checkConnectionHandle(connectionHandle)
-        else:
-            status = advertiseHandle = connectionHandle = completedEvents = 0;
-        return status, advertiseHandle, connectionHandle, completedEvents;
-
-    def __scanRequestReceived(self):
-        if self.__checkSize(9):
-            handle, addressType = struct.unpack('<BB', self.data[1:3]);
-            address = struct.unpack('<6B', self.data[3:9]);
-            self.__checkAdvertisingHandle(handle);
-            self.__checkAddressType(addressType);
-        else:
-            handle, addressType, address = 0, 0, None;
-        return handle, Address(addressType, address);
-
-    def __channnelSelectionAlgorithm(self):
-        if self.__checkSize(4):
-            handle, algorithm = struct.unpack('<HB', self.data[1:4]);
-            self.__checkConnectionHandle(handle);
-            self.__checkChannelAlgorithm(algorithm);
-        else:
-            handle = algorithm = 0;
-        return handle, algorithm;
-
-    def __cisEstablished(self):
-        if self.__checkSize(29):
-            status, connectionHandle = struct.unpack('<BH', self.data[1:4])
-            cigSyncDelay = struct.unpack('<3B', self.data[4:7])
-            cisSyncDelay = struct.unpack('<3B', self.data[7:10])
-            transportLatencyMToS = struct.unpack('<3B', self.data[10:13])
-            transportLatencySToM = struct.unpack('<3B', self.data[13:16])
-            phyMToS, phySToM, nse = struct.unpack('<BBB', self.data[16:19])
-            bNMToS, bNSToM, fTMToS, fTSToM = struct.unpack('<BBBB', self.data[19:23])
-            maxPduMToS, maxPduSToM, isoInterval = struct.unpack('<HHH', self.data[23:29])
-
-            if status == 0:
-                self.__checkConnectionHandle(connectionHandle)
-                self.__checkPhy(phyMToS)
-                self.__checkPhy(phySToM)
-        else:
-            status = connectionHandle = phyMToS = phySToM = nse = bNMToS = bNSToM = fTMToS = fTSToM = maxPduMToS = maxPduSToM = isoInterval = 0
-            cigSyncDelay = cisSyncDelay = transportLatencyMToS = transportLatencySToM = None
-
-        return status, connectionHandle, toNumber(cigSyncDelay), toNumber(cisSyncDelay), toNumber(transportLatencyMToS), toNumber(transportLatencySToM), \
-               phyMToS, phySToM, nse, bNMToS, bNSToM, fTMToS, fTSToM, maxPduMToS, maxPduSToM, isoInterval
-
-    def __cisRequest(self):
-        if self.__checkSize(7):
-            aclConnectionHandle, cisConnectionHandle, cigId, cisId = struct.unpack('<HHBB', self.data[1:7])
-
-            self.__checkConnectionHandle(aclConnectionHandle)
-            self.__checkConnectionHandle(cisConnectionHandle)
-        else:
-            aclConnectionHandle = cisConnectionHandle = cigId = cisId = 0
-
-        return aclConnectionHandle, cisConnectionHandle, cigId, cisId
-
-    def __request_peer_sca_complete(self):
-        if self.__checkSize(5):
-            status, connectionHandle, peerClockAccuracy = struct.unpack('<BHB', self.data[1:5])
-
-            if status == 0:
-                self.__checkConnectionHandle(connectionHandle)
-                self.__checkPeerClockAccuracy(peerClockAccuracy)
-        else:
-            status = connectionHandle = peerClockAccuracy = 0
-
-        return status, connectionHandle, peerClockAccuracy
-
-
     def __metaEvent(self):
         if self.subEvent in self.__metaFuncs__:
-            return self.__metaFuncs__[self.subEvent](self);
+            return self.__decodeWith(self.__metaFuncs__[self.subEvent]);
         else:
             raise Exception('LE Meta Event with invalid sub-event 0x%02X' % self.subEvent)
 
@@ -1304,7 +715,7 @@ class Event:
         if not self.values is None:
             return self.values;
         elif self.event in self.__eventFuncs__:
-            self.values = self.__eventFuncs__[self.event](self);
+            self.values = self.__decodeWith(self.__eventFuncs__[self.event]);
             if not len(self.errors) == 0:
                 raise Exception('Illegal values in event data! Event: 0x%02X,0x%02X Errors: %s' % (self.event, self.subEvent, self.errors));
             return self.values;
@@ -1338,90 +749,108 @@ class Event:
             raise Exception('Illegal Event with event code 0x%02X' % event);
 
 
-    __metaFuncs__  = { MetaEvents.BT_HCI_EVT_LE_CONN_COMPLETE:            __connectionComplete,
+
+    __metaFuncs__  = { MetaEvents.BT_HCI_EVT_LE_CONN_COMPLETE:            EventLayout(1, 19, ('B', ('H', _CONNECTION_HANDLE), ('B', _CONNECTION_ROLE), ('B', _ADDRESS_TYPE.legalValues([0,1])), '6B',
+                                                                                             ('H', _CONNECTION_INTERVAL), ('H', _CONNECTION_LATENCY), ('H', _SUPERVISION_TIMEOUT), ('B', _CLOCK_ACCURACY)),
+                                                                                  lambda status, handle, role, addressType, address, interval, latency, timeout, accuracy:
+                                                                                      (status, handle, role, Address(addressType, address), interval, latency, timeout, accuracy)),
                        MetaEvents.BT_HCI_EVT_LE_ADVERTISING_REPORT:       __advertisingReport,
-                       MetaEvents.BT_HCI_EVT_LE_CONN_UPDATE_COMPLETE:     __connectionUpdateComplete,
-                       MetaEvents.BT_HCI_EVT_LE_REMOTE_FEAT_COMPLETE:     __remoteFeaturesComplete,
-                       MetaEvents.BT_HCI_EVT_LE_LTK_REQUEST:              __leLTKRequest,
+                       MetaEvents.BT_HCI_EVT_LE_CONN_UPDATE_COMPLETE:     EventLayout(1, 10, ('B', ('H', _CONNECTION_HANDLE), ('H', _CONNECTION_INTERVAL), ('H', _CONNECTION_LATENCY), ('H', _SUPERVISION_TIMEOUT))),
+                       MetaEvents.BT_HCI_EVT_LE_REMOTE_FEAT_COMPLETE:     EventLayout(1, 12, ('B', ('H', _CONNECTION_HANDLE), '8N')),
+                       MetaEvents.BT_HCI_EVT_LE_LTK_REQUEST:              EventLayout(1, 13, (('H', _CONNECTION_HANDLE), '8N', 'H')),
                        MetaEvents.BT_HCI_EVT_LE_CONN_PARAM_REQ:           __connectionParameterRequest,
-                       MetaEvents.BT_HCI_EVT_LE_DATA_LEN_CHANGE:          __dataLengthChange,
-                       MetaEvents.BT_HCI_EVT_LE_P256_PUBLIC_KEY_COMPLETE: __publicKeyComplete,
-                       MetaEvents.BT_HCI_EVT_LE_GENERATE_DHKEY_COMPLETE:  __generateDHKeyComplete,
-                       MetaEvents.BT_HCI_EVT_LE_ENH_CONN_COMPLETE:        __enhancedConnectionComplete,
-                       MetaEvents.BT_HCI_EVT_LE_DIRECT_ADV_REPORT:        __directAdvertisingReport,
-                       MetaEvents.BT_HCI_EVT_LE_PHY_UPDATE_COMPLETE:      __phyUpdateComplete,
+                       MetaEvents.BT_HCI_EVT_LE_DATA_LEN_CHANGE:          EventLayout(1, 11, (('H', _CONNECTION_HANDLE), ('H', _MAX_DATA_OCTETS), ('H', _MAX_DATA_TIME), ('H', _MAX_DATA_OCTETS), ('H', _MAX_DATA_TIME))),
+                       MetaEvents.BT_HCI_EVT_LE_P256_PUBLIC_KEY_COMPLETE: EventLayout(1, 66, ('B', '64N')),
+                       MetaEvents.BT_HCI_EVT_LE_GENERATE_DHKEY_COMPLETE:  EventLayout(1, 34, ('B', '32N')),
+                       MetaEvents.BT_HCI_EVT_LE_ENH_CONN_COMPLETE:        EventLayout(1, 31, ('B', ('H', _CONNECTION_HANDLE.onSuccess()), ('B', _CONNECTION_ROLE.onSuccess()), ('B', _ADDRESS_TYPE.onSuccess()), '6B', '6B', '6B',
+                                                                                             ('H', _CONNECTION_INTERVAL.onSuccess()), ('H', _CONNECTION_LATENCY.onSuccess()), ('H', _SUPERVISION_TIMEOUT.onSuccess()),
+                                                                                             ('B', _CLOCK_ACCURACY.onSuccess())),
+                                                                                  lambda status, handle, role, addressType, peerAddress, localResolvableAddress, peerResolvableAddress, interval, latency, timeout, accuracy:
+                                                                                      (status, handle, role, Address(addressType, peerAddress), Address(None, localResolvableAddress), Address(None, peerResolvableAddress),
+                                                                                       interval, latency, timeout, accuracy)),
+                       MetaEvents.BT_HCI_EVT_LE_DIRECT_ADV_REPORT:        EventLayout(1, 18, (('B', _ADVERTISING_REPORTS), ('B', _ADV_EVENT.limits(1, 1)), ('B', _ADDRESS_TYPE), '6B', ('B', _ADDRESS_TYPE.legalValues([1])), '6B', ('b', _RSSI)),
+                                                                                  lambda reports, event, addressType, address, directAddressType, directAddress, rssi:
+                                                                                      (event, Address(addressType, address), Address(directAddressType, directAddress), rssi)),
+                       MetaEvents.BT_HCI_EVT_LE_PHY_UPDATE_COMPLETE:      EventLayout(1, 6, ('B', ('H', _CONNECTION_HANDLE), ('B', _PHY), ('B', _PHY))),
                        MetaEvents.BT_HCI_EVT_LE_EXT_ADVERTISING_REPORT:   __extendedAdvertisingReport,
-                       MetaEvents.BT_HCI_EVT_LE_PER_ADV_SYNC_ESTABLISHED: __periodicAdvertisingSync,
+                       MetaEvents.BT_HCI_EVT_LE_PER_ADV_SYNC_ESTABLISHED: EventLayout(1, 16, ('B', ('H', _SYNC_HANDLE), ('B', _SID), ('B', _ADDRESS_TYPE), '6B', ('B', _PHY), ('H', _PERIODIC_ADV_INTERVAL), ('B', _CLOCK_ACCURACY)),
+                                                                                  lambda status, handle, sid, addressType, address, phy, interval, accuracy:
+                                                                                      (status, handle, sid, Address(addressType, address), phy, interval, accuracy)),
                        MetaEvents.BT_HCI_EVT_LE_PER_ADVERTISING_REPORT:   __periodicAdvertisingReport,
-                       MetaEvents.BT_HCI_EVT_LE_PER_ADV_SYNC_LOST:        __periodicAdvertisingSyncLost,
-                       MetaEvents.BT_HCI_EVT_LE_SCAN_TIMEOUT:             __scanTimeout,
-                       MetaEvents.BT_HCI_EVT_LE_ADV_SET_TERMINATED:       __advertiseSetTerminated,
-                       MetaEvents.BT_HCI_EVT_LE_SCAN_REQ_RECEIVED:        __scanRequestReceived,
-                       MetaEvents.BT_HCI_EVT_LE_CHAN_SEL_ALGO:            __channnelSelectionAlgorithm,
-                       MetaEvents.BT_HCI_EVT_LE_CIS_ESTABLISHED:          __cisEstablished,
-                       MetaEvents.BT_HCI_EVT_LE_CIS_REQUEST:              __cisRequest,
-                       MetaEvents.BT_HCI_EVT_LE_REQUEST_PEER_SCA_COMPLETE:  __request_peer_sca_complete,
+                       MetaEvents.BT_HCI_EVT_LE_PER_ADV_SYNC_LOST:        EventLayout(1, 3, (('H', _SYNC_HANDLE),)),
+                       MetaEvents.BT_HCI_EVT_LE_SCAN_TIMEOUT:             EventLayout(1, 1, (), lambda: (None,)),
+                       MetaEvents.BT_HCI_EVT_LE_ADV_SET_TERMINATED:       EventLayout(1, 6, ('B', ('B', _ADVERTISING_HANDLE), ('H', _CONNECTION_HANDLE.onSuccess()), 'B')),
+                       MetaEvents.BT_HCI_EVT_LE_SCAN_REQ_RECEIVED:        EventLayout(1, 9, (('B', _ADVERTISING_HANDLE), ('B', _ADDRESS_TYPE), '6B'),
+                                                                                  lambda handle, addressType, address: (handle, Address(addressType, address))),
+                       MetaEvents.BT_HCI_EVT_LE_CHAN_SEL_ALGO:            EventLayout(1, 4, (('H', _CONNECTION_HANDLE), ('B', _CHANNEL_ALGORITHM))),
+                       MetaEvents.BT_HCI_EVT_LE_CIS_ESTABLISHED:          EventLayout(1, 29, ('B', ('H', _CONNECTION_HANDLE.onSuccess()), '3N', '3N', '3N', '3N', ('B', _PHY.onSuccess()), ('B', _PHY.onSuccess()),
+                                                                                             'B', 'B', 'B', 'B', 'B', 'H', 'H', 'H')),
+                       MetaEvents.BT_HCI_EVT_LE_CIS_REQUEST:              EventLayout(1, 7, (('H', _CONNECTION_HANDLE), ('H', _CONNECTION_HANDLE), 'B', 'B')),
+                       MetaEvents.BT_HCI_EVT_LE_REQUEST_PEER_SCA_COMPLETE:  EventLayout(1, 5, ('B', ('H', _CONNECTION_HANDLE.onSuccess()), ('B', _PEER_CLOCK_ACCURACY.onSuccess()))),
                        }
 
-    __eventFuncs__ = { Events.BT_HCI_EVT_DISCONN_COMPLETE:                __disconnectComplete,
-                       Events.BT_HCI_EVT_ENCRYPT_CHANGE_V1:               __encryptionChangeV1,
-                       Events.BT_HCI_EVT_REMOTE_VERSION_INFO:             __RemoteVersionComplete,
+    __eventFuncs__ = { Events.BT_HCI_EVT_DISCONN_COMPLETE:                EventLayout(0, 4, ('B', ('H', _CONNECTION_HANDLE), 'B')),
+                       Events.BT_HCI_EVT_ENCRYPT_CHANGE_V1:               EventLayout(0, 4, ('B', ('H', _CONNECTION_HANDLE), ('B', _ENCRYPTION_ENABLED))),
+                       Events.BT_HCI_EVT_REMOTE_VERSION_INFO:             EventLayout(0, 8, ('B', ('H', _CONNECTION_HANDLE), 'B', 'H', 'H')),
                        Events.BT_HCI_EVT_CMD_COMPLETE:                    __commandComplete,
-                       Events.BT_HCI_EVT_CMD_STATUS:                      __commandStatus,
-                       Events.BT_HCI_EVT_HARDWARE_ERROR:                  __hardwareError,
+                       Events.BT_HCI_EVT_CMD_STATUS:                      EventLayout(0, 4, ('B', 'B', ('H', _COMMAND_OPCODE)),
+                                                                                  lambda status, numPackets, opCode: (numPackets, opCode, status)),
+                       Events.BT_HCI_EVT_HARDWARE_ERROR:                  EventLayout(0, 1, ('B',)),
                        Events.BT_HCI_EVT_NUM_COMPLETED_PACKETS:           __completedPackets,
-                       Events.BT_HCI_EVT_DATA_BUF_OVERFLOW:               __dataBufferOverflow,
-                       Events.BT_HCI_EVT_ENCRYPT_KEY_REFRESH_COMPLETE:    __encryptionKeyRefreshComplete,
+                       Events.BT_HCI_EVT_DATA_BUF_OVERFLOW:               EventLayout(0, 1, (('B', _LINK_TYPE),)),
+                       Events.BT_HCI_EVT_ENCRYPT_KEY_REFRESH_COMPLETE:    EventLayout(0, 3, ('B', ('H', _CONNECTION_HANDLE))),
                        Events.BT_HCI_EVT_LE_META_EVENT:                   __metaEvent,
-                       Events.BT_HCI_EVT_AUTH_PAYLOAD_TIMEOUT_EXP:        __authenticatedPayloadTimeout,
-                       Events.BT_HCI_EVT_ENCRYPT_CHANGE_V2:               __encryptionChangeV2,
+                       Events.BT_HCI_EVT_AUTH_PAYLOAD_TIMEOUT_EXP:        EventLayout(0, 2, (('H', _CONNECTION_HANDLE),)),
+                       Events.BT_HCI_EVT_ENCRYPT_CHANGE_V2:               EventLayout(0, 5, ('B', ('H', _CONNECTION_HANDLE), ('B', _ENCRYPTION_ENABLED), ('B', _ENCRYPTION_KEY_SIZE))),
                        }
 
-    __cceFuncs__ =   { CmdOpcodes.BT_HCI_OP_READ_TX_POWER_LEVEL:          __readTXPowerLevel,
-                       CmdOpcodes.BT_HCI_OP_LE_READ_LE_HOST_SUPP:         __readLEHostSupport,
-                       CmdOpcodes.BT_HCI_OP_READ_AUTH_PAYLOAD_TIMEOUT:    __readAuthPayloadTimeout,
-                       CmdOpcodes.BT_HCI_OP_WRITE_AUTH_PAYLOAD_TIMEOUT:   __writeAuthPayloadTimeout,
-                       CmdOpcodes.BT_HCI_OP_READ_LOCAL_VERSION_INFO:      __readLocalVersionInformation,
-                       CmdOpcodes.BT_HCI_OP_READ_SUPPORTED_COMMANDS:      __readLocalSupportedCommands,
-                       CmdOpcodes.BT_HCI_OP_READ_LOCAL_FEATURES:          __readLocalSupportedFeatures,
-                       CmdOpcodes.BT_HCI_OP_READ_BUFFER_SIZE:             __readBufferSize,
-                       CmdOpcodes.BT_HCI_OP_READ_BD_ADDR:                 __readBDAddress,
-                       CmdOpcodes.BT_HCI_OP_READ_RSSI:                    __readRssi,
-                       CmdOpcodes.BT_HCI_OP_LE_READ_BUFFER_SIZE:          __leReadBufferSize,
-                       CmdOpcodes.BT_HCI_OP_LE_READ_LOCAL_FEATURES: 	  __leReadLocalSupportedFeatures,
-                       CmdOpcodes.BT_HCI_OP_LE_READ_ADV_CHAN_TX_POWER: 	  __leReadAdvChannelTXPower,
-                       CmdOpcodes.BT_HCI_OP_LE_READ_FAL_SIZE:              __leReadListSize,
-                       CmdOpcodes.BT_HCI_OP_LE_READ_CHAN_MAP:             __leReadChannelMap,
-                       CmdOpcodes.BT_HCI_OP_LE_ENCRYPT:                   __leEncrypt,
-                       CmdOpcodes.BT_HCI_OP_LE_RAND:                      __leRand,
-                       CmdOpcodes.BT_HCI_OP_LE_LTK_REQ_REPLY:             __leLTKRequestReply,
-                       CmdOpcodes.BT_HCI_OP_LE_LTK_REQ_NEG_REPLY:         __leLTKRequestReply,
-                       CmdOpcodes.BT_HCI_OP_LE_READ_SUPP_STATES:          __leReadSupportedStates,
-                       CmdOpcodes.BT_HCI_OP_LE_TEST_END:                  __leTestEnd,
-                       CmdOpcodes.BT_HCI_OP_LE_CONN_PARAM_REQ_REPLY:      __leRemoteConnectionParameterRequest,
-                       CmdOpcodes.BT_HCI_OP_LE_CONN_PARAM_REQ_NEG_REPLY:  __leRemoteConnectionParameterRequest,
-                       CmdOpcodes.BT_HCI_OP_LE_SET_DATA_LEN:              __leSetDataLength,
-                       CmdOpcodes.BT_HCI_OP_LE_READ_DEFAULT_DATA_LEN:     __leReadDefaultDataLength,
-                       CmdOpcodes.BT_HCI_OP_LE_READ_RL_SIZE:              __leReadListSize,
-                       CmdOpcodes.BT_HCI_OP_LE_READ_PEER_RPA:             __leReadResolvableAddress,
-                       CmdOpcodes.BT_HCI_OP_LE_READ_LOCAL_RPA:            __leReadResolvableAddress,
-                       CmdOpcodes.BT_HCI_OP_LE_READ_MAX_DATA_LEN:         __leReadMaximumDataLength,
-                       CmdOpcodes.BT_HCI_OP_LE_READ_PHY:                  __leReadPHY,
-                       CmdOpcodes.BT_HCI_OP_LE_SET_EXT_ADV_PARAM:         __leSetExtAdvParameters,
-                       CmdOpcodes.BT_HCI_OP_LE_READ_MAX_ADV_DATA_LEN:     __leReadMaxAdvDataLength,
-                       CmdOpcodes.BT_HCI_OP_LE_READ_NUM_ADV_SETS:         __leReadNoOfSupportedAdvSets,
-                       CmdOpcodes.BT_HCI_OP_LE_READ_PER_ADV_LIST_SIZE:    __leReadListSize,
-                       CmdOpcodes.BT_HCI_OP_LE_READ_TX_POWER:             __leReadTransmitPower,
-                       CmdOpcodes.BT_HCI_OP_LE_READ_RF_PATH_COMP:         __leReadRFPathCompensation,
+    __cceFuncs__ =   { CmdOpcodes.BT_HCI_OP_READ_TX_POWER_LEVEL:          EventLayout(4, 7, (('H', _CONNECTION_HANDLE), ('b', _TX_POWER_LEVEL))),
+                       CmdOpcodes.BT_HCI_OP_LE_READ_LE_HOST_SUPP:         EventLayout(4, 6, (('B', _LE_SUPPORTED_HOST), ('B', _LE_SIMULTANEOUS_HOST))),
+                       CmdOpcodes.BT_HCI_OP_READ_AUTH_PAYLOAD_TIMEOUT:    EventLayout(4, 8, (('H', _CONNECTION_HANDLE), ('H', _PAYLOAD_TIMEOUT))),
+                       CmdOpcodes.BT_HCI_OP_WRITE_AUTH_PAYLOAD_TIMEOUT:   _HANDLE_RESULT,
+                       CmdOpcodes.BT_HCI_OP_READ_LOCAL_VERSION_INFO:      EventLayout(4, 12, ('B', 'H', 'B', 'H', 'H'),
+                                                                                  lambda hciVersion, hciRevision, lmpVersion, manufacturer, lmpSubversion:
+                                                                                      (hciVersion, hciRevision, lmpVersion, lmpSubversion, manufacturer)),
+                       CmdOpcodes.BT_HCI_OP_READ_SUPPORTED_COMMANDS:      EventLayout(4, 68, ('64B',)),
+                       CmdOpcodes.BT_HCI_OP_READ_LOCAL_FEATURES:          _FEATURES_RESULT,
+                       CmdOpcodes.BT_HCI_OP_READ_BUFFER_SIZE:             EventLayout(4, 11, ('H', 'B', 'H', 'H')),
+                       CmdOpcodes.BT_HCI_OP_READ_BD_ADDR:                 _ADDRESS_RESULT,
+                       CmdOpcodes.BT_HCI_OP_READ_RSSI:                    EventLayout(4, 7, (('H', _CONNECTION_HANDLE), ('b', _RSSI))),
+                       CmdOpcodes.BT_HCI_OP_LE_READ_BUFFER_SIZE:          EventLayout(4, 7, ('H', 'B')),
+                       CmdOpcodes.BT_HCI_OP_LE_READ_LOCAL_FEATURES:       _FEATURES_RESULT,
+                       CmdOpcodes.BT_HCI_OP_LE_READ_ADV_CHAN_TX_POWER:    EventLayout(4, 5, (('b', _ADV_TX_POWER_LEVEL),)),
+                       CmdOpcodes.BT_HCI_OP_LE_READ_FAL_SIZE:             _LIST_SIZE_RESULT,
+                       CmdOpcodes.BT_HCI_OP_LE_READ_CHAN_MAP:             EventLayout(4, 11, (('H', _CONNECTION_HANDLE), ('5N', _CHANNEL_MAP))),
+                       CmdOpcodes.BT_HCI_OP_LE_ENCRYPT:                   EventLayout(4, 20, ('16B',)),
+                       CmdOpcodes.BT_HCI_OP_LE_RAND:                      EventLayout(4, 12, ('8N',)),
+                       CmdOpcodes.BT_HCI_OP_LE_LTK_REQ_REPLY:             _HANDLE_RESULT,
+                       CmdOpcodes.BT_HCI_OP_LE_LTK_REQ_NEG_REPLY:         _HANDLE_RESULT,
+                       CmdOpcodes.BT_HCI_OP_LE_READ_SUPP_STATES:          EventLayout(4, 12, ('8N',)),
+                       CmdOpcodes.BT_HCI_OP_LE_TEST_END:                  EventLayout(4, 6, ('H',)),
+                       CmdOpcodes.BT_HCI_OP_LE_CONN_PARAM_REQ_REPLY:      _HANDLE_RESULT,
+                       CmdOpcodes.BT_HCI_OP_LE_CONN_PARAM_REQ_NEG_REPLY:  _HANDLE_RESULT,
+                       CmdOpcodes.BT_HCI_OP_LE_SET_DATA_LEN:              _HANDLE_RESULT,
+                       CmdOpcodes.BT_HCI_OP_LE_READ_DEFAULT_DATA_LEN:     EventLayout(4, 8, (('H', _MAX_DATA_OCTETS), ('H', _MAX_DATA_TIME))),
+                       CmdOpcodes.BT_HCI_OP_LE_READ_RL_SIZE:              _LIST_SIZE_RESULT,
+                       CmdOpcodes.BT_HCI_OP_LE_READ_PEER_RPA:             _ADDRESS_RESULT,
+                       CmdOpcodes.BT_HCI_OP_LE_READ_LOCAL_RPA:            _ADDRESS_RESULT,
+                       CmdOpcodes.BT_HCI_OP_LE_READ_MAX_DATA_LEN:         EventLayout(4, 12, (('H', _MAX_DATA_OCTETS), ('H', _MAX_DATA_TIME), ('H', _MAX_DATA_OCTETS), ('H', _MAX_DATA_TIME))),
+                       CmdOpcodes.BT_HCI_OP_LE_READ_PHY:                  EventLayout(4, 8, (('H', _CONNECTION_HANDLE), ('B', _PHY), ('B', _PHY))),
+                       CmdOpcodes.BT_HCI_OP_LE_SET_EXT_ADV_PARAM:         EventLayout(4, 5, (('b', _SELECTED_TX_POWER),)),
+                       CmdOpcodes.BT_HCI_OP_LE_READ_MAX_ADV_DATA_LEN:     EventLayout(4, 6, (('H', _MAX_ADV_DATA_LENGTH),)),
+                       CmdOpcodes.BT_HCI_OP_LE_READ_NUM_ADV_SETS:         EventLayout(4, 5, (('B', _SUPPORTED_ADV_SETS),)),
+                       CmdOpcodes.BT_HCI_OP_LE_READ_PER_ADV_LIST_SIZE:    _LIST_SIZE_RESULT,
+                       CmdOpcodes.BT_HCI_OP_LE_READ_TX_POWER:             EventLayout(4, 6, (('b', _SELECTED_TX_POWER), ('b', _SELECTED_TX_POWER))),
+                       CmdOpcodes.BT_HCI_OP_LE_READ_RF_PATH_COMP:         EventLayout(4, 8, (('h', _RF_COMPENSATION), ('h', _RF_COMPENSATION))),
                        CmdOpcodes.BT_HCI_OP_LE_SET_CIG_PARAMETERS:        __leSetCigParameters,
-                       CmdOpcodes.BT_HCI_OP_LE_SET_CIG_PARAMETERS_TEST:   __leSetCigParametersTest,
-                       CmdOpcodes.BT_HCI_OP_LE_REMOVE_CIG:                __leRemoveCig,
-                       CmdOpcodes.BT_HCI_OP_LE_REJECT_CIS_REQUEST:        __leRejectCisRequest,
-                       CmdOpcodes.BT_HCI_OP_LE_SETUP_ISO_DATA_PATH:       __leSetupIsoPath,
-                       CmdOpcodes.BT_HCI_OP_LE_REMOVE_ISO_DATA_PATH:      __leRemoveIsoPath,
-                       CmdOpcodes.BT_HCI_OP_LE_ISO_TRANSMIT_TEST:         __leIsoTransmitTest,
-                       CmdOpcodes.BT_HCI_OP_LE_ISO_RECEIVE_TEST:          __leIsoReceiveTest,
-                       CmdOpcodes.BT_HCI_OP_LE_ISO_READ_TEST_COUNTERS:    __leIsoReadTestCounters,
-                       CmdOpcodes.BT_HCI_OP_LE_ISO_TEST_END:              __leIsoTestEnd,
-                       CmdOpcodes.BT_HCI_OP_LE_READ_BUFFER_SIZE_V2:       __leReadBufferSizeV2,
+                       CmdOpcodes.BT_HCI_OP_LE_SET_CIG_PARAMETERS_TEST:   __leSetCigParameters,
+                       CmdOpcodes.BT_HCI_OP_LE_REMOVE_CIG:                EventLayout(4, 5, ('B',)),
+                       CmdOpcodes.BT_HCI_OP_LE_REJECT_CIS_REQUEST:        _HANDLE_RESULT,
+                       CmdOpcodes.BT_HCI_OP_LE_SETUP_ISO_DATA_PATH:       _HANDLE_RESULT,
+                       CmdOpcodes.BT_HCI_OP_LE_REMOVE_ISO_DATA_PATH:      _HANDLE_RESULT,
+                       CmdOpcodes.BT_HCI_OP_LE_ISO_TRANSMIT_TEST:         _HANDLE_RESULT,
+                       CmdOpcodes.BT_HCI_OP_LE_ISO_RECEIVE_TEST:          _HANDLE_RESULT,
+                       CmdOpcodes.BT_HCI_OP_LE_ISO_READ_TEST_COUNTERS:    _ISO_COUNTERS_RESULT,
+                       CmdOpcodes.BT_HCI_OP_LE_ISO_TEST_END:              _ISO_COUNTERS_RESULT,
+                       CmdOpcodes.BT_HCI_OP_LE_READ_BUFFER_SIZE_V2:       EventLayout(4, 10, ('H', 'B', 'H', 'B')),
                        }
@@ -83,10 +83,10 @@ class Initiator:
         handle, role, interval = -1, -1, -1;
         localRPA = Address(None, None);
 
-        success = has_event(self.transport, idx, timeout)[0];
+        event = wait_for_event(self.transport, idx, None, timeout);
+        success = not event is None;
         if success:
-            event = get_event(self.transport, idx, 200);
-            self.trace.trace(7, str(event));
+            self.trace.trace(7, "%s", event);
             if event.subEvent == MetaEvents.BT_HCI_EVT_LE_CONN_COMPLETE:
                 self.status, handle, role, address, interval, latency, timeout, accuracy = event.decode();
                 success = self.status == 0;
@@ -104,11 +104,11 @@ class Initiator:
 
         handle, reason = -1, -1;
 
-        success, number_of_events = has_event(self.transport, idx, timeout);
+        event = wait_for_event(self.transport, idx, None, timeout);
+        success = not event is None;
 
-        while number_of_events > 0:
-            event = get_event(self.transport, idx, 200);
-            self.trace.trace(7, str(event));
+        while not event is None:
+            self.trace.trace(7, "%s", event);
             if event.event == Events.BT_HCI_EVT_DISCONN_COMPLETE:
                 self.status, handle, reason = event.decode();
                 success = self.status == 0;
@@ -118,7 +118,8 @@ class Initiator:
                 # other events. Discard them.
                 self.trace.trace(3, "Warning: Discarding event before disconnect % s" % str(event));
                 success = False;
-            number_of_events -= 1
+            # Only the events which are already there
+            event = wait_for_event(self.transport, idx, None, 0);
         return success, handle, reason;
 
     """
@@ -128,10 +129,10 @@ class Initiator:
     
         txPhys, rxPhys = -1, -1;
 
-        success = has_event(self.transport, idx, timeout)[0];
+        event = wait_for_event(self.transport, idx, None, timeout);
+        success = not event is None;
         if success:
-            event = get_event(self.transport, idx, 200);
-            self.trace.trace(7, str(event));
+            self.trace.trace(7, "%s", event);
             if event.subEvent == MetaEvents.BT_HCI_EVT_LE_PHY_UPDATE_COMPLETE:
                 self.status, handle, txPhys, rxPhys = event.decode();
                 success = self.status == 0;
@@ -146,10 +147,9 @@ class Initiator:
 
         handle, minInterval, maxInterval, latency, supervisionTimeout = -1, -1, -1, -1, -1;
 
-        success = has_event(self.transport, idx, timeout)[0];
-        while success:
-            event = get_event(self.transport, idx, 200);
-            self.trace.trace(7, str(event));
+        event = wait_for_event(self.transport, idx, None, timeout);
+        while not event is None:
+            self.trace.trace(7, "%s", event);
             if event.subEvent == MetaEvents.BT_HCI_EVT_LE_CONN_PARAM_REQ:
                 handle, minInterval, maxInterval, latency, supervisionTimeout = event.decode();
                 break;
@@ -159,8 +159,9 @@ class Initiator:
                     We could receive a LE Connection Parameter Update Complete Event instead - save it!
                 """
                 self.__savedEvent[idx] = event;
-                success = has_event(self.transport, idx, timeout)[0];
+                event = wait_for_event(self.transport, idx, None, timeout);
 
+        success = not event is None;
         return success, handle, minInterval, maxInterval, latency, supervisionTimeout;
 
     """
@@ -174,12 +175,11 @@ class Initiator:
             event = self.__savedEvent[idx];
             self.__savedEvent[idx] = None;
         else:
-            success = has_event(self.transport, idx, timeout)[0];
-            if success:
-                event = get_event(self.transport, idx, 200);
+            event = wait_for_event(self.transport, idx, None, timeout);
+            success = not event is None;
 
         if success:
-            self.trace.trace(7, str(event));
+            self.trace.trace(7, "%s", event);
             if event.subEvent == MetaEvents.BT_HCI_EVT_LE_CONN_UPDATE_COMPLETE:
                 status, handle, interval, latency, visionTimeout = event.decode();
                 success = status == 0;
@@ -217,7 +217,7 @@ class Initiator:
                                      self.supervisionTimeout, self.minCeLen, self.maxCeLen, 200);
 
             event = get_event(self.transport, self.initiator, 200);
-            self.trace.trace(7, str(event));
+            self.trace.trace(7, "%s", event);
             success = event.isCommandStatus();
             if success:
                 self.status = event.decode()[-1];
@@ -238,7 +238,7 @@ class Initiator:
             disconnect(self.transport, self.initiator, self.handles[0], reason, 200);
             while has_event(self.transport, self.initiator, 200)[0]:
                 event = get_event(self.transport, self.initiator, 200);
-                self.trace.trace(7, str(event));
+                self.trace.trace(7, "%s", event);
                 if event.isCommandStatus():
                     opcode, status = event.decode()[1:];
                     if opcode == HCICommands.BT_HCI_OP_DISCONNECT:
@@ -259,7 +259,7 @@ class Initiator:
 
         status = le_create_connection_cancel(self.transport, self.initiator, 200);
         event = get_event(self.transport, self.initiator, 200);
-        self.trace.trace(7, str(event));
+        self.trace.trace(7, "%s", event);
         return event.isCommandComplete() and (status == 0);
 
     """
@@ -274,7 +274,7 @@ class Initiator:
             self.status = le_connection_update(self.transport, self.initiator, self.handles[0], minInterval, maxInterval, latency, timeout, self.minCeLen, self.maxCeLen, 200);
 
             event = get_event(self.transport, self.initiator, 200);
-            self.trace.trace(7, str(event));
+            self.trace.trace(7, "%s", event);
             success = event.isCommandStatus() and (self.status == 0);
         except Exception as e:
             self.trace.trace(3, "LE Connection Update Command failed: %s" % str(e));
@@ -291,7 +291,7 @@ class Initiator:
             self.status = le_set_phy(self.transport, self.initiator, self.handles[0], allPhys, txPhys, rxPhys, optionPhys, 200);
 
             event = get_event(self.transport, self.initiator, 200);
-            self.trace.trace(7, str(event));
+            self.trace.trace(7, "%s", event);
             success = event.isCommandStatus() and (self.status == 0);
         except Exception as e:
             self.trace.trace(3, "LE Set PHY Command failed: %s" % str(e));
@@ -438,7 +438,7 @@ class Initiator:
                                                                           self.cpr_latency, self.cpr_timeout, self.minCeLen, self.maxCeLen, 100);
             success = status == 0;
             event = get_event(self.transport, self.peer, 200);
-            self.trace.trace(7, str(event));
+            self.trace.trace(7, "%s", event);
             success = success and (event.event == Events.BT_HCI_EVT_CMD_COMPLETE);
 
         return success;
@@ -456,7 +456,7 @@ class Initiator:
             status, handle = le_remote_connection_parameter_request_negative_reply(self.transport, self.peer, self.cpr_handle, reason, 200);
             success = status == 0;
             event = get_event(self.transport, self.peer, 200);
-            self.trace.trace(7, str(event));
+            self.trace.trace(7, "%s", event);
             success = success and (event.event == Events.BT_HCI_EVT_CMD_COMPLETE);
 
         return success;
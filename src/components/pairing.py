@@ -7,6 +7,7 @@ from components.basic_commands import *;
 from components.address import *;
 from components.smpdata import *;
 from components.events import *;
+import components.smpcrypto as smpcrypto;
 
 """
     Pairing is used to establish an encrypted link between two parties.
@@ -98,6 +99,7 @@ class Pairing:
 
     """
         Encrypt <plaintext> with the key <key>...
+        The encryption is done in the host (see components/smpcrypto.py), unless configured to be done by the controller
 
         Arguments:
             idx       - Number: holding the index of the device in which the encryption takes place
@@ -105,11 +107,21 @@ class Pairing:
             plaintext - Number: containing the message to be encrypted
     """
     def __encrypt(self, idx, key, plaintext):
-        status, encrypted = le_encrypt(self.transport, idx, toArray(key, 16), toArray(plaintext, 16), 2000);
-        success = status == 0;
-        event = get_event(self.transport, idx, 100);
-        success = success and event.isCommandComplete();
-        return success, toNumber(encrypted);
+        if smpcrypto.use_controller or smpcrypto.cross_check:
+            status, encrypted = le_encrypt(self.transport, idx, toArray(key, 16), toArray(plaintext, 16), 2000);
+            success = status == 0;
+            event = get_event(self.transport, idx, 100);
+            success = success and event.isCommandComplete();
+            if smpcrypto.use_controller:
+                return success, toNumber(encrypted);
+
+        result = smpcrypto.e(key, plaintext);
+        if smpcrypto.cross_check:
+            if success and toNumber(encrypted) != result:
+                self.trace.trace(3, "Host encryption result 0x%032X differs from the controller's 0x%032X" % (result, toNumber(encrypted)));
+                success = False;
+            return success, result;
+        return True, result;
 
     """
         Calculate the Pairing Confirm value:
@@ -129,6 +141,9 @@ class Pairing:
             c1 = e(tk, e(tk, rand XOR p1) XOR p2)
     """
     def __calcConfirm(self, idx, tk, rand, preq, pres, ia, ra):
+        if not (smpcrypto.use_controller or smpcrypto.cross_check):
+            return True, smpcrypto.c1(tk, rand, preq, pres, ia.type, ra.type, toNumber(ia.address), toNumber(ra.address));
+
         p1 = (((((pres << 56) | preq) << 8) | ra.type) << 8) | ia.type;
         p2 = (toNumber(ia.address) << 48) | toNumber(ra.address);
         p1 ^= rand;
@@ -153,6 +168,9 @@ class Pairing:
             s1 = e(tk, r)
     """
     def __calcSTK(self, idx, tk, r1, r2):
+        if not (smpcrypto.use_controller or smpcrypto.cross_check):
+            return True, smpcrypto.s1(tk, r1, r2);
+
         r1 &= 0x00FFFFFFFFFFFFFFFF;
         r2 &= 0x00FFFFFFFFFFFFFFFF;
         r1 = (r1 << 64) | r2;
@@ -430,7 +448,7 @@ class Pairing:
         status = le_start_encryption(self.transport, self.initiator.initiator, self.initiator.handles[0], rand, ediv, toArray(ltk, 16), 200);
         success = status == 0;
         event = get_event(self.transport, self.initiator.initiator, 100);
-        self.trace.trace(7, str(event));
+        self.trace.trace(7, "%s", event);
         success = success and event.isCommandStatus();
         while success:
 
@@ -438,7 +456,7 @@ class Pairing:
                 success = has_event(self.transport, self.initiator.peer, 100)[0];
                 while success:
                     event = get_event(self.transport, self.initiator.peer, 100);
-                    self.trace.trace(7, str(event));
+                    self.trace.trace(7, "%s", event);
                     success = event.subEvent == MetaEvents.BT_HCI_EVT_LE_LTK_REQUEST;
                     if not success:
                         break;
@@ -448,7 +466,7 @@ class Pairing:
                     if not success:
                         break;
                     event = get_event(self.transport, self.initiator.peer, 100);
-                    self.trace.trace(7, str(event));
+                    self.trace.trace(7, "%s", event);
                     success = event.event == Events.BT_HCI_EVT_CMD_COMPLETE;
                     if not success:
                         break;
@@ -456,7 +474,7 @@ class Pairing:
                     if not success:
                         break;
                     event = get_event(self.transport, self.initiator.peer, 100);
-                    self.trace.trace(7, str(event));
+                    self.trace.trace(7, "%s", event);
                     success = (event.event == Events.BT_HCI_EVT_ENCRYPT_CHANGE_V1) or (event.event == Events.BT_HCI_EVT_ENCRYPT_KEY_REFRESH_COMPLETE);
                     if not success:
                         break;
@@ -474,7 +492,7 @@ class Pairing:
             if not success:
                 break;
             event = get_event(self.transport, self.initiator.initiator, 100)[1:];
-            self.trace.trace(7, str(event));
+            self.trace.trace(7, "%s", event);
             success = (event.event == Events.BT_HCI_EVT_ENCRYPT_CHANGE_V1) or (event.event == Events.BT_HCI_EVT_ENCRYPT_KEY_REFRESH_COMPLETE);
             if not success:
                 break;
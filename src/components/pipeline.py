@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 Oticon A/S
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+    Pipelined execution of EDTT commands.
+
+    The command helpers in basic_commands.py send one request and then block
+    reading its response before the next request can be issued. A CommandPipeline
+    lets any of those helpers be queued instead:
+
+        with CommandPipeline(transport) as pipeline:
+            reset0 = pipeline.submit(reset, 0, 100)
+            reset1 = pipeline.submit(reset, 1, 100)
+        status0, status1 = reset0.result(), reset1.result()
+
+    On flush() all the queued requests are written at once (one write per device),
+    after which the responses are read back in order, using the very same helper
+    to parse them. The futures returned by submit() therefore hold exactly what
+    the helper would have returned when called directly.
+
+    Only the helper's first request(s), up to its first attempt to read a response
+    are pipelined. Helpers which poll (e.g. has_event) still work, their extra
+    requests are just sent directly during the flush. Once an EventPump is installed
+    on the transport, the event helpers (has_event, get_event, flush_events,
+    wait_for_event) are not pipelined at all: they only run during the flush, so the
+    buffered events are consumed in the order the helpers were submitted.
+"""
+
+from concurrent.futures import Future
+
+class _Deferred(Exception):
+    pass
+
+class _CapturingTransport:
+    """
+        Stands in for the transport while a command helper builds its request.
+        The frames are captured instead of being sent, and the helper is stopped
+        as soon as it attempts to read the response or to let time pass.
+        Only the attributes which neither talk to the devices nor let time pass are
+        taken from the transport; anything else is unknown to the helper, so new
+        receive methods of the transport can never be used behind the pipeline's back.
+        The event pump of the transport is not handed out either, as using it would
+        consume the buffered events (or read the devices) before the flush.
+    """
+    forwarded = frozenset(('last_t', 'get_last_t', 'get_time', 'low_level_device', 'n_devices',
+                           'default_to', 'Trace'))
+
+    def __init__(self, transport):
+        self.transport = transport
+        self.frames = []
+
+    def __getattr__(self, name):
+        if name not in self.forwarded:
+            raise AttributeError(name)
+        return getattr(self.transport, name)
+
+    @property
+    def event_pump(self):
+        if getattr(self.transport, 'event_pump', None):
+            raise _Deferred()
+        return None
+
+    @event_pump.setter
+    def event_pump(self, pump):
+        # Installing a pump is left to the flush
+        raise _Deferred()
+
+    def send(self, idx, message):
+        self.frames.append((idx, bytes(message)))
+
+    def recv(self, idx, number_bytes, to=None):
+        raise _Deferred()
+
+    def recv_frame(self, idx, to=None, payload_len=None):
+        raise _Deferred()
+
+    def recv_into(self, idx, buffer, number_bytes=None, to=None):
+        raise _Deferred()
+
+    def select(self, idxs, number_bytes, to=None):
+        raise _Deferred()
+
+    def recv_any(self, idxs, number_bytes, to=None):
+        raise _Deferred()
+
+    def wait(self, delay_in_ms):
+        raise _Deferred()
+
+    def wait_until_t(self, end_of_wait):
+        raise _Deferred()
+
+class _ReplayTransport:
+    """
+        Stands in for the transport while a command helper parses its response.
+        The frames which were already written by the pipeline are not sent again.
+    """
+    def __init__(self, transport, frames):
+        self.transport = transport
+        self.skip = len(frames)
+
+    def __getattr__(self, name):
+        return getattr(self.transport, name)
+
+    @property
+    def event_pump(self):
+        return getattr(self.transport, 'event_pump', None)
+
+    @event_pump.setter
+    def event_pump(self, pump):
+        # A pump installed by the helper must outlive the pipeline
+        self.transport.event_pump = pump
+
+    def send(self, idx, message):
+        if self.skip > 0:
+            self.skip -= 1
+        else:
+            self.transport.send(idx, message)
+
+class CommandPipeline:
+    """
+        Constructor:
+            transport - EDTT transport object
+    """
+    def __init__(self, transport):
+        self.transport = transport
+        self.pending = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        futures = self.flush()
+        if exc_type is None:
+            for future in futures:
+                future.result()
+        return False
+
+    """
+        Queue the command helper <command> for device <idx>; The remaining arguments are passed to it as is.
+        Returns a Future which will hold the result of the command once the pipeline has been flushed.
+    """
+    def submit(self, command, idx, *args, **kwargs):
+        future = Future()
+        capture = _CapturingTransport(self.transport)
+        try:
+            command(capture, idx, *args, **kwargs)
+        except _Deferred:
+            pass
+        except Exception as e:
+            future.set_exception(e)
+            return future
+
+        self.pending.append((command, idx, args, kwargs, capture.frames, future))
+        return future
+
+    """
+        Write all queued requests, one write per device, and then collect all the responses in order.
+        Returns the list of futures which were flushed.
+    """
+    def flush(self):
+        pending, self.pending = self.pending, []
+
+        frames = {}
+        for _, _, _, _, sent, _ in pending:
+            for idx, message in sent:
+                frames.setdefault(idx, []).append(message)
+
+        send_many = getattr(self.transport, 'send_many', None)
+        for idx, messages in frames.items():
+            if send_many:
+                send_many(idx, messages)
+            else:
+                for message in messages:
+                    self.transport.send(idx, message)
+
+        failed = set()
+        for command, idx, args, kwargs, sent, future in pending:
+            if idx in failed:
+                # The responses for this device can no longer be told apart
+                future.set_exception(Exception("Pipelined command aborted due to an earlier failure on device %i" % idx))
+                continue
+            try:
+                future.set_result(command(_ReplayTransport(self.transport, sent), idx, *args, **kwargs))
+            except Exception as e:
+                failed.add(idx)
+                future.set_exception(e)
+
+        return [future for _, _, _, _, _, future in pending]
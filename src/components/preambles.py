@@ -8,6 +8,8 @@ from components.basic_commands import *;
 from components.address import *;
 from components.events import *;
 from components.scanner import *;
+from components.pipeline import CommandPipeline;
+import components.smpcrypto as smpcrypto;
 
 # class LE_Events(IntFlag):
 #     LE_Connection_Complete_Event                   = 1<<0
@@ -35,31 +37,50 @@ from components.scanner import *;
 def __verifyAndShowEvent(transport, idx, expectedEvent, trace):
 
     event = get_event(transport, idx, 100);
-    trace.trace(7, str(event));
+    trace.trace(7, "%s", event);
     return event.event == expectedEvent;
 
 def __verifyAndShowMetaEvent(transport, idx, expectedEvent, trace):
 
     event = get_event(transport, idx, 100);
-    trace.trace(7, str(event));
+    trace.trace(7, "%s", event);
     return event.subEvent == expectedEvent;
 
 def __verifyAndFetchEvent(transport, idx, expectedEvent, trace):
 
     event = get_event(transport, idx, 100)[1:];
-    trace.trace(7, str(event));
+    trace.trace(7, "%s", event);
     return event.event == expectedEvent, event.data;
 
 def __verifyAndFetchMetaEvent(transport, idx, expectedEvent, trace):
 
     event = get_event(transport, idx, 100)[1:];
-    trace.trace(7, str(event));
+    trace.trace(7, "%s", event);
     return event.subEvent == expectedEvent, event.data;
 
 def __getCommandCompleteEvent(transport, idx, trace):
 
     return __verifyAndShowEvent(transport, idx, Events.BT_HCI_EVT_CMD_COMPLETE, trace);
 
+"""
+    Results of preamble steps which only depend on the device (and not on what the previous tests did with it).
+    They are calculated once, and reused by the following preambles, unless caching is disabled
+"""
+_preamble_cache = {};
+_preamble_cache_enabled = True;
+
+def preamble_cache_enable(enable):
+    global _preamble_cache_enabled
+    _preamble_cache_enabled = enable;
+    _preamble_cache.clear();
+
+def __cached(key):
+    return _preamble_cache.get(key) if _preamble_cache_enabled else None;
+
+def __cache(key, value):
+    if _preamble_cache_enabled:
+        _preamble_cache[key] = value;
+
 def __random(transport, idx, trace):
     status, rand = le_rand(transport, idx, 100);
     trace.trace(6, "LE Rand Command returns status: 0x%02X; rand: 0x%016X" % (status, toNumber(rand)));
@@ -67,10 +88,20 @@ def __random(transport, idx, trace):
     return success, rand;
 
 def __encrypt(transport, idx, key, plaintext, trace):
-    status, encrypted = le_encrypt(transport, idx, key, plaintext, 2000);
-    trace.trace(6, "LE Encrypt Command returns status: 0x%02X" % status);
-    success = __getCommandCompleteEvent(transport, idx, trace) and (status == 0);
-    return success, encrypted;
+    if smpcrypto.use_controller or smpcrypto.cross_check:
+        status, encrypted = le_encrypt(transport, idx, key, plaintext, 2000);
+        trace.trace(6, "LE Encrypt Command returns status: 0x%02X" % status);
+        success = __getCommandCompleteEvent(transport, idx, trace) and (status == 0);
+        if smpcrypto.use_controller:
+            return success, encrypted;
+
+    result = toArray(smpcrypto.e(toNumber(key), toNumber(plaintext)), 16);
+    if smpcrypto.cross_check:
+        if success and list(encrypted) != result:
+            trace.trace(3, "Host encryption result 0x%032X differs from the controller's 0x%032X" % (toNumber(result), toNumber(encrypted)));
+            success = False;
+        return success, result;
+    return True, result;
 
 """
     Prepare for testing, by
@@ -85,8 +116,9 @@ def preamble_standby(transport, idx, trace):
     trace.trace(3, "Standby preamble steps...");
 
     try:
-        flush_events(transport, idx, 100);
-        le_data_flush(transport, idx, 100);
+        with CommandPipeline(transport) as pipeline:
+            pipeline.submit(flush_events, idx, 100);
+            pipeline.submit(le_data_flush, idx, 100);
 
         status = reset(transport, idx, 100);
         trace.trace(6, "Reset Command returns status: 0x%02X" % status);
@@ -94,16 +126,25 @@ def preamble_standby(transport, idx, trace):
         if not success:
             trace.trace(6, "RESET command not confirmed!");
 
-        status, features = read_local_supported_features(transport, idx, 100);
-        trace.trace(6, "Read Local Supported Features Command returns status: 0x%02X" % status);
         """
-            Check that features 'BR/EDR Not Supported' and 'LE Supported (Controller)' are both enabled
+            The supported features do not change, so they only need to be checked once
         """
-        success = __getCommandCompleteEvent(transport, idx, trace) and (status == 0) and ((features[4] & 0x60) == 0x60) and success;
-
-        status, features = le_read_local_supported_features(transport, idx, 100);
-        trace.trace(6, "LE Read Local Supported Features Command returns status: 0x%02X" % status);
-        success = __getCommandCompleteEvent(transport, idx, trace) and (status == 0) and success;
+        if __cached(('features', idx)):
+            trace.trace(6, "Local Supported Features already verified");
+        else:
+            status, features = read_local_supported_features(transport, idx, 100);
+            trace.trace(6, "Read Local Supported Features Command returns status: 0x%02X" % status);
+            """
+                Check that features 'BR/EDR Not Supported' and 'LE Supported (Controller)' are both enabled
+            """
+            _success = __getCommandCompleteEvent(transport, idx, trace) and (status == 0) and ((features[4] & 0x60) == 0x60);
+
+            status, features = le_read_local_supported_features(transport, idx, 100);
+            trace.trace(6, "LE Read Local Supported Features Command returns status: 0x%02X" % status);
+            _success = __getCommandCompleteEvent(transport, idx, trace) and (status == 0) and _success;
+            if _success:
+                __cache(('features', idx), True);
+            success = _success and success;
         """
             Bit Parameter Description
              0 Inquiry Complete Event
@@ -252,6 +293,16 @@ def __calculateIRK(transport, idx, key, trace):
     success, irk = __encrypt(transport, idx, key, plaintext, trace);
     return success, irk;
 
+"""
+    Calculate the random address hash ah(IRK, r) of the 24 bit Number r
+"""
+def __hash(transport, idx, key, r, trace):
+    if not (smpcrypto.use_controller or smpcrypto.cross_check):
+        return True, smpcrypto.ah(toNumber(key), r);
+
+    success, localHash = __encrypt(transport, idx, key, toArray(r, 16), trace);
+    return success, toNumber(localHash) & 0xFFFFFF;
+
 """
     Generate a random static address from IRK
 """
@@ -259,10 +310,9 @@ def preamble_random_static_address(transport, idx, key, trace):
     success, rand = __random(transport, idx, trace);
 
     nrand = (toNumber(rand) & 0xFFFFFF) | 0xC00000;
-    _success, localHash = __encrypt(transport, idx, key, toArray(nrand, 16), trace);
+    _success, nlocalHash = __hash(transport, idx, key, nrand, trace);
     success = success and _success;
 
-    nlocalHash = toNumber(localHash) & 0xFFFFFF;
     address = nlocalHash | (nrand << 24);
     return success, toArray(address, 6);
 
@@ -273,10 +323,9 @@ def preamble_random_non_resolvable_address(transport, idx, key, trace):
     success, rand = __random(transport, idx, trace);
 
     nrand = toNumber(rand) & 0x3FFFFF;
-    _success, localHash = __encrypt(transport, idx, key, toArray(nrand, 16), trace);
+    _success, nlocalHash = __hash(transport, idx, key, nrand, trace);
     success = success and _success;
 
-    nlocalHash = toNumber(localHash) & 0xFFFFFF;
     address = nlocalHash | (nrand << 24);
     return success, toArray(address, 6);
 
@@ -319,6 +368,12 @@ def preamble_random_address_calculated(transport, idx, key, trace):
 def preamble_encryption_keys_calculated(transport, idx, trace):
     trace.trace(4, "Encryption Keys Calculated preamble steps...");
 
+    cached = __cached(('encryption_keys', idx));
+    if cached:
+        trace.trace(6, "Reusing previously calculated encryption keys");
+        rand, ediv, ltk = cached;
+        return True, rand, ediv, list(ltk)
+
     try:
         success, div = __random(transport, idx, trace);
 
@@ -347,6 +402,9 @@ def preamble_encryption_keys_calculated(transport, idx, trace):
         ediv = [0 for _ in range(2)];
         ltk  = [0 for _ in range(16)];
 
+    if success:
+        __cache(('encryption_keys', idx), (toNumber(rand), toNumber(ediv), ltk));
+
     return success, toNumber(rand), toNumber(ediv), ltk
 
 def preamble_set_public_address(transport, idx, address, trace):
@@ -421,7 +479,14 @@ def preamble_device_address_set(transport, idx, trace):
         ir = 0x00112233445566778899AABBCCDDEEFF if idx == 0 else 0x112233445566778899AABBCCDDEEFF00;
         trace.trace(6, "Using default identity root value ir: 0x%032X" % ir);
 
-        success, irk, randAddress = preamble_random_address_calculated(transport, idx, toArray(ir, 16), trace);
+        cached = __cached(('device_address', idx, ir));
+        if cached:
+            trace.trace(6, "Reusing previously calculated IRK and random address");
+            irk, randAddress = list(cached[0]), list(cached[1]);
+        else:
+            success, irk, randAddress = preamble_random_address_calculated(transport, idx, toArray(ir, 16), trace);
+            if success:
+                __cache(('device_address', idx, ir), (irk, randAddress));
         trace.trace(6, "Generated IRK: 0x%032X" % toNumber(irk));
         trace.trace(6, "Generated random address %s" % formatAddress(randAddress));
         success = True;
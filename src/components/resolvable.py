@@ -42,7 +42,7 @@ class ResolvableAddresses:
 
     def __verifyAndShowEvent(self, expectedEvent):
         event = get_event(self.transport, self.idx, 100);
-        self.trace.trace(7, str(event));
+        self.trace.trace(7, "%s", event);
         return event.event == expectedEvent;
 
     def __getCommandCompleteEvent(self):
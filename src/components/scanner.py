@@ -97,7 +97,7 @@ class Scanner:
     
     def __verifyAndShowEvent(self, expectedEvent):
         event = get_event(self.transport, self.idx, 200);
-        self.trace.trace(7, str(event));
+        self.trace.trace(7, "%s", event);
         return event.event == expectedEvent;
 
     def __commandCompleteEvent(self):
@@ -138,34 +138,32 @@ class Scanner:
         else:
             self.firstTime = thisTime;
 
-    def __handleReport(self, prevTime):
-
-        for event in get_event(self.transport, self.idx, 200, True):
-
-            if event.subEvent == MetaEvents.BT_HCI_EVT_LE_ADVERTISING_REPORT:
-
-                eventType, address, data = event.decode()[0:3];
-                if   eventType == self.reportType:
-                    self.reports += 1;
-                    self.reportData = data[:];
-                    self.reportAddress = address;
-                    self.__updateDeltas(self.reports, event.time, prevTime);
-                    prevTime = event.time;
-                elif eventType == AdvertisingReport.SCAN_RSP:
-                    self.responses += 1;
-                    self.responseData = data[:];
-                    self.responseAddress = address;
-
-            elif event.subEvent == MetaEvents.BT_HCI_EVT_LE_DIRECT_ADV_REPORT:
-
-                eventType, address, targetAddress = event.decode()[0:3];
-                if eventType == self.reportType:
-                    self.directReports += 1;
-                    self.reportData = [];
-                    self.reportAddress = address;
-                    self.targetAddress = targetAddress;
-                    self.__updateDeltas(self.directReports, event.time, prevTime);
-                    prevTime = event.time;
+    def __handleReport(self, event, prevTime):
+
+        if event.subEvent == MetaEvents.BT_HCI_EVT_LE_ADVERTISING_REPORT:
+
+            eventType, address, data = event.decode()[0:3];
+            if   eventType == self.reportType:
+                self.reports += 1;
+                self.reportData = data[:];
+                self.reportAddress = address;
+                self.__updateDeltas(self.reports, event.time, prevTime);
+                prevTime = event.time;
+            elif eventType == AdvertisingReport.SCAN_RSP:
+                self.responses += 1;
+                self.responseData = data[:];
+                self.responseAddress = address;
+
+        elif event.subEvent == MetaEvents.BT_HCI_EVT_LE_DIRECT_ADV_REPORT:
+
+            eventType, address, targetAddress = event.decode()[0:3];
+            if eventType == self.reportType:
+                self.directReports += 1;
+                self.reportData = [];
+                self.reportAddress = address;
+                self.targetAddress = targetAddress;
+                self.__updateDeltas(self.directReports, event.time, prevTime);
+                prevTime = event.time;
 
         return prevTime;
 
@@ -174,8 +172,9 @@ class Scanner:
         prevTime = 0;
         while max(self.reports, self.directReports, self.counts/2) < self.expectedReports:
 
-            if has_event(self.transport, self.idx, 200)[0]:
-                prevTime = self.__handleReport(prevTime);
+            event = wait_for_event(self.transport, self.idx, None, 200);
+            if event:
+                prevTime = self.__handleReport(event, prevTime);
             else:
                 if self.lastTime == 0:
                     self.lastTime = prevTime;
@@ -187,8 +186,9 @@ class Scanner:
         while (max(self.reports, self.directReports, self.counts/2) < self.expectedReports) or \
               (max(self.responses, self.reports/5, self.counts) < self.expectedResponses):
 
-            if has_event(self.transport, self.idx, 200)[0]:
-                prevTime = self.__handleReport(prevTime);
+            event = wait_for_event(self.transport, self.idx, None, 200);
+            if event:
+                prevTime = self.__handleReport(event, prevTime);
             else:
                 if self.lastTime == 0:
                     self.lastTime = prevTime;
@@ -204,8 +204,9 @@ class Scanner:
         prevTime = 0;
         while self.lastTime == 0:
 
-            if has_event(self.transport, self.idx, 200)[0]:
-                prevTime = self.__handleReport(prevTime);
+            event = wait_for_event(self.transport, self.idx, None, 200);
+            if event:
+                prevTime = self.__handleReport(event, prevTime);
             else:
                 self.lastTime = prevTime;
     
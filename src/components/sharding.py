@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 Oticon A/S
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+    Support for splitting a test run in shards, each one executed by its own EDTT
+    against its own simulation, and for merging back the results of all of them.
+
+    The test list is first built (and shuffled) exactly as for a normal run, so
+    with the same --seed all shards agree on it, and on which tests each one runs.
+    A failure seen in a shard can so be replayed running that shard alone, or
+    running the exact list of tests stored in its results file (see read_tests()).
+"""
+
+import heapq
+import json
+import os
+import struct
+
+"""
+    Select the tests for shard <shard> (out of <shards>) from the ordered list <tests>
+    (round-robin)
+"""
+def shard_tests(tests, shards, shard):
+    if shards < 1 or not (0 <= shard < shards):
+        raise Exception("Invalid shard %i (of %i shards)" % (shard, shards))
+    return tests[shard::shards]
+
+"""
+    Store the results of a shard
+    <tests> is the list of the tests selected for the shard, in execution order
+    <results> is a list of (test name, "PASSED"/"FAILED"/"UNKNOWN") tuples, in execution order
+"""
+def write_results(file_name, shards, shard, seed, tests, results):
+    content = {
+        "shards": shards,
+        "shard": shard,
+        "seed": seed,
+        "tests": tests,
+        "results": [{"name": name, "result": result} for name, result in results]
+    }
+    with open(file_name, "w") as file:
+        json.dump(content, file, indent=1)
+
+"""
+    The list of the tests selected for a shard, from its results file (see write_results())
+    Returns None if <file_name> is not a results file (e.g. a plain list of test names)
+"""
+def read_tests(file_name):
+    try:
+        with open(file_name, "r") as file:
+            content = json.load(file)
+    except ValueError:
+        return None
+    if not isinstance(content, dict) or not "tests" in content:
+        return None
+    return content["tests"]
+
+"""
+    Load the results of several shards, as stored by write_results()
+    Returns a list of (shard, test name, result) tuples
+"""
+def merge_results(file_names):
+    merged = []
+    for file_name in file_names:
+        with open(file_name, "r") as file:
+            content = json.load(file)
+        for entry in content["results"]:
+            merged.append((content["shard"], entry["name"], entry["result"]))
+    return merged
+
+"""
+    Print a summary of merged results in the same format as a normal run.
+    Returns the number of tests which did not pass
+"""
+def print_summary(merged):
+    nameLen = max([len(name) for _, name, _ in merged], default=0)
+    counts = {}
+    for shard, name, result in merged:
+        print("%-*s shard %i %s" % (nameLen, name, shard, result))
+        counts[result] = counts.get(result, 0) + 1
+
+    print("\nSummary:\n\nStatus   Count\n%s" % ('='*14))
+    for result, label in (("PASSED", "PASS"), ("FAILED", "FAIL"), ("UNKNOWN", "UNKNOWN")):
+        if counts.get(result, 0) > 0:
+            print("%s%*d" % (label, 14 - len(label), counts[result]))
+    print("%s\nTotal%9d" % ('='*14, len(merged)))
+
+    return len(merged) - counts.get("PASSED", 0)
+
+BTSNOOP_HEADER_LEN = 16
+BTSNOOP_RECORD_HDR = struct.Struct(">LLLLQ")
+
+def _btsnoop_records(file_name, index_offset):
+    with open(file_name, "rb") as file:
+        if len(file.read(BTSNOOP_HEADER_LEN)) != BTSNOOP_HEADER_LEN:
+            return
+        while True:
+            hdr = file.read(BTSNOOP_RECORD_HDR.size)
+            if len(hdr) != BTSNOOP_RECORD_HDR.size:
+                return
+            orig_len, incl_len, flags, drops, timestamp = BTSNOOP_RECORD_HDR.unpack(hdr)
+            data = file.read(incl_len)
+            # The controller index is the upper half of the flags
+            flags = (((flags >> 16) + index_offset) << 16) | (flags & 0xFFFF)
+            yield timestamp, BTSNOOP_RECORD_HDR.pack(orig_len, incl_len, flags, drops, timestamp) + data
+
+"""
+    Merge the btsnoop files of several shards into one, ordered by timestamp.
+    The controller indexes of the n'th file are offset by n*<index_stride>, so
+    the devices of each shard can be told apart. Files which do not exist are skipped
+"""
+def merge_btsnoop(out_file_name, file_names, index_stride=16):
+    header = None
+    file_names = [(n, file_name) for n, file_name in enumerate(file_names) if os.path.isfile(file_name)]
+    for _, file_name in file_names:
+        with open(file_name, "rb") as file:
+            header = file.read(BTSNOOP_HEADER_LEN)
+        if len(header) == BTSNOOP_HEADER_LEN:
+            break
+    if not header:
+        return
+
+    with open(out_file_name, "wb") as out:
+        out.write(header)
+        streams = [_btsnoop_records(file_name, n*index_stride) for n, file_name in file_names]
+        for _, record in heapq.merge(*streams, key=lambda entry: entry[0]):
+            out.write(record)
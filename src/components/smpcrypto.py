@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 Oticon A/S
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+    Host side implementation of the Bluetooth security toolbox functions [Vol 3] Part H, Section 2.2
+    (e, c1, s1, ah, AES-CMAC, f4, f5, f6 and g2), so the tests need not ask a controller to do the AES
+    encryptions with the HCI LE Encrypt command.
+
+    All values are Numbers, where the most significant octet is the first one in the specification's
+    notation. So e(key, plaintext) gives the same Number as toNumber() of the encrypted data returned by
+    the LE Encrypt command for toArray(key, 16) and toArray(plaintext, 16).
+"""
+
+"""
+    Whether Pairing and the preambles do the AES encryptions in the controller (instead of in the host),
+    and whether, when done in the host, each result is cross-checked against the controller
+"""
+use_controller = False
+cross_check = False
+
+def configure(controller=False, check=False):
+    global use_controller, cross_check
+    use_controller = controller
+    cross_check = check
+
+def __build_tables():
+    # GF(2^8) exponentiation/logarithm tables (generator 3) to derive the S-box
+    exp, log = [0]*256, [0]*256
+    x = 1
+    for i in range(255):
+        exp[i] = x
+        log[x] = i
+        x ^= (x << 1) ^ (0x11B if x & 0x80 else 0)
+    sbox = [0]*256
+    for i in range(256):
+        inv = exp[(255 - log[i]) % 255] if i else 0
+        s = inv
+        for shift in range(1, 5):
+            s ^= ((inv << shift) | (inv >> (8 - shift))) & 0xFF
+        sbox[i] = s ^ 0x63
+    # Combined SubBytes + MixColumns tables, one per row of the column
+    def xtime(b):
+        return ((b << 1) ^ 0x1B) & 0xFF if b & 0x80 else b << 1
+    t0, t1, t2, t3 = [], [], [], []
+    for i in range(256):
+        s = sbox[i]
+        s2 = xtime(s)
+        s3 = s2 ^ s
+        t0.append((s2 << 24) | (s << 16) | (s << 8) | s3)
+        t1.append((s3 << 24) | (s2 << 16) | (s << 8) | s)
+        t2.append((s << 24) | (s3 << 16) | (s2 << 8) | s)
+        t3.append((s << 24) | (s << 16) | (s3 << 8) | s2)
+    return sbox, t0, t1, t2, t3
+
+_SBOX, _T0, _T1, _T2, _T3 = __build_tables()
+_RCON = [0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80, 0x1B, 0x36]
+
+"""
+    Expand the 128 bit Number <key> into the 44 words of the AES-128 key schedule
+"""
+def expand_key(key):
+    w = [(key >> (96 - 32*i)) & 0xFFFFFFFF for i in range(4)]
+    sbox = _SBOX
+    for i in range(4, 44):
+        t = w[i - 1]
+        if i % 4 == 0:
+            t = ((t << 8) & 0xFFFFFFFF) | (t >> 24)
+            t = (sbox[t >> 24] << 24) | (sbox[(t >> 16) & 0xFF] << 16) | (sbox[(t >> 8) & 0xFF] << 8) | sbox[t & 0xFF]
+            t ^= _RCON[i//4 - 1] << 24
+        w.append(w[i - 4] ^ t)
+    return w
+
+"""
+    Encrypt the 128 bit Number <block> with an expanded key (see expand_key())
+"""
+def encrypt_block(w, block):
+    T0, T1, T2, T3, sbox = _T0, _T1, _T2, _T3, _SBOX
+    s0 = ((block >> 96) & 0xFFFFFFFF) ^ w[0]
+    s1 = ((block >> 64) & 0xFFFFFFFF) ^ w[1]
+    s2 = ((block >> 32) & 0xFFFFFFFF) ^ w[2]
+    s3 = (block & 0xFFFFFFFF) ^ w[3]
+    for r in range(1, 10):
+        k = 4*r
+        s0, s1, s2, s3 = (
+            T0[s0 >> 24] ^ T1[(s1 >> 16) & 0xFF] ^ T2[(s2 >> 8) & 0xFF] ^ T3[s3 & 0xFF] ^ w[k],
+            T0[s1 >> 24] ^ T1[(s2 >> 16) & 0xFF] ^ T2[(s3 >> 8) & 0xFF] ^ T3[s0 & 0xFF] ^ w[k + 1],
+            T0[s2 >> 24] ^ T1[(s3 >> 16) & 0xFF] ^ T2[(s0 >> 8) & 0xFF] ^ T3[s1 & 0xFF] ^ w[k + 2],
+            T0[s3 >> 24] ^ T1[(s0 >> 16) & 0xFF] ^ T2[(s1 >> 8) & 0xFF] ^ T3[s2 & 0xFF] ^ w[k + 3])
+    out = 0
+    for a, b, c, d, k in ((s0, s1, s2, s3, w[40]), (s1, s2, s3, s0, w[41]), (s2, s3, s0, s1, w[42]), (s3, s0, s1, s2, w[43])):
+        out = (out << 32) | (((sbox[a >> 24] << 24) | (sbox[(b >> 16) & 0xFF] << 16) | (sbox[(c >> 8) & 0xFF] << 8) | sbox[d & 0xFF]) ^ k)
+    return out
+
+"""
+    Security function e: AES-128 encryption of <plaintext> with <key> (both 128 bit Numbers)
+"""
+def e(key, plaintext):
+    return encrypt_block(expand_key(key), plaintext)
+
+"""
+    Security function e for many plaintexts with the same key (the key is only expanded once)
+"""
+def e_batch(key, plaintexts):
+    w = expand_key(key)
+    return [encrypt_block(w, plaintext) for plaintext in plaintexts]
+
+"""
+    Confirm value generation function c1 (LE legacy pairing)
+
+    k, r - 128 bits; preq, pres - 56 bits; iat, rat - 1 bit (address types); ia, ra - 48 bits
+"""
+def c1(k, r, preq, pres, iat, rat, ia, ra):
+    p1 = (pres << 72) | (preq << 16) | (rat << 8) | iat
+    p2 = (ia << 48) | ra
+    w = expand_key(k)
+    return encrypt_block(w, encrypt_block(w, r ^ p1) ^ p2)
+
+"""
+    Key generation function s1 (LE legacy pairing); The 64 least significant bits of r1 and r2 are used
+"""
+def s1(k, r1, r2):
+    return e(k, ((r1 & 0xFFFFFFFFFFFFFFFF) << 64) | (r2 & 0xFFFFFFFFFFFFFFFF))
+
+"""
+    Random address hash function ah; k - 128 bits, r - 24 bits
+"""
+def ah(k, r):
+    return e(k, r & 0xFFFFFF) & 0xFFFFFF
+
+"""
+    AES-CMAC (RFC 4493) of the octets <message> with the 128 bit Number <key>
+"""
+def aes_cmac(key, message):
+    w = expand_key(key)
+    mask = (1 << 128) - 1
+    l = encrypt_block(w, 0)
+    k1 = ((l << 1) & mask) ^ (0x87 if l >> 127 else 0)
+    k2 = ((k1 << 1) & mask) ^ (0x87 if k1 >> 127 else 0)
+
+    blocks = max(1, (len(message) + 15)//16)
+    last = message[16*(blocks - 1):]
+    if len(last) == 16:
+        last = int.from_bytes(last, 'big') ^ k1
+    else:
+        last = int.from_bytes(last + b'\x80' + bytes(15 - len(last)), 'big') ^ k2
+
+    x = 0
+    for i in range(blocks - 1):
+        x = encrypt_block(w, x ^ int.from_bytes(message[16*i:16*i + 16], 'big'))
+    return encrypt_block(w, x ^ last)
+
+def __octets(*fields):
+    # Concatenate (value, number of bits) fields, most significant first
+    value, bits = 0, 0
+    for field, size in fields:
+        value = (value << size) | field
+        bits += size
+    return value.to_bytes(bits//8, 'big')
+
+"""
+    LE Secure Connections confirm value generation function f4; U, V - 256 bits, X - 128 bits, Z - 8 bits
+"""
+def f4(U, V, X, Z):
+    return aes_cmac(X, __octets((U, 256), (V, 256), (Z, 8)))
+
+"""
+    LE Secure Connections key generation function f5; W - 256 bits, N1, N2 - 128 bits, A1, A2 - 56 bits
+    Returns (MacKey, LTK)
+"""
+def f5(W, N1, N2, A1, A2):
+    T = aes_cmac(0x6C888391AAF5A53860370BDB5A6083BE, __octets((W, 256)))
+    keyID = 0x62746C65
+    return tuple(aes_cmac(T, __octets((counter, 8), (keyID, 32), (N1, 128), (N2, 128), (A1, 56), (A2, 56), (256, 16))) for counter in (0, 1))
+
+"""
+    LE Secure Connections check value generation function f6; W, N1, N2, R - 128 bits, IOcap - 24 bits, A1, A2 - 56 bits
+"""
+def f6(W, N1, N2, R, IOcap, A1, A2):
+    return aes_cmac(W, __octets((N1, 128), (N2, 128), (R, 128), (IOcap, 24), (A1, 56), (A2, 56)))
+
+"""
+    LE Secure Connections numeric comparison value generation function g2; U, V - 256 bits, X, Y - 128 bits
+"""
+def g2(U, V, X, Y):
+    return aes_cmac(X, __octets((U, 256), (V, 256), (Y, 128))) & 0xFFFFFFFF
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 Oticon A/S
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+    Tracing of the EDTT: messages with a verbosity level, optionally belonging to a subsystem (e.g. 'transport'),
+    printed with the simulation time at which they were traced, and optionally also written to a JSON lines file.
+
+    A message is only formatted when its level is enabled, so callers in hot loops shall pass a format string and
+    its arguments instead of formatting the message themselves:
+
+        trace.trace(8, "Recv of %iB from dev %d", number_bytes, idx, subsystem='transport')
+"""
+
+import atexit
+import json
+
+"""
+    Format the simulation time <t> (microseconds) as hh:mm:ss.uuuuuu
+"""
+def format_time(t):
+    if t is None:
+        return '--:--:--.------'
+    ss, us = divmod(int(t), 1000000)
+    mm, ss = divmod(ss, 60)
+    hh, mm = divmod(mm, 60)
+    return "%02d:%02d:%02d.%06d" % (hh, mm, ss, us)
+
+"""
+    Parse a list of per subsystem verbosity levels like "transport=8,dump=5" into a dictionary
+"""
+def parse_levels(text):
+    levels = {}
+    for item in text.split(','):
+        if item.strip():
+            subsystem, _, level = item.partition('=')
+            levels[subsystem.strip()] = int(level)
+    return levels
+
+class Trace():
+    """
+        Constructor:
+            level     - Verbosity level; Messages of a higher level are discarded
+            levels    - Verbosity levels per subsystem (e.g. {'transport': 8}), used instead of <level> for
+                        the messages of those subsystems
+            json_file - File where the messages are also written, one JSON object per line with the simulation
+                        time 't' (microseconds, None before the transport is connected), 'level', 'subsystem',
+                        'msg' and, for messages traced with arguments, 'fmt' and 'args'
+    """
+    def __init__(self, level, levels=None, json_file=None):
+        self.level = level;
+        self.levels = {}
+        self.__max_level = level
+        self.transport = None
+        self.btsnoop = None
+        self.json = None
+        for subsystem, subsystem_level in (levels or {}).items():
+            self.set_level(subsystem_level, subsystem)
+        if json_file:
+            self.json = open(json_file, 'w')
+            atexit.register(self.close)
+
+    """
+        Change the verbosity level of <subsystem> (or the default one)
+    """
+    def set_level(self, level, subsystem=None):
+        if subsystem is None:
+            self.level = level
+        else:
+            self.levels[subsystem] = level
+        self.__max_level = max([self.level] + list(self.levels.values()))
+
+    """
+        Whether messages of <level> (of <subsystem>) are traced, for callers which want to avoid preparing
+        expensive arguments
+    """
+    def enabled(self, level, subsystem=None):
+        return level <= self.__max_level and level <= self.levels.get(subsystem, self.level)
+
+    """
+        Trace <msg>, or <msg> % <args> when arguments are given, if <level> is enabled for <subsystem>
+    """
+    def trace(self, level, msg, *args, subsystem=None):
+        if level > self.__max_level or level > self.levels.get(subsystem, self.level):
+            return
+
+        text = str(msg) % args if args else str(msg)
+        t = self.transport.get_last_t() if self.transport else None
+        ts = format_time(t)
+        for line in text.split('\n'):
+            print('edtt: @{}  {}'.format(ts, line), flush=True);
+
+        if self.json:
+            record = {'t': t, 'level': level, 'subsystem': subsystem, 'msg': text}
+            if args:
+                record['fmt'] = msg
+                record['args'] = args
+            self.json.write(json.dumps(record, default=str) + '\n')
+
+    def close(self):
+        if self.json:
+            self.json.close()
+            self.json = None
@@ -0,0 +1,42 @@
+#! /usr/bin/env python3
+# Copyright 2022 Oticon A/S
+# SPDX-License-Identifier: Apache-2.0
+
+# Store the BabbleSim dump files of a simulation (and the packets parsed from them) in a columnar cache
+# (see components/dump_cache.py), from which they can be loaded again without parsing the dumps:
+#
+#   edtt_dump_cache.py -s=Test -D=2 --cache_dir Test_cache
+#
+#   from components.dump_cache import load_packets
+#   packets = load_packets("Test_cache")
+
+import os;
+from components.dump import SortedDumps
+from components.dump_cache import export_dumps
+
+def parse_arguments():
+    import argparse
+    parser = argparse.ArgumentParser(description="Store the BabbleSim dump files of a simulation in a columnar cache")
+
+    parser.add_argument("-s", "--sim_id", required=True, help="Simulation id");
+    parser.add_argument("-D", "--devices", required=False, default=2, type=int, help="Number of devices (d_2G4_00 and so on)");
+    parser.add_argument("--results_dir", required=False,
+                        help="Folder with the dump files (by default $BSIM_OUT_PATH/results/<sim_id>)");
+    parser.add_argument("--cache_dir", required=True, help="Folder where the cache is stored");
+
+    return parser.parse_args()
+
+def main():
+    args = parse_arguments();
+
+    results_dir = args.results_dir or os.path.join(os.environ['BSIM_OUT_PATH'], 'results', args.sim_id);
+    dumps = SortedDumps();
+    for idx in range(args.devices):
+        dumps.add_rx(idx, os.path.join(results_dir, 'd_2G4_%02i.Rx.csv' % idx));
+        dumps.add_tx(idx, os.path.join(results_dir, 'd_2G4_%02i.Tx.csv' % idx));
+
+    packets = export_dumps(args.cache_dir, dumps);
+    print("%i packets stored in %s" % (packets, args.cache_dir));
+
+if __name__ == "__main__":
+    main();
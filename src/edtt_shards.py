@@ -0,0 +1,84 @@
+#! /usr/bin/env python3
+# Copyright 2022 Oticon A/S
+# SPDX-License-Identifier: Apache-2.0
+
+# Run a test selection split in shards over several independent simulations, and merge their results
+#
+# Each shard is started by running the given launch command, in which these fields are replaced:
+#   {shard}         : Shard number (0..K-1)
+#   {shards}        : Number of shards (K)
+#   {results_file}  : File where the shard EDTT shall store its results (--results_file)
+#   {btsnoop_file}  : File where the shard EDTT shall store its btsnoop log (--btsnoop_file)
+#   {durations_snapshot} : Snapshot of --durations_db taken before starting the shards, from which all
+#                     shards shall take the expected test durations (--durations_snapshot)
+#
+# The launch command is expected to start a complete simulation (Phy, devices and EDTT) with
+# a sim_id (and so on) unique to the shard, and to pass --shards {shards} --shard {shard}
+# (and the same --seed) to the EDTT. For example, with a script which accepts the sim_id and
+# extra EDTT options:
+#   edtt_shards.py -K 4 -- ./run_ll.sh -s=ll_{shard} --shards {shards} --shard {shard} \
+#                          --results_file {results_file} --btsnoop_file {btsnoop_file}
+#
+# The durations db itself changes as the shards record their runs, so shards splitting the tests
+# by duration (--shard_by duration) must take them from the snapshot to agree on the split, and
+# so that a shard can later be replayed alone with the same tests.
+# Each shard results file also holds the list of tests the shard selected; passing it to the EDTT
+# as the test case (-C) runs exactly those tests again.
+
+import os;
+import subprocess;
+from components.sharding import merge_results, merge_btsnoop, print_summary
+from components.durations import TestDurations
+
+def parse_arguments():
+    import argparse
+    parser = argparse.ArgumentParser(description="Run EDTT tests split in shards over several simulations")
+
+    parser.add_argument("-K", "--shards", required=True, type=int, help="Number of shards (simulations run in parallel)");
+    parser.add_argument("--results_dir", required=False, default=".", help="Folder for the per shard results and btsnoop files");
+    parser.add_argument("--durations_db", required=False,
+                        help="Durations db of which a snapshot is given to all shards (see {durations_snapshot})");
+    parser.add_argument("--merge_only", required=False, action='store_true',
+                        help="Do not launch anything, just merge the results of a previous run");
+    parser.add_argument("command", nargs='+', help="Command to launch each shard (see above)");
+
+    return parser.parse_args()
+
+def main():
+    args = parse_arguments();
+
+    results_files = [os.path.join(args.results_dir, "shard_%i.json" % i) for i in range(args.shards)];
+    btsnoop_files = [os.path.join(args.results_dir, "btsnoop_shard_%i.log" % i) for i in range(args.shards)];
+    snapshot_file = os.path.join(args.results_dir, "durations_snapshot.json");
+
+    if not args.merge_only:
+        if args.durations_db:
+            TestDurations(args.durations_db).snapshot(snapshot_file);
+
+        processes = [];
+        for i in range(args.shards):
+            command = " ".join(args.command).format(shard=i, shards=args.shards,
+                                                    results_file=results_files[i],
+                                                    btsnoop_file=btsnoop_files[i],
+                                                    durations_snapshot=snapshot_file);
+            print("Starting shard %i: %s" % (i, command), flush=True);
+            processes.append(subprocess.Popen(command, shell=True));
+        for i, process in enumerate(processes):
+            process.wait();
+            print("Shard %i finished (exit code %i)" % (i, process.returncode), flush=True);
+
+    present = [f for f in results_files if os.path.isfile(f)];
+    missing = len(results_files) - len(present);
+    if missing:
+        print("%i shard(s) did not produce results" % missing);
+
+    failed = print_summary(merge_results(present));
+
+    if any(os.path.isfile(f) for f in btsnoop_files):
+        merge_btsnoop(os.path.join(args.results_dir, "btsnoop_merged.log"), btsnoop_files);
+
+    from sys import exit;
+    exit(1 if (failed or missing) else 0);
+
+if __name__ == "__main__":
+    main();
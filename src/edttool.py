@@ -3,10 +3,17 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import os;
+import time;
 from components.btsnoop import Btsnoop, BtsnoopPriority
 from numpy import random;
-from components.dump import SortedDumps, Packets
+from components.dump import SortedDumps, Packets, RetentionPolicy
 from components.utils import toArray
+from components.sharding import shard_tests, write_results, read_tests
+from components.durations import TestDurations, longest_first, shard_by_duration, select_budget
+from components.preambles import preamble_cache_enable
+from components.trace import Trace, parse_levels
+from components.basic_commands import EventPump
+import components.smpcrypto as smpcrypto
 
 def parse_arguments():
     import argparse
@@ -29,7 +36,8 @@ def parse_arguments():
                         default="all",
                         help='Which testcase to run in that module.'
                         'Options are: A real test name, "all", "randomize",'
-                        'or a file name containing a list of test names (default "all")')
+                        'or a file name containing a list of test names, or the --results_file of a '
+                        'previous run to run exactly the same tests (default "all")')
 
     parser.add_argument("--shuffle", required=False,
                         action='store_true',
@@ -48,6 +56,67 @@ def parse_arguments():
 
     parser.add_argument("--store_btsnoop", required=False, default=False, help="Store btsnoop to the file")
 
+    parser.add_argument("--btsnoop_file", required=False, help="Store btsnoop to this file (instead of a time stamped one)")
+
+    parser.add_argument("--shards", required=False, default=1, type=int,
+                        help='Split the selected tests in this many shards, and run only one of them (see --shard). '
+                        'All shards must be run with the same --seed')
+
+    parser.add_argument("--shard", required=False, default=0, type=int, help='Which shard to run (0..shards-1)')
+
+    parser.add_argument("--results_file", required=False, help='Store the test results to this (json) file')
+
+    parser.add_argument("--durations_db", required=False,
+                        help='json file where the duration of each test run is recorded, '
+                        'and from which the expected durations are taken for --order, --shard_by and --budget')
+
+    parser.add_argument("--durations_snapshot", required=False,
+                        help='Take the expected durations for --order, --shard_by and --budget from this fixed copy '
+                        'of a --durations_db (as written by edtt_shards.py), so all shards agree on the schedule')
+
+    parser.add_argument("--order", required=False, default="given", choices=["given", "longest_first"],
+                        help='Run the tests in the given (or shuffled) order, or the longest ones first (requires --durations_db)')
+
+    parser.add_argument("--shard_by", required=False, default="round_robin", choices=["round_robin", "duration"],
+                        help='Split the tests in shards round-robin, or so all shards take a similar time (requires --durations_db)')
+
+    parser.add_argument("--budget", required=False, type=float,
+                        help='Only run the tests which are expected to fit in this many seconds (in each shard). '
+                        'Tests which failed last time, and those never run before are prioritized (requires --durations_db)')
+
+    parser.add_argument("--full_preamble", required=False, action='store_true',
+                        help="Run every preamble step before each test. By default the results of the steps which only "
+                        "depend on the device (supported features, IRKs, random addresses, encryption keys) are reused")
+
+    parser.add_argument("--controller_crypto", required=False, action='store_true',
+                        help="Let the controller do the AES encryptions needed by pairing and the preambles (LE Encrypt command), "
+                        "instead of doing them in the host")
+
+    parser.add_argument("--crypto_cross_check", required=False, action='store_true',
+                        help="Check each AES encryption done in the host against the controller")
+
+    parser.add_argument("--packets_max_count", required=False, type=int,
+                        help="Keep at most this many of the packets read from the dump files in memory (per test)")
+
+    parser.add_argument("--packets_max_age", required=False, type=int,
+                        help="Evict the packets read from the dump files which are older than this many microseconds. "
+                        "Connection setup and LL control PDUs are never evicted")
+
+    parser.add_argument("--packets_spill_dir", required=False,
+                        help="Store the evicted packets in this folder, where they can still be queried (Packets.fetchSpilled())")
+
+    parser.add_argument("--btsnoop_drop_when_full", required=False, action='store_true',
+                        help="Drop btsnoop records when the writer falls behind, instead of waiting for it")
+
+    parser.add_argument("--event_pump", required=False, action='store_true',
+                        help="Fetch all the events queued in a device at once, and buffer them (see EventPump)");
+
+    parser.add_argument("--trace_levels", required=False, type=parse_levels, default={},
+                        help="Verbosity levels of subsystems, overriding -v for them, e.g. transport=8");
+
+    parser.add_argument("--trace_json", required=False,
+                        help="Also write the traces to this file, as JSON lines with the simulation time");
+
     parser.add_argument("--btmon_socket_path", required=False, default="/tmp/btmon-sock", help="path to the unix socket used by btmon")
 
     return parser.parse_known_args()
@@ -90,61 +159,113 @@ def run_one_test(args, xtra_args, transport, trace, test_mod, test_spec, nameLen
 
     return result;
 
-# Attempt to load and run the tests
-def run_tests(args, xtra_args, transport, trace, dumps):
-    passed = 0;
-    total = 0;
-    unknown = 0;
-
-    test_mod = try_to_import(args.test, "test", "tests.");
-    test_specs = test_mod.get_tests_specs();
-    nameLen = max([ len(test_specs[key].name) for key in test_specs ]);
-
+# Select the names of the tests to run (in order), for this shard
+def select_tests(args, test_specs, durations):
     t = args.case
 
     if t.lower() == "all" or t.lower() == "randomize":
         tests_list = list(test_specs.items());
         if t.lower() == "randomize" or args.shuffle:
             random.shuffle(tests_list)
-
-        for _,test_spec in tests_list:
-            result = run_one_test(args, xtra_args, transport, trace, test_mod, test_spec, nameLen, Packets(dumps))
-            passed += 1 if result == 0 else 0;
-            total += 1;
-            if result != 0 and args.stop_on_failure:
-                break;
+        names = [name for name,_ in tests_list];
 
     elif t in test_specs:
-        result = run_one_test(args, xtra_args, transport, trace, test_mod, test_specs[t], nameLen, Packets(dumps))
-        passed += 1 if result == 0 else 0;
-        total += 1;
+        names = [t];
 
     elif os.path.isfile(t):
+        names = read_tests(t);
+        if names != None: #The tests run by a previous run, as they were
+            return names;
+
         file = open(t, "r");
         lines = file.readlines();
+        file.close();
 
         if args.shuffle:
             random.shuffle(lines);
 
+        names = [];
         for line in lines:
             t = line.split("#",1)[0]; #remove comments
             t = t.strip().upper();
             if not t: #Skip empty lines, or those which had only comments
                 continue
-            if t in test_specs:
-                result = run_one_test(args, xtra_args, transport, trace, test_mod, test_specs[t], nameLen, Packets(dumps))
-                passed += 1 if result == 0 else 0;
-                total += 1;
-                if result != 0 and args.stop_on_failure:
-                    break;
-            else:
-                unknown += 1;
-                print(("unknown test " + t + ". Skipping"))
-        file.close();
+            names.append(t);
 
     else:
-        trace.trace(1, "Test '%s' not found!" % t);
+        return None;
+
+    if durations and args.shard_by == "duration":
+        shard_tests([], args.shards, args.shard); #validate the shard options
+        names = shard_by_duration(names, durations, args.shards, args.shard);
+    else:
+        names = shard_tests(names, args.shards, args.shard);
+
+    if durations and args.budget != None:
+        names = select_budget(names, durations, args.budget);
+
+    if durations and args.order == "longest_first":
+        names = longest_first(names, durations);
+
+    return names;
+
+# Attempt to load and run the tests
+def run_tests(args, xtra_args, transport, trace, dumps):
+    passed = 0;
+    total = 0;
+    unknown = 0;
+    results = [];
+
+    test_mod = try_to_import(args.test, "test", "tests.");
+    test_specs = test_mod.get_tests_specs();
+    nameLen = max([ len(test_specs[key].name) for key in test_specs ]);
+
+    durations = TestDurations(args.durations_db) if args.durations_db else None;
+    if args.durations_snapshot:
+        if not os.path.isfile(args.durations_snapshot):
+            raise Exception("Durations snapshot '%s' not found" % args.durations_snapshot);
+        schedule = TestDurations(args.durations_snapshot);
+    else:
+        schedule = durations;
+    if not schedule and (args.order != "given" or args.shard_by != "round_robin" or args.budget != None):
+        raise Exception("--order, --shard_by and --budget require --durations_db or --durations_snapshot");
+
+    names = select_tests(args, test_specs, schedule);
+
+    retention = None;
+    if args.packets_max_count != None or args.packets_max_age != None:
+        retention = RetentionPolicy(args.packets_max_count, args.packets_max_age, spill_dir=args.packets_spill_dir);
+
+    if names is None:
+        trace.trace(1, "Test '%s' not found!" % args.case);
         total += 1;
+        names = [];
+
+    if args.shards > 1:
+        trace.trace(2, "Running shard %i of %i (%i tests)" % (args.shard, args.shards, len(names)));
+
+    for t in names:
+        if t in test_specs:
+            start_wall = time.time();
+            start_sim = transport.get_last_t();
+            result = run_one_test(args, xtra_args, transport, trace, test_mod, test_specs[t], nameLen, Packets(dumps, retention))
+            passed += 1 if result == 0 else 0;
+            total += 1;
+            results.append((t, "PASSED" if result == 0 else "FAILED"));
+            if durations:
+                durations.record(t, time.time() - start_wall, transport.get_last_t() - start_sim, results[-1][1]);
+            if result != 0 and args.stop_on_failure:
+                break;
+        else:
+            unknown += 1;
+            results.append((t, "UNKNOWN"));
+            print(("unknown test " + t + ". Skipping"))
+
+    if durations:
+        durations.save();
+
+    if args.results_file:
+        write_results(args.results_file, args.shards, args.shard, args.seed, names, results);
 
     failed = total - passed;
     if total:
@@ -164,42 +285,28 @@ def run_tests(args, xtra_args, transport, trace, dumps):
 
     return failed + unknown
 
-class Trace():
-    def __init__(self, level):
-        self.level = level;
-        self.transport = None
-        self.btsnoop = None
-
-    def trace(self, level, msg):
-        if ( level <= self.level ):
-            if self.transport:
-                from datetime import timedelta
-                td = timedelta(microseconds=self.transport.get_last_t())
-                mm, ss = divmod(td.seconds, 60)
-                hh, mm = divmod(mm, 60)
-                ts = "%02d:%02d:%02d.%06d" % (hh, mm, ss, td.microseconds)
-            else:
-                ts = '--:--:--.------'
-            for line in str(msg).split('\n'):
-                print('edtt: @{}  {}'.format(ts, line), flush=True);
-
 def main():
     transport = None;
     try:
         (args, xtra_args) = parse_arguments();
 
         random.seed(int(args.seed));
+        preamble_cache_enable(not args.full_preamble);
+        smpcrypto.configure(args.controller_crypto, args.crypto_cross_check);
 
-        trace = Trace(args.verbose);
+        trace = Trace(args.verbose, args.trace_levels, args.trace_json);
 
         transport = init_transport(args.transport, xtra_args, trace);
         trace.transport = transport;
-        trace.btsnoop = Btsnoop(args.store_btsnoop, args.btmon_socket_path)
+        if args.event_pump:
+            EventPump(transport);
+        trace.btsnoop = Btsnoop(args.store_btsnoop, args.btmon_socket_path, args.btsnoop_file,
+                                drop_when_full=args.btsnoop_drop_when_full)
         address = 0x000000000000
         trace.btsnoop.send_index_added(0, toArray(address, 6), "UpperTester")
         trace.btsnoop.send_index_added(1, toArray(address, 6), "LowerTester")
 
-        device_dumps = SortedDumps()
+        device_dumps = SortedDumps(getattr(transport, 'commit_time', None))
         device_dumps.add_rx(0, os.path.join(os.environ['BSIM_OUT_PATH'], 'results', transport.sim_id, 'd_2G4_00.Rx.csv'))
         device_dumps.add_tx(0, os.path.join(os.environ['BSIM_OUT_PATH'], 'results', transport.sim_id, 'd_2G4_00.Tx.csv'))
         device_dumps.add_rx(1, os.path.join(os.environ['BSIM_OUT_PATH'], 'results', transport.sim_id, 'd_2G4_01.Rx.csv'))
@@ -210,6 +317,7 @@ def main():
         trace.btsnoop.send_user_data(0, BtsnoopPriority.INFO, "Testing session completed ")
         trace.btsnoop.close()
         transport.close();
+        trace.close()
 
         from sys import exit;
         exit(result);
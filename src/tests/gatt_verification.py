@@ -39,7 +39,7 @@ def attRequest(transport, initiator, txData, trace):
         success = success and dataSent;
         if dataSent:
             event = get_event(transport, initiator.initiator, 100);
-            trace.trace(7, str(event));
+            trace.trace(7, "%s", event);
             dataSent = event.event == Events.BT_HCI_EVT_NUM_COMPLETED_PACKETS;
 
     return dataSent;
@@ -25,12 +25,12 @@ class Role(IntEnum):
 
 def __check_command_complete_event(transport, idx, trace):
     event = get_event(transport, idx, 100);
-    trace.trace(7, str(event));
+    trace.trace(7, "%s", event);
     return event.isCommandComplete();
 
 def __check_unknown_command_rsp_event(transport, idx, trace, status):
     event = get_event(transport, idx, 100);
-    trace.trace(7, str(event));
+    trace.trace(7, "%s", event);
     return status == 1 and (event.isCommandComplete() or event.isCommandStatus())
 
 """
@@ -296,7 +296,7 @@ def hci_cco_bv_07_c(transport, idx, trace):
     success = status == 1; # Unknown HCI Command (0x01)
     event = get_event(transport, idx, 100);
     success = success and (event.isCommandStatus() or event.isCommandComplete());
-    trace.trace(7, str(event));
+    trace.trace(7, "%s", event);
 
     return success;
 
@@ -330,12 +330,12 @@ def hci_cco_bv_09_c(transport, upperTester, lowerTester, trace):
         if has_event(transport, upperTester, 200)[0]:
             event = get_event(transport, upperTester, 100);
             success = success and (event.subEvent == MetaEvents.BT_HCI_EVT_LE_DATA_LEN_CHANGE);
-            trace.trace(7, str(event));
+            trace.trace(7, "%s", event);
 
         if has_event(transport, lowerTester, 200)[0]:
             event = get_event(transport, lowerTester, 100);
             success = success and (event.subEvent == MetaEvents.BT_HCI_EVT_LE_DATA_LEN_CHANGE);
-            trace.trace(7, str(event));
+            trace.trace(7, "%s", event);
         """
             Note: Disconnect can generate another LE Data Length Change event...
         """
@@ -964,14 +964,14 @@ def hci_dsu_bv_03_c(transport, upperTester, lowerTester, trace):
     """
     while has_event(transport, lowerTester, 200)[0]:
         event = get_event(transport, lowerTester, 100);
-        trace.trace(7, str(event));
+        trace.trace(7, "%s", event);
         if event.event == Events.BT_HCI_EVT_DISCONN_COMPLETE:
             status, handle, reason = event.decode();
             success = success and (reason == 0x08); # Connection Timeout
 
     while has_event(transport, upperTester, 200)[0]:
         event = get_event(transport, upperTester, 100);
-        trace.trace(7, str(event));
+        trace.trace(7, "%s", event);
         if event.event == Events.BT_HCI_EVT_DISCONN_COMPLETE:
             status, handle, reason = event.decode();
             success = success and (reason == 0x08); # Connection Timeout
@@ -4104,7 +4104,7 @@ def ll_con_per_bv_13_c(transport, upperTester, lowerTester, trace):
         success = success and hasEvent;
         if hasEvent:
             event = get_event(transport, upperTester, 100);
-            trace.trace(7, str(event));
+            trace.trace(7, "%s", event);
         else:
             success = initiator.disconnect(0x13) and success;
     else:
@@ -20,16 +20,16 @@ global lowerRandomAddress, upperRandomAddress;
 
 def verifyAndShowEvent(transport, idx, expectedEvent, trace, to=100):
 
-    event = get_event(transport, idx, to);
-    trace.trace(7, str(event));
-    return event.event == expectedEvent;
+    event = wait_for_event(transport, idx, None, to);
+    trace.trace(7, "%s", event);
+    return not event is None and event.event == expectedEvent;
 
 def verifyNumCompleteEvents(transport, idx, handle, count, trace, to=100):
 
     success = True
     while success and count > 0:
         event = get_event(transport, idx, to)
-        trace.trace(7, str(event))
+        trace.trace(7, "%s", event)
         numHandles, handles, packets = event.decode()
         success = (event.event == Events.BT_HCI_EVT_NUM_COMPLETED_PACKETS and
                    numHandles == 1 and handles[0] == handle and success)
@@ -40,19 +40,19 @@ def verifyNumCompleteEvents(transport, idx, handle, count, trace, to=100):
 def verifyAndShowMetaEvent(transport, idx, expectedEvent, trace):
 
     event = get_event(transport, idx, 100);
-    trace.trace(7, str(event));
+    trace.trace(7, "%s", event);
     return event.subEvent == expectedEvent;
 
 def verifyAndFetchEvent(transport, idx, expectedEvent, trace):
 
     event = get_event(transport, idx, 100);
-    trace.trace(7, str(event));
+    trace.trace(7, "%s", event);
     return event.event == expectedEvent, event;
 
 def verifyAndFetchMetaEvent(transport, idx, expectedEvent, trace, to=100):
 
     event = get_event(transport, idx, to);
-    trace.trace(7, str(event));
+    trace.trace(7, "%s", event);
     return event.subEvent == expectedEvent, event;
 
 def getCommandCompleteEvent(transport, idx, trace):
@@ -262,7 +262,7 @@ def hasEncryptionChangeEvent(transport, idx, trace, to):
     success, status, handle, enabled, key_size = has_event(transport, idx, to)[0], -1, -1, -1, -1
     if success:
         event = get_event(transport, idx, to)
-        trace.trace(7, str(event))
+        trace.trace(7, "%s", event)
         if event.event == Events.BT_HCI_EVT_ENCRYPT_CHANGE_V1:
             status, handle, enabled = event.decode()
         elif event.event == Events.BT_HCI_EVT_ENCRYPT_CHANGE_V2:
@@ -497,6 +497,29 @@ def le_iso_data_write_complete(transport, idx, trace, number_of_packets_written,
     return success
 
 
+def le_iso_data_write_complete_parallel(transport, fragments, trace, to):
+    # fragments: {idx: number_of_packets_written}; collect the responses from whichever device is ready first
+    success = True
+    pending = {idx: n for idx, n in fragments.items() if n > 0}
+    if not hasattr(transport, 'select'):
+        for idx, n in pending.items():
+            success = le_iso_data_write_complete(transport, idx, trace, n, to) and success
+        return success
+
+    while pending:
+        ready = transport.select(list(pending), 5, to)
+        if not ready:
+            # Let the response parsing report the timeout
+            ready = list(pending)
+        for idx in ready:
+            success = le_iso_data_write_rsp(transport, idx, to) == 0 and success
+            pending[idx] -= 1
+            if pending[idx] == 0:
+                del pending[idx]
+
+    return success
+
+
 def le_iso_data_write_nbytes(transport, idx, trace, conn_handle, nbytes, pkt_seq_num, iso_buffer_len):
     iso_data_sdu = tuple([pkt_seq_num] * nbytes)
     tx_iso_data_load = struct.pack(f'<HH{nbytes}B', pkt_seq_num, nbytes, *iso_data_sdu)
@@ -629,8 +652,7 @@ def iso_send_payload_pdu_parallel(transport, idx_1, idx_2, trace, conn_handle_1,
     success = s and success
 
     # Wait for data to be sent; fetch EDTT command response and Number of Completed packets event
-    success = le_iso_data_write_complete(transport, idx_1, trace, fragments_1, 100) and success
-    success = le_iso_data_write_complete(transport, idx_2, trace, fragments_2, 100) and success
+    success = le_iso_data_write_complete_parallel(transport, {idx_1: fragments_1, idx_2: fragments_2}, trace, 100) and success
     success = verifyNumCompleteEvents(transport, idx_1, conn_handle_1, fragments_1, trace) and success
     success = verifyNumCompleteEvents(transport, idx_2, conn_handle_2, fragments_2, trace) and success
 
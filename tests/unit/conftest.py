@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 Oticon A/S
+# SPDX-License-Identifier: Apache-2.0
+
+# Unit tests of the EDTT components, run on the host with pytest (no simulation needed):
+#   python -m pytest tests/unit
+# The components are imported the way the EDTT imports them, with src/ in the path
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir, "src"))
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 Oticon A/S
+# SPDX-License-Identifier: Apache-2.0
+
+from components.dump import DeviceDumpFile
+
+class LineDumpFile(DeviceDumpFile):
+    def decode(self, line):
+        return line
+
+def open_dump(tmp_path, content):
+    file_path = tmp_path / "d_2G4_00.Tx.csv"
+    file_path.write_bytes(content)
+    dump = LineDumpFile(0, str(file_path))
+    dump.open()
+    return dump, file_path
+
+def test_fetch_all_lines(tmp_path):
+    dump, _ = open_dump(tmp_path, b"header\nline 1\nline 2\n")
+    assert list(dump.fetch(2)) == ["line 1", "line 2"]
+    dump.close()
+
+def test_fetch_one_line_at_a_time(tmp_path):
+    dump, _ = open_dump(tmp_path, b"header\nline 1\nline 2\n")
+    assert next(dump.fetch(1)) == "line 1"
+    # Already read from the file by the first fetch, so it must not wait for more data to be written
+    assert next(dump.fetch(1)) == "line 2"
+    assert next(dump.fetch(1)) is None
+    dump.close()
+
+def test_fetch_partial_line(tmp_path):
+    dump, file_path = open_dump(tmp_path, b"header\nline 1\nli")
+    records = dump.fetch()
+    assert next(records) == "line 1"
+    assert next(records) is None
+    with open(file_path, "ab") as file:
+        file.write(b"ne 2\n")
+    assert next(records) == "line 2"
+    dump.close()
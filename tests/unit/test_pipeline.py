@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 Oticon A/S
+# SPDX-License-Identifier: Apache-2.0
+
+import struct
+from collections import deque
+
+from components.basic_commands import Commands, EventPump, reset, le_start_encryption, get_event, has_event
+from components.pipeline import CommandPipeline
+
+class FakeTransport:
+    """
+        Transport answering each request with the response queued for its opcode.
+
+        Constructor:
+            responses - Dictionary of request opcode to response payload
+    """
+    def __init__(self, responses):
+        self.responses = responses
+        self.rx = {}
+        self.log = []
+
+    def send(self, idx, message):
+        self.log.append(('send', idx))
+        opcode, = struct.unpack_from('<H', message)
+        rsp_opcode, payload = self.responses[opcode]
+        self.rx[idx] = self.rx.get(idx, b'') + struct.pack('<HH', rsp_opcode, len(payload)) + payload
+
+    def recv(self, idx, number_bytes, to=None):
+        self.log.append(('recv', idx))
+        data = self.rx.get(idx, b'')
+        self.rx[idx] = data[number_bytes:]
+        return data[:number_bytes]
+
+    def recv_frame(self, idx, to=None, payload_len=None):
+        self.log.append(('recv_frame', idx))
+        data = self.rx.get(idx, b'')
+        if len(data) < 4:
+            self.rx[idx] = b''
+            return data
+        length = struct.unpack_from('<H', data, 2)[0]
+        size = 4 if payload_len not in (None, length) else 4 + length
+        self.rx[idx] = data[size:]
+        return data[:size]
+
+def make_transport():
+    return FakeTransport({
+        Commands.CMD_RESET_REQ: (Commands.CMD_RESET_RSP, b'\x00'),
+        Commands.CMD_LE_START_ENCRYPTION_REQ: (Commands.CMD_LE_START_ENCRYPTION_RSP, b'\x0c'),
+    })
+
+def test_submit_does_not_touch_the_devices():
+    transport = make_transport()
+    pipeline = CommandPipeline(transport)
+    pipeline.submit(reset, 0, 100)
+    pipeline.submit(le_start_encryption, 0, 0x0001, 0, 0, [0] * 16, 100)
+    assert transport.log == []
+    pipeline.flush()
+
+def test_frame_based_helper():
+    transport = make_transport()
+    with CommandPipeline(transport) as pipeline:
+        encryption = pipeline.submit(le_start_encryption, 0, 0x0001, 0, 0, [0] * 16, 100)
+        status = pipeline.submit(reset, 0, 100)
+    assert encryption.result() == 0x0c
+    assert status.result() == 0
+    assert transport.log == [('send', 0), ('send', 0), ('recv_frame', 0), ('recv', 0)]
+    assert transport.rx[0] == b''
+
+def test_buffered_events_are_taken_at_flush():
+    transport = make_transport()
+    pump = EventPump(transport)
+    pump.buffers[0] = deque(['first', 'second'])
+    pipeline = CommandPipeline(transport)
+    available = pipeline.submit(has_event, 0, 100)
+    first = pipeline.submit(get_event, 0, 100)
+    second = pipeline.submit(get_event, 0, 100)
+    assert pump.pending(0) == 2
+    assert transport.log == []
+    pipeline.flush()
+    assert available.result() == (True, 2)
+    assert (first.result(), second.result()) == ('first', 'second')
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 Oticon A/S
+# SPDX-License-Identifier: Apache-2.0
+
+# Security toolbox functions against the sample data of the Core specification, [Vol 3] Part H, Appendix D
+# (and the AES-CMAC examples of RFC 4493 it refers to)
+
+import components.smpcrypto as smpcrypto
+
+CMAC_KEY = 0x2b7e151628aed2a6abf7158809cf4f3c
+CMAC_MESSAGE = bytes.fromhex('6bc1bee22e409f96e93d7e117393172a' 'ae2d8a571e03ac9c9eb76fac45af8e51'
+                             '30c81c46a35ce411e5fbc1191a0a52ef' 'f69f2445df4f9b17ad2b417be66c3710')
+
+U = 0x20b003d2f297be2c5e2c83a7e9f9a5b9eff49111acf4fddbcc0301480e359de6
+V = 0x55188b3d32f6bb9a900afcfbeed4e72a59cb9ac2f19d7cfb6b4fdd49f47fc5fd
+X = 0xd5cb8454d177733effffb2ec712baeab
+W = 0xec0234a357c8ad05341010a60a397d9b99796b13b4f866f1868d34f373bfa698
+N1 = 0xd5cb8454d177733effffb2ec712baeab
+N2 = 0xa6e8e7cc25a75f6e216583f7ff3dc4cf
+A1 = 0x0056123737bfce
+A2 = 0x00a713702dcfc1
+MAC_KEY = 0x2965f176a1084a02fd3f6a20ce636e20
+
+def test_aes_cmac():
+    assert smpcrypto.aes_cmac(CMAC_KEY, CMAC_MESSAGE[:0]) == 0xbb1d6929e95937287fa37d129b756746
+    assert smpcrypto.aes_cmac(CMAC_KEY, CMAC_MESSAGE[:16]) == 0x070a16b46b4d4144f79bdd9dd04a287c
+    assert smpcrypto.aes_cmac(CMAC_KEY, CMAC_MESSAGE[:40]) == 0xdfa66747de9ae63030ca32611497c827
+    assert smpcrypto.aes_cmac(CMAC_KEY, CMAC_MESSAGE) == 0x51f0bebf7e3b9d92fc49741779363cfe
+
+def test_f4():
+    assert smpcrypto.f4(U, V, X, 0x00) == 0xf2c916f107a9bd1cf1eda1bea974872d
+
+def test_f5():
+    assert smpcrypto.f5(W, N1, N2, A1, A2) == (MAC_KEY, 0x6986791169d7cd23980522b594750a38)
+
+def test_f6():
+    R = 0x12a3343bb453bb5408da42d20c2d0fc8
+    assert smpcrypto.f6(MAC_KEY, N1, N2, R, 0x010102, A1, A2) == 0xe3c473989cd0e8c5d26c0b09da958f61
+
+def test_g2():
+    assert smpcrypto.g2(U, V, X, N2) == 0x2f9ed5ba
+
+def test_legacy_functions():
+    assert smpcrypto.c1(0, 0x5783D52156AD6F0E6388274EC6702EE0, 0x07071000000101, 0x05000800000302,
+                        1, 0, 0xA1A2A3A4A5A6, 0xB1B2B3B4B5B6) == 0x1e1e3fef878988ead2a74dc5bef13b86
+    assert smpcrypto.s1(0, 0x000F0E0D0C0B0A091122334455667788,
+                        0x010203040506070899AABBCCDDEEFF00) == 0x9a1fe1f0e8b0f49b5b4216ae796da062
+    assert smpcrypto.ah(0xec0234a357c8ad05341010a60a397d9b, 0x708194) == 0x0dfbaa
+
+def test_e_batch():
+    plaintexts = [0, 1, 0x708194]
+    assert smpcrypto.e_batch(X, plaintexts) == [smpcrypto.e(X, plaintext) for plaintext in plaintexts]
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 Oticon A/S
+# SPDX-License-Identifier: Apache-2.0
+
+import struct
+from types import SimpleNamespace
+
+from components.basic_commands import Commands, EventPump, wait_for_event, get_event
+from components.events import Events
+
+class EventQueueTransport:
+    """
+        Transport to a device holding the queue of events <events>, as (event code, data) tuples
+
+        Constructor:
+            events - List of the events queued in the device
+    """
+    def __init__(self, events):
+        self.events = list(events)
+        self.rx = b''
+        self.last_t = 0
+        self.Trace = SimpleNamespace(btsnoop=SimpleNamespace(send_event=lambda idx, header, data: None))
+
+    def send(self, idx, message):
+        opcode, = struct.unpack_from('<H', message)
+        if opcode == Commands.CMD_HAS_EVENT_REQ:
+            self.rx += struct.pack('<HHB', Commands.CMD_HAS_EVENT_RSP, 1, len(self.events))
+        elif message[4]:
+            self.rx += struct.pack('<HB', Commands.CMD_GET_EVENT_RSP, len(self.events))
+            for event, data in self.events:
+                self.rx += struct.pack('<HIBB', 6 + len(data), self.last_t, event, len(data)) + data
+            self.events = []
+        else:
+            event, data = self.events.pop(0)
+            self.rx += struct.pack('<HHIBB', Commands.CMD_GET_EVENT_RSP, 6 + len(data), self.last_t, event, len(data)) + data
+
+    def recv(self, idx, number_bytes, to=None):
+        data, self.rx = self.rx[:number_bytes], self.rx[number_bytes:]
+        return data
+
+    def wait(self, delay_in_ms):
+        self.last_t += int(delay_in_ms*1000)
+
+DISCONNECT = (Events.BT_HCI_EVT_DISCONN_COMPLETE, bytes([0, 1, 0, 0x13]))
+ENCRYPTION_CHANGE = (Events.BT_HCI_EVT_ENCRYPT_CHANGE_V1, bytes([0, 1, 0, 1]))
+
+def is_disconnect(event):
+    return event.event == Events.BT_HCI_EVT_DISCONN_COMPLETE
+
+def test_without_pump():
+    transport = EventQueueTransport([ENCRYPTION_CHANGE, DISCONNECT])
+    assert wait_for_event(transport, 0, None, 100).event == Events.BT_HCI_EVT_ENCRYPT_CHANGE_V1
+    assert wait_for_event(transport, 0, is_disconnect, 100).event == Events.BT_HCI_EVT_DISCONN_COMPLETE
+    assert wait_for_event(transport, 0, None, 300) is None
+    # No pump is left behind, the other event functions keep working on the device queue
+    assert not hasattr(transport, 'event_pump')
+
+def test_with_pump():
+    transport = EventQueueTransport([ENCRYPTION_CHANGE, DISCONNECT])
+    EventPump(transport)
+    assert wait_for_event(transport, 0, is_disconnect, 100).event == Events.BT_HCI_EVT_DISCONN_COMPLETE
+    # The earlier event stays buffered
+    assert get_event(transport, 0, 100).event == Events.BT_HCI_EVT_ENCRYPT_CHANGE_V1